@@ -0,0 +1,61 @@
+"""
+Benchmark requests per second of AsyncSleeperClient against the sync SleeperClient.
+
+Both clients hit a local stub server that adds a fixed latency to every response,
+which stands in for the round trip to api.sleeper.app.
+
+    PYTHONPATH=. python benchmarks/bench_async_client.py --requests 500 --latency 0.02
+"""
+import argparse
+import asyncio
+import time
+
+from sleeper_api.client import SleeperClient
+from sleeper_api.async_client import AsyncSleeperClient
+from sleeper_api.testing import StubServer
+
+
+def bench_sync(base_url, total):
+    "Issue the requests one at a time with the blocking client"
+    client = SleeperClient(base_url=base_url)
+    start = time.perf_counter()
+    for i in range(total):
+        client.get(f'league/{i}')
+    return time.perf_counter() - start
+
+
+async def bench_async(base_url, total, concurrency, use_aiohttp):
+    "Issue all of the requests at once and let the client bound the concurrency"
+    async with AsyncSleeperClient(base_url=base_url, max_concurrency=concurrency,
+                                  use_aiohttp=use_aiohttp) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client.get(f'league/{i}') for i in range(total)))
+        return time.perf_counter() - start
+
+
+def main():
+    "run the benchmark"
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--concurrency', type=int, default=100)
+    args = parser.parse_args()
+
+    with StubServer(payload={"league_id": "1", "name": "Bench League"},
+                    latency=args.latency) as server:
+        results = [('sync SleeperClient', bench_sync(server.base_url, args.requests))]
+        results.append(('AsyncSleeperClient (threads)', asyncio.run(
+            bench_async(server.base_url, args.requests, args.concurrency, False))))
+        try:
+            results.append(('AsyncSleeperClient (aiohttp)', asyncio.run(
+                bench_async(server.base_url, args.requests, args.concurrency, True))))
+        except Exception as exc:  # pylint: disable=broad-except
+            print(f'skipping aiohttp transport: {exc}')
+
+    print(f'{args.requests} requests, {args.latency * 1000:.0f}ms server latency')
+    for name, elapsed in results:
+        print(f'{name:<30} {elapsed:8.2f}s {args.requests / elapsed:10.1f} req/s')
+
+
+if __name__ == '__main__':
+    main()
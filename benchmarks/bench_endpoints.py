@@ -0,0 +1,82 @@
+"""
+Load test every endpoint wrapper against the local stub server, without a network.
+
+Each worker thread repeatedly walks a league the way an application would: league,
+rosters, users, a week of matchups and transactions, brackets, drafts and picks, the
+state and trending players. Injected errors exercise the retry policy. Per endpoint
+latency is reported from a MetricsCollector.
+
+    PYTHONPATH=. python benchmarks/bench_endpoints.py --threads 8 --iterations 20 \\
+        --latency 0.02 --error-rate 0.05
+
+Pass --cassette to replay recorded responses instead of synthetic ones.
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sleeper_api.client import SleeperClient
+from sleeper_api.endpoints import DraftEndpoint, LeagueEndpoint, UserEndpoint
+from sleeper_api.metrics import MetricsCollector
+from sleeper_api.retry import RetryPolicy
+from sleeper_api.testing import Cassette, StubServer
+
+
+def walk_league(client, league_id, week):
+    "fetch everything about one league through the endpoint wrappers"
+    leagues = LeagueEndpoint(client)
+    drafts = DraftEndpoint(client)
+    users = UserEndpoint(client)
+
+    leagues.get_league_by_id(league_id)
+    leagues.get_rosters(league_id)
+    leagues.get_users(league_id)
+    leagues.get_matchups(league_id, week)
+    leagues.get_transactions(league_id, week)
+    leagues.get_winners_bracket(league_id)
+    leagues.get_losers_bracket(league_id)
+    leagues.get_traded_picks(league_id)
+    for draft in drafts.get_drafts_by_league(league_id):
+        drafts.get_draft_picks(draft.draft_id)
+        drafts.get_traded_picks(draft.draft_id)
+    users.get_user(user_id='1')
+    client.get('state/nfl')
+    client.get('players/nfl/trending/add', params={'lookback_hours': 24, 'limit': 25})
+
+
+def main():
+    "run the benchmark"
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--jitter', type=float, default=0.01)
+    parser.add_argument('--error-rate', type=float, default=0.05)
+    parser.add_argument('--cassette', help="cassette file to replay")
+    args = parser.parse_args()
+
+    metrics = MetricsCollector()
+    cassette = Cassette(args.cassette) if args.cassette else None
+    with StubServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                    retry_after=0, cassette=cassette) as server:
+        client = SleeperClient(base_url=server.base_url, hooks=[metrics],
+                               retry=RetryPolicy(max_retries=5, backoff_factor=0.01))
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as pool:
+            list(pool.map(lambda i: walk_league(client, str(1000 + i), i % 18 + 1),
+                          range(args.threads * args.iterations)))
+        elapsed = time.perf_counter() - start
+        served = server.stats()
+
+    snapshot = metrics.snapshot()
+    total = sum(stats['requests'] for stats in snapshot.values())
+    print(f"{total} requests in {elapsed:.2f}s ({total / elapsed:.0f} req/s), "
+          f"{served['errors']} injected errors, {sum(client.retry.stats().values())} retries")
+    for template, stats in sorted(snapshot.items()):
+        mean = stats['latency_sum'] / stats['requests']
+        print(f"  {template:45s} {stats['requests']:6d} requests  {mean * 1000:7.1f}ms mean")
+
+
+if __name__ == '__main__':
+    main()
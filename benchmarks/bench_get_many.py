@@ -0,0 +1,47 @@
+"""
+Benchmark SleeperClient.get_many against a sequential loop of SleeperClient.get.
+
+Fetches every week of matchups for a set of leagues from a local stub server that
+adds a fixed latency to every response.
+
+    PYTHONPATH=. python benchmarks/bench_get_many.py --leagues 10 --workers 16
+"""
+import argparse
+import time
+
+from sleeper_api.client import SleeperClient
+from sleeper_api.testing import StubServer
+
+
+def main():
+    "run the benchmark"
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--leagues', type=int, default=10)
+    parser.add_argument('--weeks', type=int, default=18)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--latency', type=float, default=0.05)
+    args = parser.parse_args()
+
+    endpoints = [f'league/{league}/matchups/{week}'
+                 for league in range(args.leagues) for week in range(1, args.weeks + 1)]
+
+    with StubServer(latency=args.latency) as server:
+        client = SleeperClient(base_url=server.base_url)
+
+        start = time.perf_counter()
+        for endpoint in endpoints:
+            client.get(endpoint)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        client.get_many(endpoints, max_workers=args.workers)
+        parallel = time.perf_counter() - start
+
+    print(f'{len(endpoints)} requests, {args.latency * 1000:.0f}ms server latency')
+    print(f'{"sequential get":<30} {sequential:8.2f}s')
+    print(f'{f"get_many({args.workers} workers)":<30} {parallel:8.2f}s '
+          f'({sequential / parallel:.1f}x faster)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark the startup cost of importing the package, using `python -X importtime`.
+
+Each run imports the target in a fresh interpreter and reads the cumulative import
+time of the target from the importtime report. Exits with status 1 when the median
+exceeds --max-ms, so it can guard against regressions in CI.
+
+    PYTHONPATH=. python benchmarks/bench_import_time.py --runs 10 --max-ms 20
+    PYTHONPATH=. python benchmarks/bench_import_time.py --statement "from sleeper_api import SleeperClient"
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+
+def import_times(statement):
+    """
+    Run the statement in a fresh interpreter and return {module: (self_us, cumulative_us,
+    top_level)}, top_level being whether the module was imported by the statement itself
+    or the interpreter startup rather than by another module.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, check=True, env=os.environ.copy())
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        name = module[1:]  # nested imports are indented two spaces per level
+        times[name.strip()] = (int(self_us), int(cumulative_us), not name.startswith(' '))
+    return times
+
+
+def statement_time(times, startup):
+    "Milliseconds spent on the top level imports that the interpreter startup doesn't make"
+    return sum(cumulative for module, (_, cumulative, top_level) in times.items()
+               if top_level and module not in startup) / 1000
+
+
+def main():
+    "run the benchmark"
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--statement', default='import sleeper_api')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--top', type=int, default=10, help="slowest modules to list")
+    parser.add_argument('--max-ms', type=float, help="fail when the median exceeds this")
+    args = parser.parse_args()
+
+    startup = set(import_times('pass'))
+    runs = [import_times(args.statement) for _ in range(args.runs)]
+    totals = [statement_time(times, startup) for times in runs]
+
+    median = statistics.median(totals)
+    print(f"{args.statement!r}: median {median:.1f}ms, "
+          f"min {min(totals):.1f}ms, max {max(totals):.1f}ms over {args.runs} runs")
+
+    last = runs[-1]
+    print("slowest modules by self time in the last run:")
+    for module, (self_us, _, _) in sorted(last.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"  {module:50s} {self_us / 1000:7.2f}ms")
+    heavy = [module for module in ('requests', 'aiohttp', 'platformdirs') if module in last]
+    print(f"third party modules imported: {', '.join(heavy) or 'none'}")
+
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"FAIL: median import time {median:.1f}ms exceeds {args.max_ms}ms")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
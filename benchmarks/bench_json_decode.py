@@ -0,0 +1,62 @@
+"""
+Benchmark decode time and peak memory of every installed JSON decoder on a synthetic
+10k player `players/nfl` payload, both as a raw response body and as the gzip player cache.
+
+    PYTHONPATH=. python benchmarks/bench_json_decode.py --players 10000
+"""
+import argparse
+import gc
+import gzip
+import json
+import statistics
+import time
+import tracemalloc
+
+from sleeper_api.decoders import DECODER_NAMES, get_decoder
+from sleeper_api.testing import make_players
+
+
+def measure(func, repeat):
+    "Return the median wall time and the peak traced memory of func"
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak
+
+
+def main():
+    "run the benchmark"
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--players', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    body = json.dumps(make_players(args.players)).encode()
+    cache = gzip.compress(json.dumps(json.loads(body), indent=4).encode())
+    print(f'{args.players} players: {len(body) / 1e6:.1f}MB body, '
+          f'{len(cache) / 1e6:.1f}MB gzip cache')
+    print(f'{"decoder":<10} {"body ms":>10} {"body peak MB":>14} {"cache ms":>10} {"cache peak MB":>14}')
+
+    for name in DECODER_NAMES:
+        try:
+            decoder = get_decoder(name)
+        except ImportError:
+            print(f'{name:<10} not installed')
+            continue
+        body_time, body_peak = measure(lambda: decoder(body), args.repeat)
+        cache_time, cache_peak = measure(lambda: decoder(gzip.decompress(cache)), args.repeat)
+        print(f'{name:<10} {body_time * 1000:>10.1f} {body_peak / 1e6:>14.1f} '
+              f'{cache_time * 1000:>10.1f} {cache_peak / 1e6:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
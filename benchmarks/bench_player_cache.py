@@ -0,0 +1,99 @@
+"""
+Compare the binary player cache against the gzip JSON cache it replaced.
+
+Writes a synthetic players payload in both formats, then reports the file size, the
+time to write it, to load the whole payload, and to read a single player from a cold
+start, each with the peak RSS of a fresh process doing only that.
+
+    PYTHONPATH=. python benchmarks/bench_player_cache.py --players 11000
+"""
+import argparse
+import gzip
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from sleeper_api.decoders import get_decoder
+from sleeper_api.player_cache import PlayerCacheFile, write_player_cache
+from sleeper_api.testing import make_players
+
+
+def write_legacy(path, players_json):
+    "the format PlayerEndpoint used to write"
+    with gzip.open(path, 'wt') as f:
+        json.dump(players_json, f, indent=4)
+
+
+def run(mode, path, player_id):
+    "do one cold operation, return the seconds it took"
+    decoder = get_decoder('auto')
+    start = time.perf_counter()
+    if mode == 'legacy-load':
+        with gzip.open(path, 'rb') as f:
+            decoder(f.read())
+    elif mode == 'legacy-get':
+        with gzip.open(path, 'rb') as f:
+            decoder(f.read())[player_id]  # pylint: disable=expression-not-assigned
+    elif mode == 'binary-load':
+        PlayerCacheFile(path, decoder).load()
+    elif mode == 'binary-get':
+        PlayerCacheFile(path, decoder).get(player_id)
+    return time.perf_counter() - start
+
+
+def max_rss_mb():
+    "peak resident set size of this process"
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def child(mode, path, player_id):
+    "run one operation in a fresh process, return its time and the RSS it added"
+    out = subprocess.run(
+        [sys.executable, __file__, '--child', mode, path, player_id],
+        check=True, capture_output=True, text=True,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))).stdout.split()
+    return float(out[0]), float(out[1]) - float(out[2])
+
+
+def main():
+    "run the benchmark"
+    if len(sys.argv) == 5 and sys.argv[1] == '--child':
+        _, _, mode, path, player_id = sys.argv
+        baseline = max_rss_mb()
+        elapsed = run(mode, path, player_id)
+        print(elapsed, max_rss_mb(), baseline)
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--players', type=int, default=11_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    players_json = make_players(args.players)
+    player_id = list(players_json)[args.players // 2]
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {'legacy': os.path.join(tmp, 'players.json.gz'),
+                 'binary': os.path.join(tmp, 'players.bin')}
+        writers = {'legacy': write_legacy, 'binary': write_player_cache}
+        print(f"{args.players} players, best of {args.repeat} cold processes")
+        for name, path in paths.items():
+            start = time.perf_counter()
+            writers[name](path, players_json)
+            written = time.perf_counter() - start
+            print(f"  {name:7s} {os.path.getsize(path) / 1e6:6.2f}MB on disk, "
+                  f"written in {written * 1000:7.1f}ms")
+            for operation in ('load', 'get'):
+                runs = [child(f'{name}-{operation}', path, player_id) for _ in range(args.repeat)]
+                elapsed = min(seconds for seconds, _ in runs)
+                rss = min(added for _, added in runs)
+                label = 'load all' if operation == 'load' else 'one player'
+                print(f"    {label:11s} {elapsed * 1000:8.2f}ms  +{rss:6.1f}MB RSS")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Measure the disk used by the player history over a season of daily refreshes, each
+changing a few players as the real payload does, against keeping every daily cache file,
+and the time of point-in-time lookups in it.
+
+    PYTHONPATH=. python benchmarks/bench_player_history.py --players 11000 --days 120
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sleeper_api.player_cache import write_player_cache
+from sleeper_api.player_changes import diff_players
+from sleeper_api.player_history import PlayerHistory
+from sleeper_api.testing import make_players
+
+DAY = 86400.0
+
+
+def refresh(players, rng, changes):
+    "return the payload of the next day, with a few players changed, added and removed"
+    new = dict(players)
+    for player_id in rng.sample(sorted(players), changes):
+        data = dict(new[player_id])
+        data['injury_status'] = rng.choice([None, 'Questionable', 'Out', 'IR'])
+        if rng.random() < 0.2:
+            data['team'] = rng.choice(['NE', 'KC', 'BUF', 'SF', 'DAL', None])
+        new[player_id] = data
+    for player_id in rng.sample(sorted(players), max(changes // 20, 1)):
+        del new[player_id]
+    for _ in range(max(changes // 20, 1)):
+        player_id = str(rng.randrange(10**6, 10**7))
+        new[player_id] = dict(players[rng.choice(sorted(players))], player_id=player_id)
+    return new
+
+
+def main():
+    "run the benchmark"
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--players', type=int, default=11_000)
+    parser.add_argument('--days', type=int, default=120)
+    parser.add_argument('--changes', type=int, default=150, help="players changed per day")
+    parser.add_argument('--lookups', type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    players = make_players(args.players)
+    with tempfile.TemporaryDirectory() as tmp:
+        write_player_cache(os.path.join(tmp, 'players.bin'), players)
+        cache_bytes = os.path.getsize(os.path.join(tmp, 'players.bin'))
+
+        history = PlayerHistory(os.path.join(tmp, 'players.nfl.history'))
+        start = time.perf_counter()
+        history.record(players, 0.0)
+        for day in range(1, args.days):
+            new = refresh(players, rng, args.changes)
+            history.record(new, day * DAY, diff_players(players, new, since=(day - 1) * DAY))
+            players = new
+        record_seconds = time.perf_counter() - start
+        history_bytes = os.path.getsize(history.path)
+
+        start = time.perf_counter()
+        reader = PlayerHistory(history.path)
+        reader.versions()
+        load_seconds = time.perf_counter() - start
+
+        player_ids = sorted(players)
+        queries = [(rng.choice(player_ids), rng.uniform(0, args.days * DAY))
+                   for _ in range(args.lookups)]
+        start = time.perf_counter()
+        for player_id, at in queries:
+            reader.get(player_id, at)
+        lookup_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for player_id in player_ids[:1000]:
+            reader.player_history(player_id)
+        scan_seconds = time.perf_counter() - start
+
+    print(f"{args.players} players, {args.days} daily refreshes of {args.changes} changes")
+    print(f"  daily cache files   {args.days * cache_bytes / 1e6:9.1f}MB")
+    print(f"  history             {history_bytes / 1e6:9.1f}MB  "
+          f"({history_bytes / (args.days * cache_bytes):.1%}), "
+          f"{record_seconds / args.days * 1000:.1f}ms per refresh")
+    print(f"  load                {load_seconds * 1000:9.1f}ms")
+    print(f"  get(player, at)     {lookup_seconds / args.lookups * 1e6:9.2f}us")
+    print(f"  player_history      {scan_seconds / 1000 * 1e6:9.2f}us")
+
+
+if __name__ == '__main__':
+    main()
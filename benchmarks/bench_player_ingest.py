@@ -0,0 +1,90 @@
+"""
+Compare downloading the players payload into an empty cache the buffered way (the whole
+response body, decoded in one call, encoded again for the cache) against streaming it
+(`PlayerEndpoint(streaming=True)`: each player parsed, cached and indexed as it arrives).
+
+Each run is a fresh process asking for one player with no cache, so the time is the time
+to the first query, and the RSS it adds is the peak memory of the whole ingestion. The
+payload is served by a local `StubServer`, as fast as possible and at a limited bandwidth,
+where streaming parses the players while the rest of the body is still downloading.
+
+    PYTHONPATH=. python benchmarks/bench_player_ingest.py --players 11000 --bandwidth 20e6
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from sleeper_api.client import SleeperClient
+from sleeper_api.endpoints.player_endpoint import PlayerEndpoint
+from sleeper_api.testing import StubServer
+
+
+def max_rss_mb():
+    "peak resident set size of this process"
+    # on Linux ru_maxrss starts from the parent's, which holds the stub server's body
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def run(mode, base_url, cache_dir):
+    "download into an empty cache and look one player up, return the seconds it took"
+    endpoint = PlayerEndpoint(SleeperClient(base_url=base_url, timeout=60),
+                              cache_file=os.path.join(cache_dir, 'players.bin'),
+                              streaming=mode == 'streaming')
+    start = time.perf_counter()
+    endpoint.get_player('1')
+    return time.perf_counter() - start
+
+
+def child(mode, base_url):
+    "run one ingestion in a fresh process, return its time and the RSS it added"
+    with tempfile.TemporaryDirectory() as tmp:
+        out = subprocess.run(
+            [sys.executable, __file__, '--child', mode, base_url, tmp],
+            check=True, capture_output=True, text=True,
+            env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))).stdout.split()
+    return float(out[0]), float(out[1]) - float(out[2])
+
+
+def main():
+    "run the benchmark"
+    if len(sys.argv) == 5 and sys.argv[1] == '--child':
+        _, _, mode, base_url, cache_dir = sys.argv
+        baseline = max_rss_mb()
+        elapsed = run(mode, base_url, cache_dir)
+        print(elapsed, max_rss_mb(), baseline)
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--players', type=int, default=11_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--bandwidth', type=float, default=20e6,
+                        help="bytes per second of the limited link")
+    args = parser.parse_args()
+
+    with StubServer(player_count=args.players) as server:
+        SleeperClient(base_url=server.base_url).get('players/nfl')  # build the body once
+        print(f"{args.players} players, best of {args.repeat} cold processes")
+        for bandwidth in (None, args.bandwidth):
+            server.bandwidth = bandwidth
+            print(f"  {'unlimited' if bandwidth is None else f'{bandwidth / 1e6:g}MB/s'} link")
+            for mode in ('buffered', 'streaming'):
+                runs = [child(mode, server.base_url) for _ in range(args.repeat)]
+                elapsed = min(seconds for seconds, _ in runs)
+                rss = min(added for _, added in runs)
+                print(f"    {mode:10s} first query {elapsed * 1000:8.1f}ms  +{rss:6.1f}MB RSS")
+
+
+if __name__ == '__main__':
+    main()
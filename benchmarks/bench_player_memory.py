@@ -0,0 +1,76 @@
+"""
+Measure the memory held per player by the decoded payload and the PlayerModels, before
+(models copying their attributes into a __dict__, strings decoded once per player) and
+after (__slots__ models viewing the shared data, repeated strings interned), with tracemalloc.
+
+    PYTHONPATH=. python benchmarks/bench_player_memory.py --players 11000
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+
+from sleeper_api.models.player import PlayerModel, intern_players
+from sleeper_api.testing import make_players
+
+
+class DictPlayerModel:
+    "PlayerModel as it was before, every attribute copied into the instance __dict__"
+    def __init__(self, attributes):
+        self.player_id = attributes.get('player_id')
+        self.first_name = attributes.get('first_name')
+        self.last_name = attributes.get('last_name')
+        last_name = self.last_name
+        self.name = f'{self.first_name} {last_name}' if last_name else self.first_name
+        self.position = attributes.get('position')
+        self.team_abbr = attributes.get('team_abbr') or attributes.get('team')
+        self.status = attributes.get('status')
+        self.sport = attributes.get('sport')
+        self.age = attributes.get('age')
+        self.college = attributes.get('college')
+        self.years_exp = attributes.get('years_exp')
+        self._player_data = attributes
+
+
+def measure(build):
+    "return the bytes allocated by build and still held, and what it built"
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def main():
+    "run the benchmark"
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--players', type=int, default=11_000)
+    args = parser.parse_args()
+
+    # decode from bytes, as from the cache, so every player has its own copy of each string
+    raw = json.dumps(make_players(args.players)).encode()
+    count = args.players
+
+    payload_before, players_before = measure(lambda: json.loads(raw))
+    models_before, _ = measure(lambda: [DictPlayerModel(data) for data in players_before.values()])
+    del players_before
+
+    payload_after, players_after = measure(lambda: intern_players(json.loads(raw)))
+    models_after, _ = measure(
+        lambda: [PlayerModel.from_dict(data) for data in players_after.values()])
+
+    print(f"{count} players, bytes per player")
+    print(f"  {'':20s} {'payload':>9s} {'models':>9s} {'total':>9s}")
+    for label, payload, models in (('before', payload_before, models_before),
+                                   ('after', payload_after, models_after)):
+        print(f"  {label:20s} {payload / count:9.0f} {models / count:9.0f} "
+              f"{(payload + models) / count:9.0f}")
+    saved = 1 - (payload_after + models_after) / (payload_before + models_before)
+    print(f"  {saved:.0%} less memory, models {models_before / max(models_after, 1):.1f}x smaller")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark player lookups on a synthetic 10k player cache.
+
+Compares resolving a roster of player IDs through the shared player index against the
+old approach of loading the cache and scanning every player for each ID, and per team
+lookups and searches through the secondary indexes against a scan of every player.
+Searches are timed both planned from scratch and answered from the query result cache,
+a broad search's top 20 by search_rank sorting every match against `search_players` with
+order_by, limit and fields,
+name searches through the trigram index against a substring scan of every name, and
+joining a trending response against the index against decoding every player for it.
+
+    PYTHONPATH=. python benchmarks/bench_player_queries.py --players 10000 --roster 15
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sleeper_api.endpoints.player_endpoint import PlayerEndpoint
+from sleeper_api.player_query import QueryPlan
+from sleeper_api.player_search import NameIndex
+from sleeper_api.testing import make_players
+from tests._reference_search import evaluate_conditions
+
+
+NAMES = ['smith', 'jon smi', 'j jackson', 'wiliams']
+
+SEARCHES = [
+    {"team": "KC", "position": "WR"},
+    {"position": {"in": ["QB", "K"]}, "age": {">": 30}},
+    {"OR": [{"injury_status": "Out"}, {"injury_status": "IR"}]},
+]
+
+
+def timed(func, repeat):
+    "Return the best wall time of func over repeat runs"
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    "run the benchmark"
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--players', type=int, default=10_000)
+    parser.add_argument('--roster', type=int, default=15)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    players_json = make_players(args.players)
+    roster = random.Random(0).sample(sorted(players_json), args.roster)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        endpoint = PlayerEndpoint(client=None, cache_file=os.path.join(tmp, 'players.json.gz'))
+        endpoint._save_cache(players_json)  # pylint: disable=protected-access
+
+        def scan():
+            for player_id in roster:
+                players = endpoint.get_all_players()
+                next(player for player in players if player.player_id == player_id)
+
+        results = [
+            ('cache load + scan per player', timed(scan, 1)),
+            ('first get_player (builds index)', timed(lambda: endpoint.get_player(roster[0]), 1)),
+            ('get_player per player (warm)',
+             timed(lambda: [endpoint.get_player(player_id) for player_id in roster], args.repeat)),
+            ('get_players(roster) (warm)',
+             timed(lambda: endpoint.get_players(roster), args.repeat)),
+            ('team scan', timed(lambda: [data for data in players_json.values()
+                                         if (data.get('team_abbr') or data.get('team')) == 'KC'],
+                                args.repeat)),
+            ('get_players_by_team (warm)',
+             timed(lambda: endpoint.get_players_by_team('KC'), args.repeat)),
+        ]
+        for criteria in SEARCHES:
+            results.append((f'scan {criteria}', timed(
+                lambda: [data for data in players_json.values()
+                         if evaluate_conditions(data, criteria)], args.repeat)))
+            index = endpoint._player_index()  # pylint: disable=protected-access
+            results.append((f'plan + run {criteria}', timed(
+                lambda: QueryPlan(index, criteria).execute(), args.repeat)))
+            results.append((f'search_players {criteria} (cached)', timed(
+                lambda: endpoint.search_players(criteria), args.repeat)))
+
+        broad = {"position": "WR", "active": True}
+        top_fields = ['player_id', 'full_name', 'team', 'search_rank']
+        endpoint.search_players(broad)  # the matches are cached for both
+        results.append(('top 20 WRs, raw data of every match sorted', timed(
+            lambda: [{field: data.get(field) for field in top_fields} for data in sorted(
+                endpoint.search_players(broad, convert_results=False),
+                key=lambda data: data['search_rank'])[:20]], args.repeat)))
+        results.append(('top 20 WRs, search_players(order_by, limit, fields)', timed(
+            lambda: endpoint.search_players(broad, order_by='search_rank', limit=20,
+                                            fields=top_fields), args.repeat)))
+
+        trending = [{'player_id': player_id, 'count': 100 - i}
+                    for i, player_id in enumerate(random.Random(1).sample(sorted(players_json), 25))]
+
+        def old_trending_join():
+            # the old code set add_count on each model, keep (model, count) pairs instead
+            # since PlayerModel has no slot for it
+            player_dict = {player.player_id: player for player in endpoint.get_all_players()}
+            return [(player_dict[entry['player_id']], entry['count']) for entry in trending]
+
+        index = endpoint._player_index()  # pylint: disable=protected-access
+        results.append(('trending join, decode all players', timed(old_trending_join, args.repeat)))
+        results.append(('trending join, player index (warm)', timed(
+            lambda: endpoint._join_trending(trending, index, 'add'),  # pylint: disable=protected-access
+            args.repeat)))
+
+        results.append(('build name index', timed(lambda: NameIndex(players_json), 1)))
+        endpoint.search_by_name(NAMES[0])
+        for query in NAMES:
+            results.append((f'name scan {query!r}', timed(
+                lambda: [data for data in players_json.values()
+                         if query in f"{data.get('first_name')} {data.get('last_name')}".lower()],
+                args.repeat)))
+            results.append((f'search_by_name {query!r} (warm)', timed(
+                lambda: endpoint.search_by_name(query), args.repeat)))
+
+    print(f'{args.players} players, roster of {args.roster}')
+    for name, seconds in results:
+        print(f'  {name:70s} {seconds * 1000:10.3f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark analytics queries over the columnar PlayerTable against the same queries
+written over the raw player dicts, on a synthetic player universe.
+
+    PYTHONPATH=. python benchmarks/bench_player_table.py --players 10000
+"""
+import argparse
+import heapq
+import time
+
+from sleeper_api.player_index import PlayerIndex
+from sleeper_api.player_table import table_for
+from sleeper_api.testing import make_players
+
+
+def timed(func, repeat):
+    "Return the best wall time of func over repeat runs"
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    "run the benchmark"
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--players', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    players_json = make_players(args.players)
+    records = list(players_json.values())
+    index = PlayerIndex()
+    index.load(players_json)
+
+    start = time.perf_counter()
+    table = table_for(index)
+    for field in ('age', 'years_exp', 'search_rank', 'weight', 'position', 'team'):
+        table.column(field)
+    build = time.perf_counter() - start
+
+    def weight(record):
+        try:
+            return float(record.get('weight'))
+        except (TypeError, ValueError):
+            return None
+
+    cases = [
+        ('young WRs by search_rank, top 10',
+         lambda: heapq.nsmallest(10, (r for r in records if r.get('position') == 'WR'
+                                      and r.get('age') is not None and r['age'] < 25
+                                      and r.get('search_rank') is not None),
+                                 key=lambda r: r['search_rank']),
+         lambda: table.filter({"position": "WR", "age": {"<": 25}})
+         .top('search_rank', 10, largest=False).to_models()),
+        ('age 25-29 with 3+ years, sorted by age',
+         lambda: sorted((r for r in records if r.get('age') is not None and 25 <= r['age'] <= 29
+                         and (r.get('years_exp') or 0) >= 3), key=lambda r: r['age']),
+         lambda: table.between('age', 25, 29).filter({"years_exp": {">=": 3}}).sort('age').rows),
+        ('heaviest 50 players',
+         lambda: heapq.nlargest(50, (r for r in records if weight(r) is not None), key=weight),
+         lambda: table.top('weight', 50).to_models()),
+        ('sort everyone by team',
+         lambda: sorted((r for r in records if r.get('team')), key=lambda r: r['team']),
+         lambda: table.sort('team').rows),
+    ]
+
+    print(f'{args.players} players, table with 6 columns built in {build * 1000:.1f}ms')
+    print(f'  {"query":42s} {"dicts":>10s} {"table":>10s}')
+    for name, over_dicts, over_table in cases:
+        dicts, columns = timed(over_dicts, args.repeat), timed(over_table, args.repeat)
+        print(f'  {name:42s} {dicts * 1000:8.2f}ms {columns * 1000:8.2f}ms '
+              f'({dicts / columns:.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
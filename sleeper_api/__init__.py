@@ -1,37 +1,110 @@
 """
 define what is accessible for the sleeper_api
 """
-# Import the main client class for easy access
-from .client import SleeperClient
-
-# Import specific resource classes if needed
-from .endpoints.user_endpoint import UserEndpoint
-from .endpoints.league_endpoint import LeagueEndpoint
-from .endpoints.draft_endpoint import DraftEndpoint
-from .endpoints.player_endpoint import PlayerEndpoint
-
-# Import specific data models
-from .models.brackets import BracketModel
-from .models.draft import DraftModel
-from .models.league import LeagueModel
-from .models.matchups import MatchupModel
-from .models.picks import PicksModel
-from .models.player import PlayerModel
-from .models.roster import RosterModel
-from .models.traded_picks import TradedPickModel
-from .models.transactions import TransactionsModel
-from .models.user import UserModel
-
-# Import any exceptions you want to expose
-from .exceptions import SleeperAPIError, UserNotFoundError
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Public names and the module that defines them. They are imported on first access
+# (PEP 562), so `import sleeper_api` stays cheap and only pulls in requests, aiohttp or
+# platformdirs once a client or endpoint is actually used.
+_LAZY_IMPORTS = {
+    # the main client classes
+    "SleeperClient": ".client",
+    "AsyncSleeperClient": ".async_client",
+    "ResponseCache": ".cache",
+    "TokenBucket": ".rate_limit",
+    "SqliteTokenBucket": ".rate_limit",
+    "RetryPolicy": ".retry",
+    "CircuitBreaker": ".retry",
+    "MetricsCollector": ".metrics",
+    "RequestEvent": ".metrics",
+    # resource classes
+    "UserEndpoint": ".endpoints.user_endpoint",
+    "LeagueEndpoint": ".endpoints.league_endpoint",
+    "DraftEndpoint": ".endpoints.draft_endpoint",
+    "PlayerEndpoint": ".endpoints.player_endpoint",
+    "AsyncUserEndpoint": ".endpoints.async_user_endpoint",
+    "AsyncLeagueEndpoint": ".endpoints.async_league_endpoint",
+    "AsyncDraftEndpoint": ".endpoints.async_draft_endpoint",
+    "AsyncPlayerEndpoint": ".endpoints.async_player_endpoint",
+    # data models
+    "BracketModel": ".models.brackets",
+    "DraftModel": ".models.draft",
+    "LeagueModel": ".models.league",
+    "MatchupModel": ".models.matchups",
+    "PicksModel": ".models.picks",
+    "PlayerModel": ".models.player",
+    "RosterModel": ".models.roster",
+    "TradedPickModel": ".models.traded_picks",
+    "TransactionsModel": ".models.transactions",
+    "TrendingPlayerModel": ".models.trending",
+    "UserModel": ".models.user",
+    # exceptions
+    "SleeperAPIError": ".exceptions",
+    "UserNotFoundError": ".exceptions",
+    "CircuitOpenError": ".exceptions",
+}
+
+if TYPE_CHECKING:
+    from .client import SleeperClient
+    from .async_client import AsyncSleeperClient
+    from .cache import ResponseCache
+    from .rate_limit import TokenBucket, SqliteTokenBucket
+    from .retry import RetryPolicy, CircuitBreaker
+    from .metrics import MetricsCollector, RequestEvent
+    from .endpoints.user_endpoint import UserEndpoint
+    from .endpoints.league_endpoint import LeagueEndpoint
+    from .endpoints.draft_endpoint import DraftEndpoint
+    from .endpoints.player_endpoint import PlayerEndpoint
+    from .endpoints.async_user_endpoint import AsyncUserEndpoint
+    from .endpoints.async_league_endpoint import AsyncLeagueEndpoint
+    from .endpoints.async_draft_endpoint import AsyncDraftEndpoint
+    from .endpoints.async_player_endpoint import AsyncPlayerEndpoint
+    from .models.brackets import BracketModel
+    from .models.draft import DraftModel
+    from .models.league import LeagueModel
+    from .models.matchups import MatchupModel
+    from .models.picks import PicksModel
+    from .models.player import PlayerModel
+    from .models.roster import RosterModel
+    from .models.traded_picks import TradedPickModel
+    from .models.transactions import TransactionsModel
+    from .models.trending import TrendingPlayerModel
+    from .models.user import UserModel
+    from .exceptions import SleeperAPIError, UserNotFoundError, CircuitOpenError
+
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 # Define the public API of the package
 __all__ = [
     "SleeperClient",
+    "AsyncSleeperClient",
+    "ResponseCache",
+    "TokenBucket",
+    "SqliteTokenBucket",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "MetricsCollector",
+    "RequestEvent",
     "UserEndpoint",
     "LeagueEndpoint",
     "DraftEndpoint",
     "PlayerEndpoint",
+    "AsyncUserEndpoint",
+    "AsyncLeagueEndpoint",
+    "AsyncDraftEndpoint",
+    "AsyncPlayerEndpoint",
     "BracketModel",
     "DraftModel",
     "LeagueModel",
@@ -41,9 +114,11 @@ __all__ = [
     "RosterModel",
     "TradedPickModel",
     "TransactionsModel",
+    "TrendingPlayerModel",
     "UserModel",
     "SleeperAPIError",
     "UserNotFoundError",
+    "CircuitOpenError",
 ]
 
 __version__ = "0.1.0"
@@ -0,0 +1,337 @@
+"""
+This module provides the `AsyncSleeperClient` class, an asyncio-native counterpart
+to `SleeperClient`.
+
+The async client lets a single event loop keep many Sleeper requests in flight at once.
+When `aiohttp` is installed (``pip install sleeper_fantasy_api[async]``) requests are
+made with a pooled `aiohttp.ClientSession`. Without it, the client falls back to running
+a pooled `requests.Session` on a bounded thread pool so the same async API still works.
+Concurrent identical GET requests can be coalesced into one.
+
+"""
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .coalesce import AsyncSingleFlight
+from .config import BASE_URL
+from .decoders import get_decoder
+from .exceptions import SleeperAPIError
+from .metrics import RequestEvent, emit
+from .rate_limit import SqliteTokenBucket
+from .utils import request_key
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - depends on the optional extra
+    aiohttp = None
+
+DEFAULT_MAX_CONCURRENCY = 100
+
+# errors worth retrying, and every error raised by either transport
+TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout, asyncio.TimeoutError)
+REQUEST_ERRORS = (requests.RequestException,)
+if aiohttp is not None:
+    TRANSIENT_ERRORS += (aiohttp.ClientConnectionError,)
+    REQUEST_ERRORS += (aiohttp.ClientError,)
+
+
+class AsyncSleeperClient:
+    """
+    AsyncSleeperClient performs API calls from inside an asyncio event loop.
+
+    Use it as an async context manager so the underlying connection pool is closed:
+
+        >>> async with AsyncSleeperClient() as client:
+        ...     user = await client.get('user/sleeperuser')
+    """
+    def __init__(self, api_key=None, timeout=10, base_url=BASE_URL,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, use_aiohttp=None, cache=None,
+                 rate_limiter=None, retry=None, circuit_breaker=None, coalesce=False,
+                 decoder='auto', hooks=None):
+        """
+        Initialize the AsyncSleeperClient.
+
+        :param api_key: Optional API key for authentication (if required).
+        :param timeout: Timeout for requests in seconds.
+        :param base_url: Root URL of the API, override to point at a local stub server.
+        :param max_concurrency: Maximum number of requests in flight at the same time.
+        :param use_aiohttp: Force the aiohttp transport on or off,
+            defaults to using it whenever it is installed.
+        :param cache: Optional `ResponseCache` used to answer repeated GET requests,
+            it can be shared with a `SleeperClient`. Its disk tier is read and written
+            on worker threads.
+        :param rate_limiter: Optional `TokenBucket`, each request awaits a token before it is sent.
+            A `SqliteTokenBucket` is reserved on worker threads.
+        :param retry: Optional `RetryPolicy` for 5xx, 429 and connection errors.
+        :param circuit_breaker: Optional `CircuitBreaker` that fails fast while the API is down.
+        :param coalesce: Share one in-flight request between coroutines making the same GET,
+            `client.single_flight.stats()` reports how many requests were saved.
+        :param decoder: JSON decoder for response bodies, a name or callable, see `get_decoder`.
+        :param hooks: Callables passed a `RequestEvent` after every request,
+            such as a `MetricsCollector`.
+        """
+        if use_aiohttp and aiohttp is None:
+            raise SleeperAPIError(
+                "aiohttp is not installed, install sleeper_fantasy_api[async] to use it.")
+
+        self.base_url = base_url
+        self.api_key = api_key # not currently required
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+        self.single_flight = AsyncSingleFlight() if coalesce else None
+        self.decoder = get_decoder(decoder)
+        self.hooks = list(hooks or [])
+        self.use_aiohttp = aiohttp is not None if use_aiohttp is None else use_aiohttp
+        self.headers = {
+            'Content-Type': 'application/json',
+            'Accept': 'application/json',
+        }
+
+        if self.api_key:
+            self.headers['Authorization'] = f'Bearer {self.api_key}'
+
+        self._session = None
+        self._executor = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _get_session(self):
+        """
+        Lazily create the transport, it has to be created inside the running event loop.
+        """
+        if self._session is not None:
+            return self._session
+
+        if self.use_aiohttp:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+            )
+        else:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._session = session
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix='sleeper-async')
+        return self._session
+
+    def _handle_response(self, status, body):
+        """
+        Handle the API response.
+
+        :param status: The HTTP status code.
+        :param body: The raw response body as bytes.
+        :return: The parsed JSON data or raise an error.
+        """
+        if status >= 400:
+            text = body.decode('utf-8', errors='replace')
+            raise SleeperAPIError(f"Error {status}: {text}")
+        try:
+            return self.decoder(body)
+        except ValueError as exc:
+            raise SleeperAPIError("Invalid JSON response received") from exc
+
+    async def _send_once(self, method, url, params=None, data=None):
+        """
+        Send a single request on the transport.
+
+        :return: Tuple of the status code, response headers and raw body.
+        """
+        session = self._get_session()
+
+        if self.use_aiohttp:
+            async with session.request(method, url, params=params, json=data) as response:
+                return response.status, response.headers, await response.read()
+
+        loop = asyncio.get_running_loop()
+        call = functools.partial(
+            session.request, method=method, url=url,
+            params=params, json=data, timeout=self.timeout)
+        response = await loop.run_in_executor(self._executor, call)
+        return response.status_code, response.headers, response.content
+
+    async def _in_executor(self, func, *args):
+        """
+        Run a blocking call, such as a disk cache read or a sqlite rate limiter
+        transaction, on the worker threads so the event loop keeps running.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    def add_hook(self, hook):
+        """
+        Register a callable that is passed a `RequestEvent` after every request.
+        """
+        self.hooks.append(hook)
+
+    async def _send(self, method, endpoint, url, params=None, data=None, event=None):
+        """
+        Send a request, waiting on the rate limiter and retrying transient failures.
+
+        :return: Tuple of the final status code and raw body.
+        :raises: CircuitOpenError if the circuit breaker is open.
+        """
+        attempt = 0
+        while True:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request(endpoint)
+
+            try:
+                if self.rate_limiter is not None:
+                    # the sqlite bucket may wait on another process's lock, keep that off the loop
+                    if isinstance(self.rate_limiter, SqliteTokenBucket):
+                        wait = await self._in_executor(self.rate_limiter.reserve)
+                    else:
+                        wait = self.rate_limiter.reserve()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                status, headers, body = await self._send_once(method, url, params, data)
+            except TRANSIENT_ERRORS as exc:
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure()
+                delay = self.retry.next_delay(attempt) if self.retry is not None else None
+                if delay is None:
+                    raise SleeperAPIError(f"Request to {endpoint} failed: {exc}") from exc
+            except REQUEST_ERRORS as exc:
+                # not retried, but it ends a half open probe like any other failure
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure()
+                raise SleeperAPIError(f"Request to {endpoint} failed: {exc}") from exc
+            except BaseException:
+                # cancelled, e.g. by asyncio.wait_for, still end a half open probe
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure()
+                raise
+            else:
+                if self.circuit_breaker is not None:
+                    if status >= 500:
+                        self.circuit_breaker.record_failure()
+                    else:
+                        self.circuit_breaker.record_success()
+                if self.retry is None or not self.retry.is_retryable_status(status):
+                    return status, body
+                delay = self.retry.next_delay(attempt, headers.get('Retry-After'))
+                if delay is None:
+                    return status, body
+
+            self.retry.record_retry(endpoint)
+            if event is not None:
+                event.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _request(self, method, endpoint, params=None, data=None):
+        """
+        Make a request to the Sleeper API without blocking the event loop.
+
+        :param method: HTTP method (GET, POST, etc.).
+        :param endpoint: API endpoint (e.g., 'user/{user_id}').
+        :param params: URL parameters.
+        :param data: Request payload for POST/PUT requests.
+        :return: Parsed JSON response.
+        """
+        url = f'{self.base_url}/{endpoint}'
+        key = request_key(method, url, params)
+        event = RequestEvent(method, endpoint)
+        start = time.perf_counter()
+
+        try:
+            # the memory tier is cheap, the disk tier reads files so it runs in the executor
+            disk_cache = self.cache is not None and self.cache.disk_dir is not None
+            if self.cache is not None and method == 'GET':
+                cached = (await self._in_executor(self.cache.get, key) if disk_cache
+                          else self.cache.get(key))
+                if cached is not None:
+                    event.cache, event.status, event.bytes_received = 'hit', 200, len(cached)
+                    return self._handle_response(200, cached)
+                event.cache = 'miss'
+
+            shared = False
+            if self.single_flight is not None and method == 'GET':
+                # waiters share the raw body but each one decodes its own copy
+                (status, body), shared = await self.single_flight.do(
+                    key, lambda: self._send(method, endpoint, url, params=params, event=event))
+                if shared:
+                    event.cache = 'coalesced'
+            else:
+                status, body = await self._send(
+                    method, endpoint, url, params=params, data=data, event=event)
+
+            event.status, event.bytes_received = status, len(body)
+            result = self._handle_response(status, body)
+            if self.cache is not None and method == 'GET' and not shared:
+                if disk_cache:
+                    await self._in_executor(self.cache.set, key, endpoint, body, result)
+                else:
+                    self.cache.set(key, endpoint, body, result)
+            return result
+        except Exception as exc:
+            event.error = exc
+            raise
+        finally:
+            if self.hooks:
+                event.latency = time.perf_counter() - start
+                emit(self.hooks, event)
+
+    async def get(self, endpoint, params=None):
+        """
+        Make a GET request. Currently sleeper API only supports reading.
+
+        :param endpoint: API endpoint (e.g., 'user/{user_id}').
+        :param params: URL parameters.
+        :return: Parsed JSON response.
+        """
+        return await self._request('GET', endpoint, params=params)
+
+    async def get_many(self, endpoints, return_exceptions=False):
+        """
+        Fetch many endpoints concurrently, bounded by max_concurrency.
+
+        :param endpoints: Iterable of endpoints, or (endpoint, params) tuples.
+        :param return_exceptions: Put a failed request's exception in its slot instead of raising.
+        :return: List of parsed JSON responses in the same order as endpoints.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(endpoint):
+            endpoint, params = endpoint if isinstance(endpoint, tuple) else (endpoint, None)
+            async with semaphore:
+                return await self.get(endpoint, params)
+
+        return list(await asyncio.gather(
+            *(fetch(endpoint) for endpoint in endpoints), return_exceptions=return_exceptions))
+
+    async def close(self):
+        """
+        Close the underlying connection pool and worker threads.
+        """
+        if self._session is None:
+            return
+        if self.use_aiohttp:
+            await self._session.close()
+        else:
+            self._session.close()
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._session = None
+
+    def get_base_url(self):
+        "Returns the base url"
+        return self.base_url
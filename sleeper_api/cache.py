@@ -0,0 +1,266 @@
+"""
+This module provides the `ResponseCache` class, an optional two tier cache for raw
+API responses used by `SleeperClient.get`.
+
+The memory tier is an LRU bounded by the total size of the cached bodies. The optional
+disk tier keeps responses across processes and restarts. How long a response is kept is
+decided per endpoint pattern by a list of TTL policies, see `DEFAULT_TTL_POLICIES`.
+
+Bodies are cached as the raw bytes received, so every hit decodes a fresh object and
+callers can safely mutate what they get back.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+from .utils import request_key
+
+# a ttl is a number of seconds, None to cache forever, or a callable that
+# receives the decoded response and returns one of those
+TTL = Union[float, None, Callable[[Any], Optional[float]]]
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def completed_draft_ttl(draft_json) -> Optional[float]:
+    """
+    Drafts never change once complete so they are cached forever,
+    drafts still in progress are only cached briefly.
+    """
+    if isinstance(draft_json, dict) and draft_json.get('status') == 'complete':
+        return None
+    return 30
+
+
+# first matching pattern wins, endpoints that match nothing use the default ttl
+DEFAULT_TTL_POLICIES: List[Tuple[str, TTL]] = [
+    ("players/*/trending/*", 30),
+    ("players/*", 0),  # the full player list is cached on disk by PlayerEndpoint
+    ("state/*", 60),
+    ("draft/*/picks", 30),
+    ("draft/*/traded_picks", 60),
+    ("draft/*", completed_draft_ttl),
+    ("league/*/matchups/*", 60),
+    ("league/*/transactions/*", 60),
+    ("league/*/rosters", 300),
+    ("league/*/users", 300),
+    ("league/*/traded_picks", 300),
+    ("league/*/*_bracket", 300),
+    ("league/*/drafts", 300),
+    ("league/*", 600),
+    ("user/*/leagues/*", 600),
+    ("user/*/drafts/*", 600),
+    ("user/*", 3600),
+]
+
+
+class ResponseCache:
+    """
+    Thread safe response cache with an in-memory LRU tier and an optional on-disk tier.
+
+        >>> cache = ResponseCache(max_bytes=16 * 1024 * 1024, disk_dir='~/.cache/sleeper')
+        >>> client = SleeperClient(cache=cache)
+        >>> cache.stats()
+        {'hits': 0, 'misses': 0, ...}
+    """
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttl_policies: Optional[List[Tuple[str, TTL]]] = None,
+                 default_ttl: TTL = 0, disk_dir=None,
+                 disk_max_bytes: Optional[int] = None):
+        """
+        Initialize the ResponseCache.
+
+        :param max_bytes: Maximum total size of the bodies held in memory.
+        :param ttl_policies: List of (endpoint pattern, ttl) pairs, checked in order.
+        :param default_ttl: The ttl for endpoints that match no pattern, 0 disables caching.
+        :param disk_dir: Optional directory for the on-disk tier.
+        :param disk_max_bytes: Optional size bound for the on-disk tier.
+        """
+        self.max_bytes = max_bytes
+        self.ttl_policies = DEFAULT_TTL_POLICIES if ttl_policies is None else ttl_policies
+        self.default_ttl = default_ttl
+        self.disk_dir = Path(disk_dir).expanduser() if disk_dir else None
+        self.disk_max_bytes = disk_max_bytes
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+        self._entries = OrderedDict()  # key -> (expires_at or None, body)
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    make_key = staticmethod(request_key)
+
+    def ttl_for(self, endpoint: str, data=None) -> Optional[float]:
+        """
+        Return the ttl in seconds for an endpoint, None means forever.
+
+        :param endpoint: API endpoint (e.g., 'league/{league_id}/rosters').
+        :param data: The decoded response, passed to callable policies.
+        """
+        path = endpoint.strip('/').split('?', 1)[0]
+        ttl = self.default_ttl
+        for pattern, policy in self.ttl_policies:
+            if fnmatchcase(path, pattern):
+                ttl = policy
+                break
+        return ttl(data) if callable(ttl) else ttl
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Return the cached body for the key, or None on a miss.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, body = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return body
+                self._remove(key)
+
+        entry = self._disk_get(key, now)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, *entry)
+        return entry[1]
+
+    def set(self, key: str, endpoint: str, body: bytes, data=None):
+        """
+        Cache a response body according to the ttl policy of its endpoint.
+
+        :param key: The key from `make_key`.
+        :param endpoint: API endpoint the body was returned from.
+        :param body: The raw response body.
+        :param data: The decoded response, passed to callable policies.
+        """
+        ttl = self.ttl_for(endpoint, data)
+        if ttl is not None and ttl <= 0:
+            return
+        expires_at = None if ttl is None else time.time() + ttl
+        with self._lock:
+            self._store(key, expires_at, body)
+        self._disk_set(key, expires_at, body)
+
+    def clear(self):
+        """
+        Remove every entry from both tiers.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+        if self.disk_dir:
+            for path in self.disk_dir.glob('*.cache'):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        """
+        Return the hit, miss and eviction counters along with the current size.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'size_bytes': self._size,
+                'max_bytes': self.max_bytes,
+            }
+
+    def _store(self, key, expires_at, body):
+        "Add to the memory tier and evict least recently used entries, caller holds the lock"
+        if len(body) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (expires_at, body)
+        self._size += len(body)
+        while self._size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key):
+        "Remove from the memory tier, caller holds the lock"
+        _, body = self._entries.pop(key)
+        self._size -= len(body)
+
+    def _disk_path(self, key) -> Path:
+        return self.disk_dir / (hashlib.sha256(key.encode()).hexdigest() + '.cache')
+
+    def _disk_get(self, key, now):
+        "Read an entry from the disk tier, removing it if expired"
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                header = f.readline()
+                body = f.read()
+        except OSError:
+            return None
+        try:
+            expires_at = None if header.strip() == b'-' else float(header)
+        except ValueError:
+            # truncated or not written by this cache, treat it as a miss
+            path.unlink(missing_ok=True)
+            return None
+        if expires_at is not None and expires_at <= now:
+            path.unlink(missing_ok=True)
+            return None
+        return expires_at, body
+
+    def _disk_set(self, key, expires_at, body):
+        "Write an entry to the disk tier through a temp file so readers never see partial data"
+        if not self.disk_dir:
+            return
+        header = b'-' if expires_at is None else repr(expires_at).encode()
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header + b'\n' + body)
+            os.replace(tmp_path, self._disk_path(key))
+        except OSError as e:
+            print(f"Warning: Could not write response cache file: {e}")
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+            return
+        if self.disk_max_bytes is not None:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        "Delete the oldest disk entries until the disk tier fits in disk_max_bytes"
+        files = []
+        for path in self.disk_dir.glob('*.cache'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            with self._lock:
+                self.evictions += 1
@@ -3,28 +3,68 @@ This module provides the `SleeperClient` class for interacting with the Sleeper
 
 The `SleeperClient` class facilitates making API calls to various endpoints of the Sleeper API.
 It supports handling HTTP requests and responses, including managing authentication 
-headers and timeouts.
+headers and timeouts, and can cache responses with an optional `ResponseCache`
+and throttle requests with an optional `TokenBucket` rate limiter. Transient failures
+can be retried with a `RetryPolicy` and a `CircuitBreaker` fails fast while the API is down.
+Concurrent identical GET requests from several threads can be coalesced into one, and
+`get_many` fetches many endpoints on a bounded thread pool that shares the connection pool.
+`iter_chunks` streams a large response body instead of holding it whole.
+Response bodies are decoded with the fastest installed JSON decoder, see `decoders.py`.
+Hooks receive a `RequestEvent` for every request, see `metrics.py`.
 
 """
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
-from .config import BASE_URL
+from requests.adapters import HTTPAdapter
+from .coalesce import SingleFlight
+from .config import BASE_URL, GET_MANY_MAX_WORKERS, POOL_MAXSIZE, STREAM_CHUNK_SIZE
+from .decoders import get_decoder
 from .exceptions import SleeperAPIError
+from .metrics import RequestEvent, emit
+from .utils import request_key
 
 class SleeperClient:
     """
     SleeperClient will be used to perform API calls across multiple endpoints.
     """
-    def __init__(self, api_key = None, timeout = 10):
+    def __init__(self, api_key = None, timeout = 10, base_url = BASE_URL, cache = None,
+                 rate_limiter = None, retry = None, circuit_breaker = None, coalesce = False,
+                 pool_maxsize = POOL_MAXSIZE, decoder = 'auto', hooks = None, transport = None):
         """
         Initialize the SleeperClient.
 
         :param api_key: Optional API key for authentication (if required).
         :param timeout: Timeout for requests in seconds.
+        :param base_url: Root URL of the API, override to point at a local stub server.
+        :param cache: Optional `ResponseCache` used to answer repeated GET requests.
+        :param rate_limiter: Optional `TokenBucket` shared by every thread using this client,
+            each request waits for a token before it is sent.
+        :param retry: Optional `RetryPolicy` for 5xx, 429 and connection errors.
+        :param circuit_breaker: Optional `CircuitBreaker` that fails fast while the API is down.
+        :param coalesce: Share one in-flight request between threads making the same GET,
+            `client.single_flight.stats()` reports how many requests were saved.
+        :param pool_maxsize: Connections kept open to the API, bounds useful `get_many` workers.
+        :param decoder: JSON decoder for response bodies, a name or callable, see `get_decoder`.
+        :param hooks: Callables passed a `RequestEvent` after every request,
+            such as a `MetricsCollector`.
+        :param transport: Optional requests transport adapter used in place of the default
+            one, such as a `RecordingAdapter` or `ReplayAdapter` from `sleeper_api.testing`.
         """
-        self.base_url = BASE_URL
+        self.base_url = base_url
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+        self.single_flight = SingleFlight() if coalesce else None
+        self.decoder = get_decoder(decoder)
+        self.hooks = list(hooks or [])
         self.api_key = api_key # not currently required
         self.timeout = timeout
         self.session = requests.Session()
+        adapter = transport if transport is not None else HTTPAdapter(pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         self.session.headers.update({
             'Content-Type': 'application/json',
             'Accept': 'application/json',
@@ -42,11 +82,85 @@ class SleeperClient:
         """
         if not response.ok:
             raise SleeperAPIError(f"Error {response.status_code}: {response.text}")
+        return self._decode(response.content)
+
+    def _decode(self, body):
+        """
+        Decode a raw response body, such as one returned from the cache.
+
+        :param body: The response body as bytes.
+        :return: The parsed JSON data or raise an error.
+        """
         try:
-            return response.json()
+            return self.decoder(body)
         except ValueError as exc:
             raise SleeperAPIError("Invalid JSON response received") from exc
 
+    def add_hook(self, hook):
+        """
+        Register a callable that is passed a `RequestEvent` after every request.
+        """
+        self.hooks.append(hook)
+
+    def _send(self, method, endpoint, url, params=None, data=None, event=None, stream=False):
+        """
+        Send a request, waiting on the rate limiter and retrying transient failures.
+        With stream, the body is left to be read from the returned response.
+
+        :return: The final HTTP response object.
+        :raises: CircuitOpenError if the circuit breaker is open.
+        """
+        attempt = 0
+        while True:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request(endpoint)
+
+            try:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire()
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    json=data,
+                    timeout=self.timeout,
+                    **({'stream': True} if stream else {})
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure()
+                delay = self.retry.next_delay(attempt) if self.retry is not None else None
+                if delay is None:
+                    raise
+            except requests.RequestException:
+                # not retried, but it ends a half open probe like any other failure
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure()
+                raise
+            except BaseException:
+                # the rate limiter failing or an interrupt, still end a half open probe
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure()
+                raise
+            else:
+                if self.circuit_breaker is not None:
+                    if response.status_code >= 500:
+                        self.circuit_breaker.record_failure()
+                    else:
+                        self.circuit_breaker.record_success()
+                if self.retry is None or not self.retry.is_retryable_status(response.status_code):
+                    return response
+                delay = self.retry.next_delay(attempt, response.headers.get('Retry-After'))
+                if delay is None:
+                    return response
+                response.close()  # give a streamed response's connection back to the pool
+
+            self.retry.record_retry(endpoint)
+            if event is not None:
+                event.retries += 1
+            attempt += 1
+            time.sleep(delay)
+
     def _request(self, method, endpoint, params=None, data=None):
         """
         Make a request to the Sleeper API.
@@ -57,16 +171,42 @@ class SleeperClient:
         :return: Parsed JSON response.
         """
         url = f'{self.base_url}/{endpoint}'
+        key = request_key(method, url, params)
+        event = RequestEvent(method, endpoint)
+        start = time.perf_counter()
 
-        response = self.session.request(
-            method=method,
-            url=url,
-            params=params,
-            json=data,
-            timeout=self.timeout
-        )
+        try:
+            if self.cache is not None and method == 'GET':
+                body = self.cache.get(key)
+                if body is not None:
+                    event.cache, event.status, event.bytes_received = 'hit', 200, len(body)
+                    return self._decode(body)
+                event.cache = 'miss'
+
+            shared = False
+            if self.single_flight is not None and method == 'GET':
+                # waiters share the response object but each one decodes its own copy
+                response, shared = self.single_flight.do(
+                    key, lambda: self._send(method, endpoint, url, params=params, event=event))
+                if shared:
+                    event.cache = 'coalesced'
+            else:
+                response = self._send(method, endpoint, url, params=params, data=data, event=event)
 
-        return self._handle_response(response)
+            event.status = response.status_code
+            if self.hooks:
+                event.bytes_received = len(response.content)
+            result = self._handle_response(response)
+            if self.cache is not None and method == 'GET' and not shared:
+                self.cache.set(key, endpoint, response.content, result)
+            return result
+        except Exception as exc:
+            event.error = exc
+            raise
+        finally:
+            if self.hooks:
+                event.latency = time.perf_counter() - start
+                emit(self.hooks, event)
 
     def get(self, endpoint, params=None):
         """
@@ -78,6 +218,96 @@ class SleeperClient:
         """
         return self._request('GET', endpoint, params=params)
 
+    def iter_chunks(self, endpoint, params=None, chunk_size = STREAM_CHUNK_SIZE):
+        """
+        Make a GET request and yield the response body in chunks as they are received,
+        without holding the whole body, such as to parse the players payload while it
+        downloads. The response cache and coalescing don't apply, the rate limiter,
+        retries and circuit breaker do.
+
+        :param endpoint: API endpoint (e.g., 'players/nfl').
+        :param params: URL parameters.
+        :param chunk_size: Bytes per chunk.
+        :return: Generator of bytes.
+        """
+        url = f'{self.base_url}/{endpoint}'
+        event = RequestEvent('GET', endpoint)
+        start = time.perf_counter()
+        response = None
+        try:
+            response = self._send('GET', endpoint, url, params=params, event=event, stream=True)
+            event.status = response.status_code
+            if not response.ok:
+                raise SleeperAPIError(f"Error {response.status_code}: {response.text}")
+            event.bytes_received = 0
+            for chunk in response.iter_content(chunk_size):
+                event.bytes_received += len(chunk)
+                yield chunk
+        except Exception as exc:
+            event.error = exc
+            raise
+        finally:
+            if response is not None:
+                response.close()
+            if self.hooks:
+                event.latency = time.perf_counter() - start
+                emit(self.hooks, event)
+
+    def iter_many(self, endpoints, max_workers = GET_MANY_MAX_WORKERS, return_exceptions = False):
+        """
+        Fetch many endpoints on a bounded thread pool, yielding results as they complete.
+
+        The worker threads share this client's connection pool, cache and rate limiter.
+
+        :param endpoints: Iterable of endpoints, or (endpoint, params) tuples.
+        :param max_workers: Maximum number of requests in flight at once.
+        :param return_exceptions: Yield a failed request's exception instead of raising it.
+        :return: Generator of (index, result) tuples, index is the position in endpoints.
+        """
+        requests_to_make = [
+            endpoint if isinstance(endpoint, tuple) else (endpoint, None)
+            for endpoint in endpoints
+        ]
+        if not requests_to_make:
+            return
+
+        pool = ThreadPoolExecutor(
+            max_workers=min(max_workers, len(requests_to_make)), thread_name_prefix='sleeper')
+        try:
+            futures = {
+                pool.submit(self.get, endpoint, params): index
+                for index, (endpoint, params) in enumerate(requests_to_make)
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as exc:  # pylint: disable=broad-except
+                    if not return_exceptions:
+                        raise
+                    result = exc
+                yield futures[future], result
+        finally:
+            # stop queued requests if the caller stopped early or a request failed
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def get_many(self, endpoints, max_workers = GET_MANY_MAX_WORKERS, return_exceptions = False):
+        """
+        Fetch many endpoints on a bounded thread pool.
+
+            >>> weeks = [f'league/{league_id}/matchups/{week}' for week in range(1, 19)]
+            >>> matchups = client.get_many(weeks, max_workers=8)
+
+        :param endpoints: Iterable of endpoints, or (endpoint, params) tuples.
+        :param max_workers: Maximum number of requests in flight at once.
+        :param return_exceptions: Put a failed request's exception in its slot instead of raising.
+        :return: List of parsed JSON responses in the same order as endpoints.
+        """
+        endpoints = list(endpoints)
+        results = [None] * len(endpoints)
+        for index, result in self.iter_many(endpoints, max_workers, return_exceptions):
+            results[index] = result
+        return results
+
     def get_base_url(self):
         "Returns the base url"
         return self.base_url
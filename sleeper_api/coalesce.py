@@ -0,0 +1,117 @@
+"""
+This module provides single-flight request coalescing for the clients.
+
+When several callers ask for the same key at the same time only the first one (the
+leader) does the work, everyone else waits for and shares its result. `SingleFlight`
+is for threaded callers of `SleeperClient` and `AsyncSingleFlight` is for coroutines
+using `AsyncSleeperClient`.
+
+The clients share the raw response and let every caller decode it separately,
+so callers never see each other's mutations.
+"""
+import asyncio
+import threading
+
+
+class _Call:
+    "A call in flight, waiters block on `done`"
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key from multiple threads.
+
+        >>> flight = SingleFlight()
+        >>> result, shared = flight.do('GET league/1', fetch_league)
+        >>> flight.stats()
+        {'calls': 1, 'coalesced': 0}
+    """
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """
+        Call fn unless a call with the same key is already in flight, then wait for that one.
+
+        :param key: Identifies identical calls, e.g. the method and full URL.
+        :param fn: Zero argument callable doing the work.
+        :return: Tuple of the result and whether it was shared from another caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def stats(self) -> dict:
+        """
+        Returns the number of calls made and how many requests were saved by coalescing.
+        """
+        with self._lock:
+            return {'calls': self.calls, 'coalesced': self.coalesced}
+
+
+class AsyncSingleFlight:
+    """
+    Coalesce concurrent calls with the same key from coroutines on one event loop.
+
+    The work runs in its own task, so cancelling the caller that started it does not
+    cancel it for the other waiters.
+    """
+    def __init__(self):
+        self._tasks = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key, coro_fn):
+        """
+        Await coro_fn() unless a call with the same key is already in flight, then await that one.
+
+        :param key: Identifies identical calls, e.g. the method and full URL.
+        :param coro_fn: Zero argument callable returning a coroutine.
+        :return: Tuple of the result and whether it was shared from another caller.
+        """
+        task = self._tasks.get(key)
+        shared = task is not None
+        if shared:
+            self.coalesced += 1
+        else:
+            self.calls += 1
+            task = self._tasks[key] = asyncio.ensure_future(coro_fn())
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await asyncio.shield(task), shared
+
+    def stats(self) -> dict:
+        """
+        Returns the number of calls made and how many requests were saved by coalescing.
+        """
+        return {'calls': self.calls, 'coalesced': self.coalesced}
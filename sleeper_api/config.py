@@ -35,3 +35,35 @@ CONVERT_RESULTS = True
 DEFAULT_SEASON = datetime.now().year
 
 CACHE_DURATION = timedelta(days=1)
+
+# player cache files ending in this are in the gzip JSON format used before the binary
+# cache, and are migrated to the same name ending in .bin
+LEGACY_CACHE_SUFFIX = '.json.gz'
+
+# with stale_while_revalidate, how long after expiring the player cache may still be
+# served while it is refreshed in the background, and how long to wait after a failed
+# background refresh before trying again
+PLAYER_CACHE_MAX_STALENESS = timedelta(days=1)
+PLAYER_REFRESH_RETRY_INTERVAL = timedelta(minutes=1)
+
+# seconds to wait for another process refreshing the player cache before downloading anyway
+PLAYER_CACHE_LOCK_TIMEOUT = 120
+
+# how long the changes found on each player cache refresh are kept for get_player_changes
+PLAYER_CHANGES_RETENTION = timedelta(days=30)
+
+# Sleeper asks clients to stay under roughly 1000 calls per minute,
+# this is the default rate for the optional rate limiters in rate_limit.py
+RATE_LIMIT_PER_MINUTE = 1000
+
+# connections kept open per host by SleeperClient, and the default number of
+# threads SleeperClient.get_many uses, which should not exceed the pool size
+POOL_MAXSIZE = 32
+GET_MANY_MAX_WORKERS = 16
+
+# bytes read at a time when SleeperClient.iter_chunks streams a response, such as the
+# players payload with PlayerEndpoint(streaming=True)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# number of distinct search_players queries whose results are kept per player index
+QUERY_CACHE_SIZE = 64
@@ -0,0 +1,68 @@
+"""
+This module picks the JSON decoder used for API responses and the player cache.
+
+The `players/nfl` payload is several megabytes, so decoding it dominates cold starts.
+`get_decoder` returns the fastest decoder that is installed: orjson, then msgspec,
+then the standard library. Install one with ``pip install sleeper_fantasy_api[fast]``.
+
+A decoder is any callable that takes the raw bytes (or str) of a JSON document and
+returns the decoded object, raising `ValueError` on invalid JSON.
+"""
+import json
+from typing import Any, Callable, Union
+
+Decoder = Callable[[Union[bytes, str]], Any]
+
+# preference order for get_decoder('auto')
+DECODER_NAMES = ('orjson', 'msgspec', 'json')
+
+
+def _orjson_decoder() -> Decoder:
+    import orjson  # pylint: disable=import-outside-toplevel
+    return orjson.loads
+
+
+def _msgspec_decoder() -> Decoder:
+    import msgspec  # pylint: disable=import-outside-toplevel
+    decode = msgspec.json.decode
+
+    def loads(data):
+        try:
+            return decode(data)
+        except msgspec.DecodeError as exc:
+            # keep the ValueError contract of the other decoders
+            raise ValueError(str(exc)) from exc
+    return loads
+
+
+def _json_decoder() -> Decoder:
+    return json.loads
+
+
+_LOADERS = {
+    'orjson': _orjson_decoder,
+    'msgspec': _msgspec_decoder,
+    'json': _json_decoder,
+}
+
+
+def get_decoder(decoder: Union[str, Decoder, None] = 'auto') -> Decoder:
+    """
+    Return a JSON decoding function.
+
+    :param decoder: 'auto' (or None) for the fastest installed decoder,
+        'orjson', 'msgspec' or 'json' to pick one, or a callable to use as is.
+    :raises: ValueError for an unknown name, ImportError if the named decoder isn't installed.
+    """
+    if callable(decoder):
+        return decoder
+    if decoder in (None, 'auto'):
+        for name in DECODER_NAMES:
+            try:
+                return _LOADERS[name]()
+            except ImportError:
+                continue
+    if decoder not in _LOADERS:
+        raise ValueError(f"Unknown JSON decoder: {decoder}, expected one of {DECODER_NAMES}")
+    return _LOADERS[decoder]()
+
@@ -7,6 +7,9 @@ It imports and exposes the following endpoint classes:
 - `DraftEndpoint`: For handling draft-related API endpoints.
 - `PlayerEndpoint`: For accessing player-related API endpoints.
 
+Each endpoint also has an asyncio counterpart (`AsyncUserEndpoint`, `AsyncLeagueEndpoint`,
+`AsyncDraftEndpoint` and `AsyncPlayerEndpoint`) for use with an `AsyncSleeperClient`.
+
 Usage:
 ------
 To use the provided endpoint classes, import them from this module:
@@ -29,17 +32,55 @@ The `__all__` list controls what is imported when `from your_module import *` is
 - `LeagueEndpoint`
 - `DraftEndpoint`
 - `PlayerEndpoint`
+- and their `Async` counterparts
 """
 
 
-from .user_endpoint import UserEndpoint
-from .league_endpoint import LeagueEndpoint
-from .draft_endpoint import DraftEndpoint
-from .player_endpoint import PlayerEndpoint
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# imported on first access (PEP 562), the player endpoint pulls in platformdirs
+_LAZY_IMPORTS = {
+    "UserEndpoint": ".user_endpoint",
+    "LeagueEndpoint": ".league_endpoint",
+    "DraftEndpoint": ".draft_endpoint",
+    "PlayerEndpoint": ".player_endpoint",
+    "AsyncUserEndpoint": ".async_user_endpoint",
+    "AsyncLeagueEndpoint": ".async_league_endpoint",
+    "AsyncDraftEndpoint": ".async_draft_endpoint",
+    "AsyncPlayerEndpoint": ".async_player_endpoint",
+}
+
+if TYPE_CHECKING:
+    from .user_endpoint import UserEndpoint
+    from .league_endpoint import LeagueEndpoint
+    from .draft_endpoint import DraftEndpoint
+    from .player_endpoint import PlayerEndpoint
+    from .async_user_endpoint import AsyncUserEndpoint
+    from .async_league_endpoint import AsyncLeagueEndpoint
+    from .async_draft_endpoint import AsyncDraftEndpoint
+    from .async_player_endpoint import AsyncPlayerEndpoint
+
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 __all__ = [
     "UserEndpoint",
     "LeagueEndpoint",
     "DraftEndpoint",
     "PlayerEndpoint",
+    "AsyncUserEndpoint",
+    "AsyncLeagueEndpoint",
+    "AsyncDraftEndpoint",
+    "AsyncPlayerEndpoint",
 ]
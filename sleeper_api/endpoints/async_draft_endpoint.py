@@ -0,0 +1,90 @@
+"""
+This module provides the `AsyncDraftEndpoint` class, the asyncio counterpart of
+`DraftEndpoint`, for use with an `AsyncSleeperClient`.
+
+It converts results with the same model classes as the synchronous endpoint.
+"""
+import asyncio
+from typing import List, Dict
+from ..models.draft import DraftModel
+from ..models.picks import PicksModel
+from ..models.traded_picks import TradedPickModel
+from ..config import CONVERT_RESULTS, DEFAULT_SEASON
+
+class AsyncDraftEndpoint:
+    """
+    Provides awaitable methods for the draft-related API endpoints of the Sleeper API.
+
+    See `DraftEndpoint` for a description of each method.
+
+        >>> async with AsyncSleeperClient() as client:
+        ...     draft = await AsyncDraftEndpoint(client).get_draft_by_id('draft_id')
+    """
+    def __init__(self, client):
+        self.client = client
+
+    async def get_draft_by_id(self, draft_id: str, convert_results = CONVERT_RESULTS) -> DraftModel:
+        """
+        Retrieve a specific draft by its ID.
+        """
+        endpoint = f"draft/{draft_id}"
+        draft_json = await self.client.get(endpoint)
+
+        if not convert_results:
+            return draft_json
+
+        return DraftModel.from_json(draft_json)
+
+    async def get_drafts_by_league(self, league_id: str,
+                                   convert_results = CONVERT_RESULTS
+                                   ) -> List[DraftModel]:
+        """
+        Retrieve all drafts for a specific league.
+        """
+        endpoint = f"league/{league_id}/drafts"
+        drafts_json = await self.client.get(endpoint)
+
+        if not convert_results:
+            return drafts_json
+
+        return [DraftModel.from_json(draft) for draft in drafts_json]
+
+    async def get_drafts_by_user(self, user_id: str, sport: str = 'nfl',
+                                 season: int = DEFAULT_SEASON, convert_results = CONVERT_RESULTS
+                                 ) -> List[DraftModel]:
+        """
+        Retrieve all drafts for a specific user in a given season.
+        The full draft lookups are made concurrently.
+        """
+        endpoint = f"user/{user_id}/drafts/{sport}/{season}"
+        drafts_json = await self.client.get(endpoint)
+
+        if not convert_results:
+            return drafts_json
+
+        draft_ids = [draft['draft_id'] for draft in drafts_json]
+        return list(await asyncio.gather(*(self.get_draft_by_id(draft_id) for draft_id in draft_ids)))
+
+    async def get_draft_picks(self, draft_id: str, convert_results = CONVERT_RESULTS) -> List[Dict]:
+        """
+        Retrieve all picks made in a specific draft.
+        """
+        endpoint = f"draft/{draft_id}/picks"
+        picks_json = await self.client.get(endpoint)
+
+        if not convert_results:
+            return picks_json
+
+        return [PicksModel.from_dict(pick) for pick in picks_json]
+
+    async def get_traded_picks(self, draft_id: int, convert_results = CONVERT_RESULTS) -> List[Dict]:
+        """
+        Retrieve all traded picks in a specific draft.
+        """
+        endpoint = f"draft/{draft_id}/traded_picks"
+        traded_pick_json = await self.client.get(endpoint)
+
+        if not convert_results:
+            return traded_pick_json
+
+        return [TradedPickModel.from_dict(traded_pick) for traded_pick in traded_pick_json]
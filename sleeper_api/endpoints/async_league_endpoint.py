@@ -0,0 +1,133 @@
+"""
+This module provides the `AsyncLeagueEndpoint` class, the asyncio counterpart of
+`LeagueEndpoint`, for use with an `AsyncSleeperClient`.
+
+It converts results with the same model classes as the synchronous endpoint.
+"""
+import asyncio
+from typing import Dict, List
+from ..models.league import LeagueModel
+from ..models.roster import RosterModel
+from ..models.matchups import MatchupModel
+from ..models.brackets import BracketModel
+from ..models.transactions import TransactionsModel
+from ..models.traded_picks import TradedPickModel
+from .async_user_endpoint import AsyncUserEndpoint
+from ..config import CONVERT_RESULTS
+from ..exceptions import SleeperAPIError
+
+class AsyncLeagueEndpoint:
+    """
+    Provides awaitable methods for the league-related API endpoints of the Sleeper API.
+
+    See `LeagueEndpoint` for a description of each method.
+    """
+    def __init__(self, client):
+        self.client = client
+
+    async def get_league_by_id(self, league_id: str) -> LeagueModel:
+        """
+        Retrieve a specific league by its ID.
+        """
+        endpoint = f"league/{league_id}"
+        league_data = await self.client.get(endpoint)
+        if league_data is None:
+            raise SleeperAPIError("League not found")
+        return LeagueModel.from_json(league_data)
+
+    async def get_rosters(self, league_id: str, convert_results = CONVERT_RESULTS) -> List[Dict]:
+        """
+        Retrieve the rosters for a given league.
+        """
+        endpoint = f"league/{league_id}/rosters"
+        rosters_json = await self.client.get(endpoint)
+        if not convert_results:
+            return rosters_json
+
+        return [RosterModel.from_dict(roster_data) for roster_data in rosters_json]
+
+    async def get_users(self, league_id: str, convert_results = CONVERT_RESULTS) -> List[Dict]:
+        """
+        Retrieve the users in a given league.
+        When convert_results is True the full user records are looked up concurrently.
+        """
+        endpoint = f"league/{league_id}/users"
+        users_json = await self.client.get(endpoint)
+
+        if not convert_results:
+            return users_json
+
+        user_endpoint = AsyncUserEndpoint(self.client)
+        return list(await asyncio.gather(
+            *(user_endpoint.get_user(user.get("user_id")) for user in users_json)))
+
+    async def get_matchups(
+            self, league_id: str, week: int,
+            convert_results = CONVERT_RESULTS
+            ) -> List[Dict]:
+        """
+        Retrieve the matchups for a given league and week.
+        """
+        endpoint = f"league/{league_id}/matchups/{week}"
+        matchup_json = await self.client.get(endpoint)
+
+        if not convert_results:
+            return matchup_json
+
+        return [MatchupModel.from_dict(matchup_data) for matchup_data in matchup_json]
+
+    async def get_winners_bracket(
+            self, league_id: str, convert_results = CONVERT_RESULTS
+            ) -> List[Dict]:
+        """
+        Retrieve the winner's bracket for a given league.
+        """
+        endpoint = f"league/{league_id}/winners_bracket"
+        bracket_json = await self.client.get(endpoint)
+
+        if not convert_results:
+            return bracket_json
+
+        return [BracketModel.from_dict(bracket_data) for bracket_data in bracket_json]
+
+    async def get_losers_bracket(
+            self, league_id: str, convert_results = CONVERT_RESULTS
+            ) -> List[Dict]:
+        """
+        Retrieve the loser's bracket for a given league.
+        """
+        endpoint = f"league/{league_id}/losers_bracket"
+        bracket_json = await self.client.get(endpoint)
+
+        if not convert_results:
+            return bracket_json
+
+        return [BracketModel.from_dict(bracket_data) for bracket_data in bracket_json]
+
+    async def get_transactions(
+            self, league_id: str, week: int, convert_results = CONVERT_RESULTS
+            ) -> List[Dict]:
+        """
+        Retrieve transactions for a given league. Filter by week.
+        """
+        endpoint = f"league/{league_id}/transactions/{week}"
+        transactions_json = await self.client.get(endpoint)
+
+        if not convert_results:
+            return transactions_json
+
+        return [TransactionsModel.from_dict(transaction_data) for transaction_data in transactions_json]
+
+    async def get_traded_picks(
+            self, league_id: str, convert_results = CONVERT_RESULTS
+            ) -> List[Dict]:
+        """
+        Retrieve traded picks for a given league.
+        """
+        endpoint = f"league/{league_id}/traded_picks"
+        traded_picks_json = await self.client.get(endpoint)
+
+        if not convert_results:
+            return traded_picks_json
+
+        return [TradedPickModel.from_dict(traded_pick) for traded_pick in traded_picks_json]
@@ -0,0 +1,298 @@
+"""
+This module provides the `AsyncPlayerEndpoint` class, the asyncio counterpart of
+`PlayerEndpoint`, for use with an `AsyncSleeperClient`.
+
+Only the network calls are awaited. Caching, filtering and model conversion are
+delegated to a `PlayerEndpoint` so both share the same cache file and logic. Reading,
+decoding and writing the cache, building the index and reading the change log and the
+player history run in a worker thread (`asyncio.to_thread`), so they don't stall the
+event loop.
+"""
+import asyncio
+import time
+from typing import TYPE_CHECKING, Iterable, List, Dict, Optional, Any, Tuple, Union
+from ..models.player import PlayerModel
+from ..models.trending import TrendingPlayerModel
+from ..config import CONVERT_RESULTS, PLAYER_CACHE_LOCK_TIMEOUT, PLAYER_CACHE_MAX_STALENESS
+from ..player_index import PlayerIndex
+from ..player_query import explain_query
+from .player_endpoint import PlayerEndpoint
+
+if TYPE_CHECKING:
+    from datetime import datetime
+    from ..player_changes import PlayerChanges
+    from ..player_table import PlayerTable
+
+class AsyncPlayerEndpoint:
+    """
+    Player endpoint class to enable easy interactions with the API for player info
+    from an asyncio event loop.
+    """
+    def __init__(self, client, cache_file=None, decoder='auto', stale_while_revalidate=False,
+                 max_staleness=PLAYER_CACHE_MAX_STALENESS, cache_durations=None,
+                 memory_limits=None, history=False):
+        """
+        See `PlayerEndpoint`, with stale_while_revalidate the expired cache is refreshed by
+        an asyncio task.
+        """
+        self.client = client
+        # the synchronous endpoint is only used for its cache and helpers, never for requests
+        self.players = PlayerEndpoint(client, cache_file=cache_file, decoder=decoder,
+                                      stale_while_revalidate=stale_while_revalidate,
+                                      max_staleness=max_staleness,
+                                      cache_durations=cache_durations,
+                                      memory_limits=memory_limits,
+                                      history=history)
+
+    async def _fetch_players_json(self, sport: str = 'nfl') -> Dict[str, Dict]:
+        """
+        Return the raw players payload, from the cache when valid or else from the API.
+        """
+        players = self.players
+
+        def read_cache():
+            "Return the cached payload, or None, and whether it has expired"
+            if players._is_cache_valid(sport):
+                return players._load_cache(sport), False
+            if players._can_serve_stale(sport):
+                try:
+                    return players._load_cache(sport), True
+                except (OSError, ValueError):
+                    pass
+            return None, True
+
+        players_json, expired = await asyncio.to_thread(read_cache)
+        if players_json is not None:
+            if expired:
+                self._revalidate(sport)
+            return players_json
+        return await self._download_players(sport)
+
+    async def _download_players(self, sport: str = 'nfl',
+                                wait: bool = True) -> Optional[Dict[str, Dict]]:
+        """
+        Fetch the players payload from the API and store it in the cache under the cache
+        lock, see `PlayerEndpoint._download_players`. The lock is polled so waiting for
+        another process doesn't block the event loop.
+        """
+        lock = self.players._cache_lock(sport)
+        deadline = time.monotonic() + PLAYER_CACHE_LOCK_TIMEOUT
+        while not lock.try_acquire():
+            if not wait:
+                return None
+            if time.monotonic() >= deadline:
+                print("Warning: Timed out waiting for the player cache lock, downloading anyway")
+                break
+            await asyncio.sleep(lock.poll_interval)
+        try:
+            if await asyncio.to_thread(self.players._is_cache_valid, sport):
+                return await asyncio.to_thread(self.players._load_cache, sport)
+            players_json = await self.client.get(f"players/{sport}")
+            await asyncio.to_thread(self.players._store_players, players_json, sport)
+            return players_json
+        finally:
+            lock.release()
+
+    def _revalidate(self, sport: str = 'nfl'):
+        """
+        Count a call served from the expired cache and refresh it in an asyncio task,
+        unless a refresh is already running.
+        """
+        refresher = self.players._refresher(sport)
+        refresher.served_stale()
+        refresher.start_task(lambda: self._refresh_in_background(sport))
+
+    async def _refresh_in_background(self, sport: str = 'nfl') -> bool:
+        # if another process is already refreshing, keep serving the expired cache
+        return await self._download_players(sport, wait=False) is not None
+
+    async def _player_index(self, sport: str = 'nfl') -> PlayerIndex:
+        """
+        Return the shared player index, rebuilding it when the cache has changed since it was built.
+        """
+        players = self.players
+        index = players._shared_index(sport)
+        if players._index_is_current(index, sport):
+            players._enforce_memory_limit(index, sport)
+            return index
+        if (players._can_serve_stale(sport)
+                and await asyncio.to_thread(players._load_stale_index, index, sport)):
+            self._revalidate(sport)
+            return index
+        if not await asyncio.to_thread(players._load_index_from_cache, index, sport):
+            players_json = await self._fetch_players_json(sport)
+
+            def load_index():
+                # unless the refresh already updated the index in place
+                generation = players._cache_generation(sport)
+                if not index.is_current(generation):
+                    index.load(players_json, generation)
+            await asyncio.to_thread(load_index)
+        await asyncio.to_thread(players._enforce_memory_limit, index, sport)
+        return index
+
+    async def get_all_players(
+            self, sport = 'nfl', convert_results = CONVERT_RESULTS
+            ) -> List[PlayerModel]:
+        """
+        Retrieve all players, either from the cache or by making an API call.
+        """
+        players_json = await self._fetch_players_json(sport)
+
+        if not convert_results:
+            return players_json
+
+        return await asyncio.to_thread(self.players._to_models, players_json)
+
+    async def get_trending_players(
+            self, trend_type: str, sport: str = 'nfl', lookback_hours: Optional[int] = 24,
+            limit: Optional[int] = 25, convert_results=CONVERT_RESULTS
+            ) -> List[TrendingPlayerModel]:
+        """
+        Retrieve trending players based on adds or drops.
+
+        :param sport: The sport, such as 'nfl'.
+        :param trend_type: Either 'add' or 'drop'.
+        :param lookback_hours: Number of hours to look back (default is 24).
+        :param limit: Number of results you want (default is 25).
+        :return: A list of TrendingPlayerModel instances if convert_results is True, or the raw data if False.
+        """
+        endpoint = self.players._trending_endpoint(trend_type, sport, lookback_hours, limit)
+        if not convert_results:
+            return await self.client.get(endpoint)
+
+        # the player index loads while the trending request is in flight
+        trending_data, index = await asyncio.gather(
+            self.client.get(endpoint), self._player_index(sport))
+        return self.players._join_trending(trending_data, index, trend_type, lookback_hours)
+
+    async def get_trending_windows(
+            self, trend_types: Union[str, Iterable[str]] = ('add', 'drop'),
+            lookback_hours: Union[int, Iterable[int]] = (24,), sport: str = 'nfl',
+            limit: Optional[int] = 25, convert_results=CONVERT_RESULTS
+            ) -> Dict[Tuple[str, int], List[TrendingPlayerModel]]:
+        """
+        Retrieve the trending players of several trend types and lookback windows at once,
+        see `PlayerEndpoint.get_trending_windows`.
+        """
+        windows = self.players._trending_windows(trend_types, lookback_hours)
+        endpoints = [self.players._trending_endpoint(trend_type, sport, hours, limit)
+                     for trend_type, hours in windows]
+        if not convert_results:
+            return dict(zip(windows, await self.client.get_many(endpoints)))
+
+        responses, index = await asyncio.gather(
+            self.client.get_many(endpoints), self._player_index(sport))
+        return {window: self.players._join_trending(trending_data, index, *window)
+                for window, trending_data in zip(windows, responses)}
+
+    async def get_player(self, player_id, sport: str = 'nfl') -> PlayerModel:
+        """
+        Returns a specific playerModel for the player ID, see `PlayerEndpoint.get_player`.
+        """
+        return self.players._find_player(await self._player_index(sport), player_id)
+
+    async def get_players(self, player_ids: List[str], sport: str = 'nfl',
+                          convert_results=CONVERT_RESULTS) -> List[PlayerModel]:
+        """
+        Returns the players for a list of player IDs, see `PlayerEndpoint.get_players`.
+        """
+        return self.players._find_players(await self._player_index(sport), player_ids,
+                                          convert_results)
+
+    async def search_players(self, search_keys: Dict[str, Any], convert_results=CONVERT_RESULTS,
+                             sport: str = 'nfl', fields: Optional[List[str]] = None,
+                             order_by: Optional[Union[str, List[str]]] = None,
+                             limit: Optional[int] = None, iterator: bool = False):
+        """
+        Search for players based on complex criteria, see `PlayerEndpoint.search_players`.
+        """
+        return self.players._search_index(await self._player_index(sport), search_keys,
+                                          convert_results, fields, order_by, limit, iterator)
+
+    async def search_by_name(self, query: str, limit: int = 10, position=None, team=None,
+                             active: Optional[bool] = None, sport: str = 'nfl',
+                             convert_results=CONVERT_RESULTS):
+        """
+        Find players by a partial or misspelled name, see `PlayerEndpoint.search_by_name`.
+        """
+        return self.players._search_names(await self._player_index(sport), query, limit,
+                                          position, team, active, convert_results)
+
+    async def explain(self, search_keys: Dict[str, Any], sport: str = 'nfl') -> str:
+        """
+        Describe how a search is answered, see `PlayerEndpoint.explain`.
+        """
+        return explain_query(await self._player_index(sport), search_keys)
+
+    async def get_player_table(self, sport: str = 'nfl') -> 'PlayerTable':
+        """
+        Returns a columnar `PlayerTable` of every player, see `PlayerEndpoint.get_player_table`.
+        """
+        # numpy is an optional dependency, only imported once a table is asked for
+        from ..player_table import table_for  # pylint: disable=import-outside-toplevel
+        return table_for(await self._player_index(sport))
+
+    async def get_players_by_team(self, team_abbr, sport: str = 'nfl') -> List[PlayerModel]:
+        '''return a list of player models where the team_abbr matches the player team_abbr'''
+        return self.players._find_by_team(await self._player_index(sport), team_abbr)
+
+    async def get_player_changes(self, since=None, sport: str = 'nfl') -> 'PlayerChanges':
+        """
+        Returns what changed across the cache refreshes after a time, see
+        `PlayerEndpoint.get_player_changes`.
+        """
+        return await asyncio.to_thread(self.players.get_player_changes, since, sport)
+
+    async def get_player_at(self, player_id: str, at, sport: str = 'nfl',
+                            convert_results = CONVERT_RESULTS) -> Optional[PlayerModel]:
+        """
+        Returns a player as of a past time, see `PlayerEndpoint.get_player_at`.
+        """
+        return await asyncio.to_thread(
+            self.players.get_player_at, player_id, at, sport, convert_results)
+
+    async def get_player_history(self, player_id: str, start=None, end=None, sport: str = 'nfl',
+                                 convert_results = CONVERT_RESULTS
+                                 ) -> List[Tuple['datetime', Optional[PlayerModel]]]:
+        """
+        Returns every version of a player between two times, see
+        `PlayerEndpoint.get_player_history`.
+        """
+        return await asyncio.to_thread(
+            self.players.get_player_history, player_id, start, end, sport, convert_results)
+
+    async def get_players_at(self, at, sport: str = 'nfl') -> Dict[str, Dict]:
+        """
+        Returns the whole players payload as of a past time, see
+        `PlayerEndpoint.get_players_at`.
+        """
+        return await asyncio.to_thread(self.players.get_players_at, at, sport)
+
+    def refresh_stats(self, sport: str = 'nfl') -> dict:
+        """
+        Returns the background refresh metrics, see `PlayerEndpoint.refresh_stats`.
+        """
+        return self.players.refresh_stats(sport)
+
+    def cache_stats(self, sport: str = 'nfl') -> dict:
+        """
+        Returns the state of the player cache of a sport, see `PlayerEndpoint.cache_stats`.
+        """
+        return self.players.cache_stats(sport)
+
+    async def warm(self, sports: Iterable[str] = ('nfl',)) -> Dict[str, int]:
+        """
+        Load the player index of every sport concurrently, see `PlayerEndpoint.warm`.
+        """
+        sports = list(dict.fromkeys(sports))
+        for sport in sports:
+            self.players.cache_path(sport)  # fail on an invalid sport before starting any download
+        indexes = await asyncio.gather(*(self._player_index(sport) for sport in sports))
+        return {sport: len(index) for sport, index in zip(sports, indexes)}
+
+    def evict(self, sport: str = 'nfl', delete_cache: bool = False):
+        """
+        Drop the player index of a sport, see `PlayerEndpoint.evict`.
+        """
+        self.players.evict(sport, delete_cache)
@@ -2,84 +2,616 @@
 This module provides the `PlayerEndpoint` class for interacting 
 with player-related API endpoints of the Sleeper API.
 """
-import gzip
-import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
-from typing import List, Dict, Optional, Any
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Iterable, List, Dict, Optional, Any, Tuple, Union
 from platformdirs import user_cache_dir
-from ..models.player import PlayerModel
+from ..models.player import PlayerModel, intern_player_data, intern_players
+from ..models.trending import TrendingPlayerModel
 from ..exceptions import SleeperAPIError
-from ..config import CACHE_DURATION, CONVERT_RESULTS
+from ..config import (CACHE_DURATION, CONVERT_RESULTS, LEGACY_CACHE_SUFFIX,
+                      PLAYER_CACHE_LOCK_TIMEOUT, PLAYER_CACHE_MAX_STALENESS,
+                      PLAYER_CHANGES_RETENTION)
+from ..decoders import get_decoder
+from ..player_changes import PlayerChangeLog, PlayerChanges, diff_players
+from ..player_history import PlayerHistory
+from ..player_cache import (CacheLock, PlayerCacheFile, PlayerCacheWriter, read_legacy_cache,
+                            write_player_cache)
+from ..player_index import PlayerIndex, drop_index, shared_index
+from ..player_query import explain_query, order_players, run_query, select_players
+from ..player_refresh import PlayerRefresher, player_refresher
+from ..player_search import name_index_for
+from ..player_stream import iter_players
+
+if TYPE_CHECKING:
+    from ..player_table import PlayerTable
+
+# sport names end up in cache file names
+_SPORT_NAME = re.compile(r'[a-z0-9_]+')
 
 class PlayerEndpoint:
     """
     Player endpoint class to enable easy interactions with the API for player info
     """
-    def __init__(self, client, cache_file=None):
+    def __init__(self, client, cache_file=None, decoder='auto', stale_while_revalidate=False,
+                 max_staleness=PLAYER_CACHE_MAX_STALENESS, cache_durations=None,
+                 memory_limits=None, streaming=False, history=False):
+        """
+        :param client: The SleeperClient.
+        :param cache_file: Path of the binary player cache. A path ending in .json.gz (the
+            previous gzip JSON format) is migrated to the same name ending in .bin. Sports
+            other than nfl are cached next to it, see `cache_path`.
+        :param decoder: JSON decoder, a name or callable, see `get_decoder`.
+        :param stale_while_revalidate: Once the cache expires, keep answering from it while
+            it is refreshed in the background instead of blocking on the download.
+        :param max_staleness: timedelta after expiring past which the cache is never served,
+            calls block on the refresh instead.
+        :param cache_durations: Dict of sport to timedelta, how long the cache of that sport
+            is valid, `CACHE_DURATION` for the sports not in it.
+        :param memory_limits: Dict of sport to bytes, the memory the player index of that sport
+            may hold, see `cache_stats`. An index over its limit is trimmed back to the memory
+            mapped cache file. Sports not in it have no limit.
+        :param streaming: Download the players payload with the client's `iter_chunks`,
+            caching and indexing each player as it arrives instead of holding the whole
+            response, see `player_stream`. Needs a `SleeperClient`.
+        :param history: Keep every refresh of the players payload in an archive next to the
+            cache, as the changes since the previous one, for `get_player_at` and
+            `get_player_history`.
+        """
         self.client = client
-        self.cache_file = cache_file
         self.cache_duration = CACHE_DURATION
+        self.cache_durations = dict(cache_durations or {})
+        self.memory_limits = dict(memory_limits or {})
+        self.streaming = streaming
+        self.history = history
+        self._histories = {}
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_staleness = max_staleness
+        # decoding the multi-megabyte cache dominates cold starts, use the fastest decoder
+        self.decoder = get_decoder(decoder)
 
         if cache_file is None:
             cache_dir = Path(user_cache_dir(appname="sleeper_api", appauthor="smallery"))
             cache_dir.mkdir(parents=True, exist_ok=True)
-            self.cache_file = cache_dir / 'players_cache.json.gz'
+            # the name of the gzip JSON cache, so one left by an earlier version is migrated
+            cache_file = cache_dir / 'players_cache.json.gz'
+        cache_file = Path(cache_file)
+        if cache_file.name.endswith(LEGACY_CACHE_SUFFIX):
+            self.legacy_cache_file = cache_file
+            cache_file = cache_file.with_name(cache_file.name[:-len(LEGACY_CACHE_SUFFIX)] + '.bin')
         else:
-            self.cache_file = Path(cache_file)
+            self.legacy_cache_file = None
+        self.cache_file = cache_file
+
+    def cache_path(self, sport: str = 'nfl') -> Path:
+        """
+        Return the cache file of a sport. nfl, the default sport, is cached in cache_file
+        itself, other sports in the same name with the sport before the suffix, e.g.
+        players_cache.nba.bin, so each sport is refreshed and evicted on its own.
+        """
+        if not _SPORT_NAME.fullmatch(sport):
+            raise SleeperAPIError(f"Invalid sport: {sport!r}")
+        if sport == 'nfl':
+            return self.cache_file
+        cache_file = self.cache_file
+        return cache_file.with_name(f"{cache_file.stem}.{sport}{cache_file.suffix}")
+
+    def _cache_duration(self, sport: str = 'nfl') -> timedelta:
+        "Return how long the cache of a sport is valid"
+        return self.cache_durations.get(sport, self.cache_duration)
+
+    def _migrate_legacy_cache(self):
+        """
+        Convert a gzip JSON cache left by an earlier version to the binary format,
+        keeping its age.
+        """
+        legacy = self.legacy_cache_file
+        if legacy is None or self.cache_file.exists() or not legacy.exists():
+            return
+        try:
+            stat = legacy.stat()
+            write_player_cache(self.cache_file, read_legacy_cache(legacy, self.decoder))
+            os.utime(self.cache_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            legacy.unlink()
+        except (OSError, ValueError, EOFError) as e:
+            print(f"Warning: Could not migrate cache file {legacy}: {e}")
 
-    def _is_cache_valid(self) -> bool:
+    def _is_cache_valid(self, sport: str = 'nfl') -> bool:
         """
         Check if the cached player data is still valid (i.e., less than a day old).
         """
-        if not self.cache_file.exists():
+        if sport == 'nfl':  # the gzip JSON cache was only ever used for the default sport
+            self._migrate_legacy_cache()
+        cache_file = self.cache_path(sport)
+        if not cache_file.exists():
             return False
 
-        cache_mtime = datetime.fromtimestamp(self.cache_file.stat().st_mtime)
-        return datetime.now() - cache_mtime < self.cache_duration
+        cache_mtime = datetime.fromtimestamp(cache_file.stat().st_mtime)
+        return datetime.now() - cache_mtime < self._cache_duration(sport)
+
+    def _open_cache(self, sport: str = 'nfl') -> PlayerCacheFile:
+        """
+        Memory map the cache file, without decoding it.
+        """
+        return PlayerCacheFile(self.cache_path(sport), self.decoder)
 
-    def _load_cache(self) -> List[Dict]:
+    def _load_cache(self, sport: str = 'nfl') -> Dict[str, Dict]:
         """
         Load player data from the cache file.
         """
-        with gzip.open(self.cache_file, 'rt') as f:
-            return json.load(f)
+        cache = self._open_cache(sport)
+        try:
+            return cache.load()
+        finally:
+            cache.close()
 
-    def _save_cache(self, players_json: List[Dict]):
+    def _save_cache(self, players_json: Dict[str, Dict], sport: str = 'nfl'):
         """
         Save player data to the cache file.
         """
         try:
-            with gzip.open(self.cache_file, 'wt') as f:
-                json.dump(players_json, f, indent=4)
+            write_player_cache(self.cache_path(sport), players_json)
         except IOError as e:
             print(f"Warning: Could not save cache file: {e}")
 
+    def _cache_generation(self, sport: str = 'nfl'):
+        """
+        Identify the current contents of the cache file by its modification time and size,
+        None if there is no cache file.
+        """
+        try:
+            stat = self.cache_path(sport).stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _index_is_current(self, index: PlayerIndex, sport: str = 'nfl') -> bool:
+        """
+        Check if the index was built from the cache file as it is now and the cache is still valid.
+        """
+        return index.is_current(self._cache_generation(sport)) and self._is_cache_valid(sport)
+
+    def _shared_index(self, sport: str = 'nfl') -> PlayerIndex:
+        return shared_index(self.cache_path(sport), sport)
+
+    def _player_index(self, sport: str = 'nfl') -> PlayerIndex:
+        """
+        Return the shared player index, rebuilding it when the cache has changed since it was built.
+        """
+        index = self._shared_index(sport)
+        if not self._index_is_current(index, sport):
+            if self._can_serve_stale(sport) and self._load_stale_index(index, sport):
+                self._revalidate(sport)
+                return index
+            with index.lock:
+                # another thread may have rebuilt it while we waited
+                if (not self._index_is_current(index, sport)
+                        and not self._load_index_from_cache(index, sport)):
+                    players_json = self._fetch_players_json(sport)
+                    # unless the refresh already updated the index in place
+                    if not index.is_current(self._cache_generation(sport)):
+                        index.load(players_json, self._cache_generation(sport))
+        self._enforce_memory_limit(index, sport)
+        return index
+
+    def _load_index_from_cache(self, index: PlayerIndex, sport: str = 'nfl',
+                               stale_ok: bool = False) -> bool:
+        """
+        Point the index at the cache file when it is valid, so players are decoded as they
+        are looked up. An unreadable cache file is removed so it gets downloaded again.
+
+        :param stale_ok: Load the cache file even if it has expired.
+        :return: Whether the index was loaded.
+        """
+        if not stale_ok and not self._is_cache_valid(sport):
+            return False
+        generation = self._cache_generation(sport)
+        try:
+            index.load_cache_file(self._open_cache(sport), generation)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Discarding unreadable cache file: {e}")
+            self.cache_path(sport).unlink(missing_ok=True)
+            return False
+        return True
+
+    def _enforce_memory_limit(self, index: PlayerIndex, sport: str = 'nfl'):
+        """
+        Trim an index holding more than the memory limit of its sport back to the memory
+        mapped cache file, dropping its decoded players, models and derived caches.
+        """
+        limit = self.memory_limits.get(sport)
+        if limit is None or index.memory_usage() <= limit:
+            return
+        with index.lock:
+            # only if the cache file holds the indexed payload, else it has to stay decoded
+            if index.is_current(self._cache_generation(sport)):
+                self._load_index_from_cache(index, sport, stale_ok=True)
+
+    def _fetch_players_json(self, sport: str = 'nfl') -> Dict[str, Dict]:
+        """
+        Return the raw players payload, from the cache when valid or else from the API.
+        """
+        if self._is_cache_valid(sport):
+            return self._load_cache(sport)
+        if self._can_serve_stale(sport):
+            try:
+                players_json = self._load_cache(sport)
+            except (OSError, ValueError):
+                pass
+            else:
+                self._revalidate(sport)
+                return players_json
+        return self._download_players(sport)
+
+    def _cache_lock(self, sport: str = 'nfl') -> CacheLock:
+        """
+        Return the lock held across processes while the cache is refreshed.
+        """
+        cache_file = self.cache_path(sport)
+        return CacheLock(cache_file.with_name(cache_file.name + '.lock'))
+
+    def _acquired_cache_lock(self, lock: CacheLock, wait: bool) -> bool:
+        """
+        Take the cache lock, waiting up to `PLAYER_CACHE_LOCK_TIMEOUT` if wait is set.
+        Returns False if it is held elsewhere and we shouldn't download.
+        """
+        if lock.acquire(blocking=wait, timeout=PLAYER_CACHE_LOCK_TIMEOUT):
+            return True
+        if not wait:
+            return False
+        print("Warning: Timed out waiting for the player cache lock, downloading anyway")
+        return True
+
+    def _download_players(self, sport: str = 'nfl', wait: bool = True) -> Optional[Dict[str, Dict]]:
+        """
+        Fetch the players payload from the API and store it in the cache, holding the cache
+        lock so only one process downloads it. If another process refreshed the cache
+        while we waited for the lock, its payload is returned instead.
+
+        :param wait: Wait for a refresh running in another process, else return None.
+        """
+        lock = self._cache_lock(sport)
+        if not self._acquired_cache_lock(lock, wait):
+            return None
+        try:
+            if self._is_cache_valid(sport):
+                return self._load_cache(sport)
+            if self.streaming:
+                return self._stream_players(sport)
+            players_json = self.client.get(f"players/{sport}")
+            self._store_players(players_json, sport)
+            return players_json
+        finally:
+            lock.release()
+
+    def _stream_players(self, sport: str = 'nfl') -> Dict[str, Dict]:
+        """
+        Download the players payload in chunks, writing each player to the new cache file
+        and decoding it for the index as soon as it is complete, then store it like
+        `_store_players`. The response body is never held whole. Players decoded in a
+        batch with the rest of their chunk are encoded again for the cache, the others are
+        written as the JSON they were sent as, see `iter_players`.
+        """
+        players_json = {}
+        with PlayerCacheWriter(self.cache_path(sport)) as writer:
+            try:
+                chunks = self.client.iter_chunks(f"players/{sport}")
+                for player_id, data, raw in iter_players(chunks, self.decoder):
+                    writer.add(player_id, raw)
+                    players_json[player_id] = (intern_player_data(data) if isinstance(data, dict)
+                                               else data)
+            except ValueError as exc:
+                raise SleeperAPIError("Invalid JSON response received") from exc
+
+            def save():
+                try:
+                    writer.commit()
+                except OSError as e:
+                    print(f"Warning: Could not save cache file: {e}")
+
+            self._store_players(players_json, sport, save)
+        return players_json
+
+    def _can_serve_stale(self, sport: str = 'nfl') -> bool:
+        """
+        Check if the cache has expired but may be served while it is refreshed, that is
+        stale_while_revalidate is on and the cache expired less than max_staleness ago.
+        """
+        if not self.stale_while_revalidate:
+            return False
+        try:
+            cache_mtime = datetime.fromtimestamp(self.cache_path(sport).stat().st_mtime)
+        except OSError:
+            return False
+        age = datetime.now() - cache_mtime
+        cache_duration = self._cache_duration(sport)
+        return cache_duration <= age < cache_duration + self.max_staleness
+
+    def _load_stale_index(self, index: PlayerIndex, sport: str = 'nfl') -> bool:
+        """
+        Make sure the index holds the expired cache file, returns False if it can't be read.
+        """
+        if index.is_current(self._cache_generation(sport)):
+            return True
+        with index.lock:
+            return (index.is_current(self._cache_generation(sport))
+                    or self._load_index_from_cache(index, sport, stale_ok=True))
+
+    def _refresher(self, sport: str = 'nfl') -> PlayerRefresher:
+        return player_refresher(self.cache_path(sport), sport)
+
+    def _revalidate(self, sport: str = 'nfl'):
+        """
+        Count a call served from the expired cache and refresh it on a background thread,
+        unless a refresh is already running.
+        """
+        refresher = self._refresher(sport)
+        refresher.served_stale()
+        # if another process is already refreshing, keep serving the expired cache
+        refresher.start_thread(lambda: self._download_players(sport, wait=False) is not None)
+
+    def refresh_stats(self, sport: str = 'nfl') -> dict:
+        """
+        Returns the background refresh metrics of the stale-while-revalidate cache: refreshes
+        and failures, calls served stale data, whether a refresh is running, when the last
+        one succeeded or failed, its error and how long it took.
+        """
+        return self._refresher(sport).stats()
+
+    def cache_stats(self, sport: str = 'nfl') -> dict:
+        """
+        Returns the state of the player cache of a sport: its file, age and TTL in seconds,
+        whether it is valid, whether its index is loaded, how many players it has, and the
+        estimated memory held by the index with its limit (None if unlimited).
+        """
+        cache_file = self.cache_path(sport)
+        try:
+            age = time.time() - cache_file.stat().st_mtime
+        except OSError:
+            age = None
+        index = self._shared_index(sport)
+        return {
+            'cache_file': str(cache_file),
+            'age': age,
+            'ttl': self._cache_duration(sport).total_seconds(),
+            'valid': self._is_cache_valid(sport),
+            'loaded': index.loaded,
+            'players': len(index) if index.loaded else 0,
+            'memory': index.memory_usage(),
+            'memory_limit': self.memory_limits.get(sport),
+        }
+
+    def warm(self, sports: Iterable[str] = ('nfl',)) -> Dict[str, int]:
+        """
+        Load the player index of every sport, downloading the caches that aren't valid
+        concurrently, so a multi-sport service answers its first lookups without waiting.
+
+        :param sports: The sports, such as ('nfl', 'nba', 'lcs').
+        :return: Dict of sport to its number of players.
+        """
+        sports = list(dict.fromkeys(sports))
+        for sport in sports:
+            self.cache_path(sport)  # fail on an invalid sport before starting any download
+        with ThreadPoolExecutor(max_workers=max(len(sports), 1)) as pool:
+            indexes = list(pool.map(self._player_index, sports))
+        return {sport: len(index) for sport, index in zip(sports, indexes)}
+
+    def evict(self, sport: str = 'nfl', delete_cache: bool = False):
+        """
+        Drop the player index of a sport, freeing its memory, the other sports are left
+        alone. The index is loaded again from the cache on its next lookup.
+
+        :param delete_cache: Also delete the cache file, so it is downloaded again.
+        """
+        cache_file = self.cache_path(sport)
+        drop_index(cache_file, sport)
+        if delete_cache:
+            cache_file.unlink(missing_ok=True)
+
+    def _change_log(self, sport: str = 'nfl') -> PlayerChangeLog:
+        """
+        Return the log of the changes found on each refresh, kept next to the cache file.
+        """
+        path = self.cache_file.with_name(f"{self.cache_file.stem}.{sport}.changes.jsonl")
+        return PlayerChangeLog(path, PLAYER_CHANGES_RETENTION)
+
+    def _previous_players(self, index: PlayerIndex, generation,
+                          sport: str = 'nfl') -> Optional[Dict[str, Dict]]:
+        """
+        Return the payload in the cache file, from the index when it was built from it.
+        """
+        if generation is None:
+            return None
+        if index.is_current(generation):
+            return index.players_json()
+        try:
+            return self._load_cache(sport)
+        except (OSError, ValueError):
+            return None
+
+    def _store_players(self, players_json: Dict[str, Dict], sport: str = 'nfl', save=None):
+        """
+        Save a payload fetched from the API to the cache. When it replaces a previous one,
+        the changes between them are added to the change log and the shared index is
+        updated for the changed players instead of being rebuilt. With history, the
+        payload is also added to the player history.
+
+        :param save: Callable writing the cache file, `_save_cache` by default.
+        """
+        index = self._shared_index(sport)
+        previous_generation = self._cache_generation(sport)
+        previous = self._previous_players(index, previous_generation, sport)
+        if save is None:
+            self._save_cache(players_json, sport)
+        else:
+            save()
+        generation = self._cache_generation(sport)
+        if generation is None or generation == previous_generation:
+            return
+
+        changes = None
+        if previous is not None:
+            changes = diff_players(previous, players_json, since=previous_generation[0] / 1e9)
+        if self.history:
+            try:
+                self._player_history(sport).record(players_json, generation[0] / 1e9, changes)
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not save player history: {e}")
+        if changes is None:
+            return
+        try:
+            self._change_log(sport).append(changes)
+        except OSError as e:
+            print(f"Warning: Could not save player changes: {e}")
+        with index.lock:
+            if index.is_current(previous_generation):
+                index.apply_changes(players_json, changes, generation)
+
+    def get_player_changes(self, since=None, sport: str = 'nfl') -> PlayerChanges:
+        """
+        Returns what changed in the player data across the cache refreshes after a time:
+        the IDs of the players added and removed, and for each changed player the fields
+        that changed with their old and new values.
+
+        :param since: datetime or POSIX timestamp, None for every refresh in the change log
+            (kept for `PLAYER_CHANGES_RETENTION`).
+        :param sport: The sport, such as 'nfl'.
+        :return: The merged `PlayerChanges`, empty if nothing changed.
+        """
+        return self._change_log(sport).since(since)
+
+    def _player_history(self, sport: str = 'nfl') -> PlayerHistory:
+        """
+        Return the archive of every version of the payload, kept next to the cache file.
+        """
+        history = self._histories.get(sport)
+        if history is None:
+            self.cache_path(sport)  # validates the sport name
+            path = self.cache_file.with_name(f"{self.cache_file.stem}.{sport}.history")
+            history = self._histories.setdefault(sport, PlayerHistory(path, self.decoder))
+        return history
+
+    def _read_history(self, read, sport: str = 'nfl'):
+        """
+        Call read with the player history, converting a damaged archive to SleeperAPIError.
+        """
+        try:
+            return read(self._player_history(sport))
+        except ValueError as e:
+            raise SleeperAPIError(str(e)) from e
+
+    def get_player_at(self, player_id: str, at, sport: str = 'nfl',
+                      convert_results = CONVERT_RESULTS) -> Optional[PlayerModel]:
+        """
+        Returns a player as of a past time, from the player history (see `history`).
+
+        :param player_id: The player ID.
+        :param at: datetime, POSIX timestamp, or date for the player at the end of that day.
+        :param sport: The sport, such as 'nfl'.
+        :return: The player as last refreshed at or before that time, None if the player
+            wasn't in the payload then or the history doesn't go back that far.
+        """
+        data = self._read_history(lambda history: history.get(player_id, at), sport)
+        if data is None or not convert_results:
+            return data
+        return PlayerModel.from_dict(data)
+
+    def get_player_history(self, player_id: str, start=None, end=None, sport: str = 'nfl',
+                           convert_results = CONVERT_RESULTS
+                           ) -> List[Tuple[datetime, Optional[PlayerModel]]]:
+        """
+        Returns every version of a player between two times, from the player history.
+
+        :param player_id: The player ID.
+        :param start: datetime, date or POSIX timestamp, None from the oldest version. The
+            first version returned is the one in effect at start.
+        :param end: datetime, date or POSIX timestamp, None up to the latest version.
+        :param sport: The sport, such as 'nfl'.
+        :return: List of (time of the refresh the player changed in, player or None while
+            removed), oldest first.
+        """
+        versions = self._read_history(
+            lambda history: history.player_history(player_id, start, end), sport)
+        return [(datetime.fromtimestamp(when),
+                 PlayerModel.from_dict(data) if data is not None and convert_results else data)
+                for when, data in versions]
+
+    def get_players_at(self, at, sport: str = 'nfl') -> Dict[str, Dict]:
+        """
+        Returns the whole players payload as of a past time, from the player history.
+
+        :param at: datetime, POSIX timestamp, or date for the payload at the end of that day.
+        :param sport: The sport, such as 'nfl'.
+        :return: Dict of player ID to player data, empty if the history doesn't go back
+            that far.
+        """
+        return self._read_history(lambda history: history.snapshot(at), sport)
+
+    @staticmethod
+    def _to_models(players_json: Dict[str, Dict]) -> List[PlayerModel]:
+        """
+        Convert the raw players payload into a list of PlayerModel instances.
+        """
+        intern_players(players_json)
+        return [PlayerModel.from_dict(player_data) for player_data in players_json.values()]
+
     def get_all_players(
             self, sport = 'nfl', convert_results = CONVERT_RESULTS
             ) -> List[PlayerModel]:
         """
         Retrieve all players, either from the cache or by making an API call.
         """
-        if self._is_cache_valid():
-            players_json = self._load_cache()
-        else:
-            endpoint = f"players/{sport}"
-            players_json = self.client.get(endpoint)
-            self._save_cache(players_json)
+        players_json = self._fetch_players_json(sport)
 
         if not convert_results:
             return players_json
 
-        players = [
-            PlayerModel.from_dict(player_data) for player_id,player_data in list(players_json.items())
-            ]
-        return players
+        return self._to_models(players_json)
+
+    @staticmethod
+    def _trending_endpoint(trend_type: str, sport: str, lookback_hours, limit) -> str:
+        """
+        Validate the trend type and build the trending endpoint.
+        """
+        if trend_type not in ('add', 'drop'):
+            raise SleeperAPIError("Trend type must either be add or drop.")
+
+        return f"players/{sport}/trending/{trend_type}?lookback_hours={lookback_hours}&limit={limit}"
+
+    @staticmethod
+    def _trending_windows(trend_types, lookback_hours) -> List[Tuple[str, int]]:
+        """
+        List the (trend type, lookback hours) pairs to fetch, see `get_trending_windows`.
+        """
+        if isinstance(trend_types, str):
+            trend_types = (trend_types,)
+        if isinstance(lookback_hours, int):
+            lookback_hours = (lookback_hours,)
+        return [(trend_type, hours) for trend_type in trend_types for hours in lookback_hours]
+
+    @staticmethod
+    def _join_trending(trending_data, index: PlayerIndex, trend_type: str,
+                       lookback_hours: Optional[int] = None) -> List[TrendingPlayerModel]:
+        """
+        Look up the trending players in the player index, keeping their add or drop count
+        in a TrendingPlayerModel so the shared PlayerModels aren't modified. Players missing
+        from the index are skipped.
+        """
+        result = []
+        for entry in trending_data:
+            player = index.get(entry['player_id'])
+            if player is not None:
+                result.append(TrendingPlayerModel(player, trend_type, entry['count'], lookback_hours))
+        return result
 
     def get_trending_players(
             self, trend_type: str, sport: str = 'nfl', lookback_hours: Optional[int] = 24,
             limit: Optional[int] = 25, convert_results=CONVERT_RESULTS
-            ) -> List[Dict[str, int]]:
+            ) -> List[TrendingPlayerModel]:
         """
         Retrieve trending players based on adds or drops.
 
@@ -87,130 +619,199 @@ class PlayerEndpoint:
         :param trend_type: Either 'add' or 'drop'.
         :param lookback_hours: Number of hours to look back (default is 24).
         :param limit: Number of results you want (default is 25).
-        :return: A list of PlayerModel instances if convert_results is True, or the raw data if False.
+        :return: A list of TrendingPlayerModel instances if convert_results is True, or the raw data if False.
         """
-        if trend_type not in ('add', 'drop'):
-            raise SleeperAPIError("Trend type must either be add or drop.")
-
-        endpoint = f"players/{sport}/trending/{trend_type}?lookback_hours={lookback_hours}&limit={limit}"
+        endpoint = self._trending_endpoint(trend_type, sport, lookback_hours, limit)
         trending_data = self.client.get(endpoint)
 
         if not convert_results:
             return trending_data
 
-        # If convert_results is True, map the trending data to PlayerModel instances
-        all_players = self.get_all_players(convert_results)
-        player_dict = {player.player_id: player for player in all_players}
+        return self._join_trending(trending_data, self._player_index(sport), trend_type,
+                                   lookback_hours)
 
-        result = []
-        for entry in trending_data:
-            player_id = entry['player_id']
-            if player_id in player_dict:
-                player = player_dict[player_id]
-                if trend_type == 'add':
-                    player.add_count = entry['count']
-                elif trend_type == 'drop':
-                    player.drop_count = entry['count']
-                result.append(player)
+    def get_trending_windows(
+            self, trend_types: Union[str, Iterable[str]] = ('add', 'drop'),
+            lookback_hours: Union[int, Iterable[int]] = (24,), sport: str = 'nfl',
+            limit: Optional[int] = 25, convert_results=CONVERT_RESULTS
+            ) -> Dict[Tuple[str, int], List[TrendingPlayerModel]]:
+        """
+        Retrieve the trending players of several trend types and lookback windows at once,
+        fetched concurrently with `client.get_many`.
 
-        return result
+            >>> trends = players.get_trending_windows(('add', 'drop'), lookback_hours=(6, 24, 168))
+            >>> trends['add', 24][0].add_count
+
+        :param trend_types: 'add', 'drop' or both.
+        :param lookback_hours: One or more numbers of hours to look back.
+        :param sport: The sport, such as 'nfl'.
+        :param limit: Number of results you want per window (default is 25).
+        :return: A dict keyed by (trend type, lookback hours) of lists of TrendingPlayerModel
+            instances if convert_results is True, or of the raw data if False.
+        """
+        windows = self._trending_windows(trend_types, lookback_hours)
+        endpoints = [self._trending_endpoint(trend_type, sport, hours, limit)
+                     for trend_type, hours in windows]
+        responses = self.client.get_many(endpoints)
+
+        if not convert_results:
+            return dict(zip(windows, responses))
+
+        index = self._player_index(sport)
+        return {window: self._join_trending(trending_data, index, *window)
+                for window, trending_data in zip(windows, responses)}
+
+    @staticmethod
+    def _find_player(index: PlayerIndex, player_id) -> PlayerModel:
+        """
+        Look up the PlayerModel for the player ID in the index.
+        """
+        player = index.get(player_id)
+        if player is None:
+            raise SleeperAPIError(f"Player_ID: {player_id} Not Found")
+        return player
+
+    @staticmethod
+    def _find_players(index: PlayerIndex, player_ids, convert_results):
+        """
+        Look up the players for the player IDs in the index, skipping unknown IDs.
+        """
+        if convert_results:
+            return index.get_many(player_ids)
+        return [data for data in map(index.get_json, player_ids) if data is not None]
+
+    def get_player(self, player_id, sport: str = 'nfl') -> PlayerModel:
+        """
+        Returns a specific playerModel for the player ID.
+
+        Lookups are answered from an in-memory index shared by every endpoint using the same
+        cache file, so the returned model is shared too and should be treated as read-only.
+        """
+        return self._find_player(self._player_index(sport), player_id)
+
+    def get_players(self, player_ids: List[str], sport: str = 'nfl',
+                    convert_results=CONVERT_RESULTS) -> List[PlayerModel]:
+        """
+        Returns the players for a list of player IDs, such as a roster, in the same order.
+        IDs that match no player are skipped.
 
-    def get_player(self,player_id):
+        :param player_ids: The player IDs to look up.
+        :param sport: The sport, such as 'nfl'.
+        :return: A list of PlayerModel instances if convert_results is True, or the raw data if False.
+        """
+        return self._find_players(self._player_index(sport), player_ids, convert_results)
+
+    @staticmethod
+    def _search_index(index: PlayerIndex, search_keys: Dict[str, Any], convert_results,
+                      fields=None, order_by=None, limit: Optional[int] = None,
+                      iterator: bool = False):
         """
-        Returns a specific playerModel for the player ID
+        Return the players in the index matching the search keys, see `search_players`.
         """
-        for player in self.get_all_players():
-            if player.player_id == player_id:
-                return player
+        if limit is not None and limit < 0:
+            raise ValueError(f"limit can't be negative: {limit}")
+        matches = run_query(index, search_keys)
+        if order_by is not None:
+            matches = order_players(index, matches, order_by, limit)
+        elif limit is not None:
+            matches = matches[:limit]
 
-        raise SleeperAPIError(f"Player_ID: {player_id} Not Found")
+        results = select_players(index, matches, fields, convert_results)
+        return results if iterator else list(results)
 
-    def search_players(self, search_keys: Dict[str, Any], convert_results=CONVERT_RESULTS):
+    def search_players(self, search_keys: Dict[str, Any], convert_results=CONVERT_RESULTS,
+                       sport: str = 'nfl', fields: Optional[List[str]] = None,
+                       order_by: Optional[Union[str, List[str]]] = None,
+                       limit: Optional[int] = None, iterator: bool = False):
         """
         Search for players based on complex criteria using a combination of AND/OR logic and comparison operators.
         
-        This function retrieves all player data and filters it according to the search keys provided.
+        This function filters the player data according to the search keys provided.
         The search keys can include various logical conditions (AND/OR) and comparison operators 
         (e.g., '==', '!=', '>', '<', '>=', '<=', 'in', 'not in') for different attributes of the player data.
+        The search keys are compiled into a query plan that checks the most selective conditions
+        first and answers equality and 'in' conditions on indexed fields (see `INDEXED_FIELDS`)
+        from secondary indexes, so only the players they match are checked against the rest.
+        Results of recent queries are cached until the player data is refreshed.
+
+        Results are only built for the players returned: with a limit and order_by the
+        first players are selected with a heap rather than a full sort, and with fields
+        only those fields are copied, no PlayerModel is built.
+
+        :param search_keys: The conditions, e.g. {"position": "WR", "active": True}.
+        :param convert_results: PlayerModels if True, else a copy of each player's raw data
+            with the key it was listed under.
+        :param sport: The sport, such as 'nfl'.
+        :param fields: Return only these fields of each player, as dicts (None where a
+            player doesn't have the field) whatever convert_results is.
+        :param order_by: A field or a list of fields to sort by, each prefixed with '-'
+            for descending order, e.g. 'search_rank' or ['team', '-age']. Players missing
+            a field come last. The players are otherwise in payload order.
+        :param limit: Return at most this many players.
+        :param iterator: Return an iterator building each result as it is consumed,
+            rather than a list.
+        :return: A list (or iterator) of PlayerModels, raw data or dicts of fields.
+        :raises ValueError: For an unsupported operator, order_by or limit.
         """
-        def safe_search_type(record, key, value):
-            record_value = record.get(key)
-
-            if record_value is None:
-                return False  # Skip records where the value is None
-
-            if isinstance(value, dict):
-                for operator, val in value.items():
-                    if operator == "==":
-                        if record_value != val:
-                            return False
-                    elif operator == "!=":
-                        if record_value == val:
-                            return False
-                    elif operator == ">":
-                        if not (record_value > val):
-                            return False
-                    elif operator == "<":
-                        if not (record_value < val):
-                            return False
-                    elif operator == ">=":
-                        if not (record_value >= val):
-                            return False
-                    elif operator == "<=":
-                        if not (record_value <= val):
-                            return False
-                    elif operator == "in":
-                        if record_value not in val:
-                            return False
-                    elif operator == "not in":
-                        if record_value in val:
-                            return False
-                    else:
-                        raise ValueError(f"Unsupported operator: {operator}")
-                return True
-            else:
-                return record_value == value
-
-        # Recursive function to handle AND/OR logic
-        def evaluate_conditions(record, conditions):
-            if isinstance(conditions, dict):
-                if "AND" in conditions:
-                    return all(evaluate_conditions(record, cond) for cond in conditions["AND"])
-                elif "OR" in conditions:
-                    return any(evaluate_conditions(record, cond) for cond in conditions["OR"])
-                else:
-                    return all(safe_search_type(record, k, v) for k, v in conditions.items())
-            else:
-                raise ValueError(f"Unsupported conditions format: {conditions}")
+        return self._search_index(self._player_index(sport), search_keys, convert_results,
+                                  fields, order_by, limit, iterator)
 
-        # Load all player data
-        all_players_json = self.get_all_players(convert_results=False)
-        player_data_list = []
+    @staticmethod
+    def _search_names(index: PlayerIndex, query: str, limit, position, team, active,
+                      convert_results):
+        """
+        Return the players in the index best matching a name query, see `search_by_name`.
+        """
+        matches = [player_id for player_id, _ in name_index_for(index).search(
+            query, limit, position=position, team=team, active=active)]
+        if not convert_results:
+            return [dict(index.get_json(player_id), key=player_id) for player_id in matches]
+        return index.get_many(matches)
 
-        # removes the key from the all_players json so it's just a list of player json data
-        # this makes it easier to search and transform into a PlayerModel
-        for key, value in all_players_json.items():
-            value['key'] = key
-            player_data_list.append(value)
+    def search_by_name(self, query: str, limit: int = 10, position=None, team=None,
+                       active: Optional[bool] = None, sport: str = 'nfl',
+                       convert_results=CONVERT_RESULTS):
+        """
+        Find players by a full, partial or misspelled name, such as "mahomes", "maho" or
+        "j jefferson", best matches first. Matches are ranked by the share of the query's
+        letter trigrams the name has, then by Sleeper's search_rank. The name index is
+        built once per cache generation.
 
-        # Filter players based on the complex search keys
-        filtered_player_json = [
-            record for record in player_data_list
-            if evaluate_conditions(record, search_keys)
-        ]
+        :param query: The name typed.
+        :param limit: The number of players to return at most.
+        :param position: Only players at this position, or one of a list of positions.
+        :param team: Only players of this team, or one of a list of teams.
+        :param active: Only active (True) or inactive (False) players.
+        :param sport: The sport, such as 'nfl'.
+        :return: A list of PlayerModel instances if convert_results is True, or the raw data if False.
+        """
+        return self._search_names(self._player_index(sport), query, limit, position, team,
+                                  active, convert_results)
 
-        # Return the results in the desired format
-        if not convert_results:
-            return filtered_player_json
+    def explain(self, search_keys: Dict[str, Any], sport: str = 'nfl') -> str:
+        """
+        Run a search and describe how it was answered: the access path (index lookup or full
+        scan), the order the conditions are checked in with their estimated selectivity,
+        the rows scanned and whether the result was already cached.
+        """
+        return explain_query(self._player_index(sport), search_keys)
 
-        return [PlayerModel.from_dict(data) for data in filtered_player_json]
+    def get_player_table(self, sport: str = 'nfl') -> 'PlayerTable':
+        """
+        Returns a columnar `PlayerTable` of every player for vectorized filtering, sorting
+        and top-k selection, built once per cache generation. Requires numpy.
+        """
+        # numpy is an optional dependency, only imported once a table is asked for
+        from ..player_table import table_for  # pylint: disable=import-outside-toplevel
+        return table_for(self._player_index(sport))
 
-    def get_players_by_team(self,team_abbr) -> List[PlayerModel]:
-        '''use the query to return a list of player models where the team_abbr matches the player team_abbr'''
-        team_players = []
-        for player in self.get_all_players():
-            if player.team_abbr == team_abbr:
-                team_players.append(player)
+    @staticmethod
+    def _find_by_team(index: PlayerIndex, team_abbr) -> List[PlayerModel]:
+        """
+        Return the players in the index whose team_abbr matches.
+        """
+        return index.get_many(index.lookup('team_abbr', team_abbr))
 
-        #raise SleeperAPIError("Player Not Found")
-        return team_players
+    def get_players_by_team(self, team_abbr, sport: str = 'nfl') -> List[PlayerModel]:
+        '''use the query to return a list of player models where the team_abbr matches the player team_abbr'''
+        return self._find_by_team(self._player_index(sport), team_abbr)
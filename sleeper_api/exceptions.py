@@ -5,3 +5,7 @@ class SleeperAPIError(Exception):
 class UserNotFoundError(SleeperAPIError):
     """Raised when a user is not found."""
     pass
+
+class CircuitOpenError(SleeperAPIError):
+    """Raised when the circuit breaker is open and the request was not sent."""
+    pass
@@ -0,0 +1,193 @@
+"""
+This module provides per-request instrumentation for the clients.
+
+Every request made through a client with hooks produces a `RequestEvent` that is passed
+to each hook once the request finishes. `MetricsCollector` is a ready made hook that
+aggregates those events per endpoint template and exports them in the Prometheus text
+exposition format:
+
+    >>> metrics = MetricsCollector()
+    >>> client = SleeperClient(hooks=[metrics])
+    >>> print(metrics.to_prometheus())
+"""
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+from .utils import endpoint_template
+
+# latency histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestEvent:
+    """
+    Describes one request made through a client.
+
+    :ivar method: HTTP method.
+    :ivar endpoint: The endpoint requested, e.g. 'league/123/rosters'.
+    :ivar template: The endpoint's route template, e.g. 'league/{league_id}/rosters'.
+    :ivar status: HTTP status of the final response, None if no response was received.
+    :ivar latency: Seconds from the call until the result or error was returned.
+    :ivar bytes_received: Size of the response body.
+    :ivar retries: Number of retries made by the `RetryPolicy`.
+    :ivar cache: 'hit', 'miss', 'coalesced' (shared another caller's request) or 'bypass'.
+    :ivar error: The exception raised to the caller, if any.
+    """
+    __slots__ = ('method', 'endpoint', 'status', 'latency',
+                 'bytes_received', 'retries', 'cache', 'error')
+
+    def __init__(self, method, endpoint):
+        self.method = method
+        self.endpoint = endpoint
+        self.status = None
+        self.latency = 0.0
+        self.bytes_received = 0
+        self.retries = 0
+        self.cache = 'bypass'
+        self.error = None
+
+    @property
+    def template(self) -> str:
+        "The endpoint's route template, only worked out when a hook asks for it"
+        return endpoint_template(self.endpoint)
+
+    def __repr__(self):
+        return (f"<RequestEvent({self.method} {self.template}, status={self.status}, "
+                f"latency={self.latency:.4f}, cache={self.cache}, retries={self.retries})>")
+
+
+def emit(hooks, event: RequestEvent):
+    """
+    Pass the event to every hook, a failing hook never fails the request.
+    """
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception as e:  # pylint: disable=broad-except
+            print(f"Warning: request hook {hook!r} failed: {e}")
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + '}'
+
+
+class _EndpointStats:
+    "Aggregated metrics of one endpoint template"
+    __slots__ = ('requests', 'errors', 'bucket_counts', 'latency_sum', 'bytes', 'retries')
+
+    def __init__(self, bucket_count):
+        self.requests = defaultdict(int)  # (status, cache) -> count
+        self.errors = defaultdict(int)  # exception class name -> count
+        self.bucket_counts = [0] * (bucket_count + 1)  # the last one is +Inf
+        self.latency_sum = 0.0
+        self.bytes = 0
+        self.retries = 0
+
+
+class MetricsCollector:
+    """
+    Request hook that aggregates latency histograms and counters per endpoint template.
+    It is thread safe, so one collector can be shared between clients.
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS, namespace='sleeper'):
+        """
+        :param buckets: Upper bounds of the latency histogram buckets in seconds.
+        :param namespace: Prefix of the exported metric names.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.namespace = namespace
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent):
+        template = event.template
+        with self._lock:
+            stats = self._endpoints.get(template)
+            if stats is None:
+                stats = self._endpoints[template] = _EndpointStats(len(self.buckets))
+            stats.requests[(event.status, event.cache)] += 1
+            if event.error is not None:
+                stats.errors[type(event.error).__name__] += 1
+            stats.bucket_counts[bisect_left(self.buckets, event.latency)] += 1
+            stats.latency_sum += event.latency
+            stats.bytes += event.bytes_received
+            stats.retries += event.retries
+
+    def snapshot(self) -> dict:
+        """
+        Return the aggregated metrics as a dict keyed by endpoint template.
+        """
+        snapshot = {}
+        with self._lock:
+            for template, stats in self._endpoints.items():
+                by_status = defaultdict(int)
+                by_cache = defaultdict(int)
+                for (status, cache), count in stats.requests.items():
+                    by_status[str(status)] += count
+                    by_cache[cache] += count
+                snapshot[template] = {
+                    'requests': sum(stats.requests.values()),
+                    'by_status': dict(by_status),
+                    'cache': dict(by_cache),
+                    'errors': dict(stats.errors),
+                    'latency_sum': stats.latency_sum,
+                    'bytes_received': stats.bytes,
+                    'retries': stats.retries,
+                }
+        return snapshot
+
+    def reset(self):
+        "Forget everything collected so far"
+        with self._lock:
+            self._endpoints.clear()
+
+    def to_prometheus(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+        """
+        name = self.namespace
+        lines = [
+            f"# HELP {name}_requests_total Requests made to the Sleeper API.",
+            f"# TYPE {name}_requests_total counter",
+        ]
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            for template, stats in endpoints:
+                for (status, cache), count in sorted(stats.requests.items(), key=str):
+                    labels = _labels(endpoint=template, status=status or '', cache=cache)
+                    lines.append(f"{name}_requests_total{labels} {count}")
+
+            lines += [f"# HELP {name}_request_errors_total Requests that raised an error.",
+                      f"# TYPE {name}_request_errors_total counter"]
+            for template, stats in endpoints:
+                for error, count in sorted(stats.errors.items()):
+                    lines.append(f"{name}_request_errors_total"
+                                 f"{_labels(endpoint=template, error=error)} {count}")
+
+            lines += [f"# HELP {name}_request_duration_seconds Request latency.",
+                      f"# TYPE {name}_request_duration_seconds histogram"]
+            for template, stats in endpoints:
+                cumulative = 0
+                for bound, count in zip(self.buckets + ('+Inf',), stats.bucket_counts):
+                    cumulative += count
+                    lines.append(f"{name}_request_duration_seconds_bucket"
+                                 f"{_labels(endpoint=template, le=bound)} {cumulative}")
+                endpoint_label = _labels(endpoint=template)
+                lines.append(f"{name}_request_duration_seconds_sum{endpoint_label} "
+                             f"{stats.latency_sum}")
+                lines.append(f"{name}_request_duration_seconds_count{endpoint_label} {cumulative}")
+
+            for metric, attr, help_text in (
+                    ('response_bytes_total', 'bytes', 'Response body bytes received.'),
+                    ('retries_total', 'retries', 'Retries made after transient failures.')):
+                lines += [f"# HELP {name}_{metric} {help_text}",
+                          f"# TYPE {name}_{metric} counter"]
+                for template, stats in endpoints:
+                    lines.append(f"{name}_{metric}{_labels(endpoint=template)} "
+                                 f"{getattr(stats, attr)}")
+        return '\n'.join(lines) + '\n'
@@ -6,6 +6,7 @@ from .player import PlayerModel
 from .roster import RosterModel
 from .traded_picks import TradedPickModel
 from .transactions import TransactionsModel
+from .trending import TrendingPlayerModel
 from .user import UserModel
 
 __all__ = [
@@ -17,5 +18,6 @@ __all__ = [
     "RosterModel",
     "TradedPickModel",
     "TransactionsModel",
+    "TrendingPlayerModel",
     "UserModel"
 ]
@@ -1,6 +1,87 @@
+import sys
 from typing import Optional, Dict, Any
 
+# fields with few distinct values repeated across thousands of players, their strings are
+# interned so every player on a team or at a position shares one copy
+INTERNED_FIELDS = ('team', 'team_abbr', 'position', 'fantasy_positions', 'status',
+                   'injury_status', 'injury_body_part', 'practice_participation', 'sport',
+                   'depth_chart_position', 'college', 'birth_country', 'birth_state')
+
+
+def intern_player_data(attributes: Dict) -> Dict:
+    """
+    Replace the strings of the repeated fields of a player's data by interned copies,
+    in place, and return the data.
+    """
+    for field in INTERNED_FIELDS:
+        value = attributes.get(field)
+        if type(value) is str:  # pylint: disable=unidiomatic-typecheck
+            attributes[field] = sys.intern(value)
+        elif type(value) is list:  # pylint: disable=unidiomatic-typecheck
+            attributes[field] = [sys.intern(item) if type(item) is str else item  # pylint: disable=unidiomatic-typecheck
+                                 for item in value]
+    return attributes
+
+
+def intern_players(players_json: Dict[str, Dict]) -> Dict[str, Dict]:
+    """
+    Intern the repeated strings of every player in a `players/{sport}` payload, in place.
+    """
+    for attributes in players_json.values():
+        if isinstance(attributes, dict):
+            intern_player_data(attributes)
+    return players_json
+
+
+class _Field:
+    """
+    A PlayerModel attribute read from the player's data instead of being copied onto the model.
+    Assigning to it copies the data first, so data shared with other models is left untouched.
+    """
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __get__(self, model, owner=None):
+        if model is None:
+            return self
+        return model._player_data.get(self.key)
+
+    def __set__(self, model, value):
+        model._own_data()[self.key] = value
+
+
+class _TeamField(_Field):
+    # note sometimes the team_abbr is None but team is filled in with the correct abbreviation
+    # this is my best way of fixing this now but should probably add some conditional logic to validate this
+    def __get__(self, model, owner=None):
+        if model is None:
+            return self
+        data = model._player_data
+        return data.get('team_abbr') or data.get('team')
+
+
 class PlayerModel:
+    """
+    A player, as a light view over the player's raw data.
+
+    The model only holds a reference to the data, which is shared with the player index,
+    and reads the attributes from it when they are accessed.
+    """
+    __slots__ = ('_player_data', '_owned')
+
+    player_id = _Field('player_id')
+    first_name = _Field('first_name')
+    last_name = _Field('last_name')
+    position = _Field('position')
+    team_abbr = _TeamField('team_abbr')
+    status = _Field('status')
+    sport = _Field('sport')
+    age = _Field('age')
+    college = _Field('college')
+    years_exp = _Field('years_exp')
+
     def __init__(
         self,
         player_id: str,
@@ -16,20 +97,18 @@ class PlayerModel:
         years_exp: Optional[int] = None,
         _player_data: Optional[Dict] = None
     ):
-        self.player_id = player_id
-        self.first_name = first_name
-        self.last_name = last_name
-        self.name = f'{first_name} {last_name}' if last_name else first_name
-        self.position = position
-        # note sometimes the team_abbr is None but team is filled in with the correct abbreviation
-        # this is my best way of fixing this now but should probably add some conditional logic to validate this
-        self.team_abbr = team_abbr or team
-        self.status = status
-        self.sport = sport
-        self.age = age
-        self.college = college
-        self.years_exp = years_exp
-        self._player_data = _player_data
+        given = {
+            'player_id': player_id, 'first_name': first_name, 'last_name': last_name,
+            'position': position, 'team_abbr': team_abbr, 'team': team, 'status': status,
+            'sport': sport, 'age': age, 'college': college, 'years_exp': years_exp,
+        }
+        data = _player_data if _player_data is not None else {}
+        overrides = {key: value for key, value in given.items()
+                     if value is not None and data.get(key) != value}
+        if overrides:
+            data = {**data, **overrides}
+        self._player_data = data
+        self._owned = data is not _player_data
 
     @classmethod
     def from_dict(cls, attributes: dict):
@@ -40,37 +119,45 @@ class PlayerModel:
         :param data: A dictionary with player_id as key and attributes as value.
         :return: An instance of PlayerModel.
         """
+        # the model is a view over the attributes, nothing is copied
+        model = cls.__new__(cls)
+        model._player_data = attributes
+        model._owned = False
+        return model
+
+    def _own_data(self) -> Dict:
+        "Return the model's data, copied first if it is shared"
+        if not self._owned:
+            self._player_data = dict(self._player_data)
+            self._owned = True
+        return self._player_data
 
-        return cls(
-            player_id=attributes.get('player_id'),
-            first_name=attributes.get('first_name'),
-            last_name=attributes.get('last_name'),
-            team_abbr=attributes.get('team_abbr'),
-            team=attributes.get('team'),
-            position=attributes.get('position'),
-            sport=attributes.get('sport'),
-            status=attributes.get('status'),
-            age=attributes.get('age'),
-            college=attributes.get('college'),
-            years_exp=attributes.get('years_exp'),
-            _player_data = attributes  # Pass all other attributes to store in extra_attributes
-        )
+    @property
+    def name(self) -> Optional[str]:
+        "First and last name, unless a name was assigned"
+        data = self._player_data
+        if 'name' in data:
+            return data['name']
+        first_name, last_name = data.get('first_name'), data.get('last_name')
+        return f'{first_name} {last_name}' if last_name else first_name
+
+    @name.setter
+    def name(self, value: Optional[str]):
+        self._own_data()['name'] = value
 
     def __repr__(self):
         return f"<PlayerModel(name={self.name}, player_id={self.player_id}, age={self.age}, team={self.team_abbr}, position={self.position})>"
-    
+
     def get_attribute(self, attr_name: str) -> Optional[Any]:
         """
         Get an attribute value from the player_dict on demand.
-        
+
         :param attr_name: The name of the attribute to retrieve.
         :return: The value of the attribute or None if it doesn't exist.
         """
 
         return self._player_data.get(attr_name)
-    
+
     def get_injury_status(self):
         # returns info about injury
         pass
-
-    
@@ -0,0 +1,41 @@
+from typing import Optional
+
+from .player import PlayerModel
+
+
+class TrendingPlayerModel:
+    """
+    A trending player: the shared PlayerModel of the player index and how many leagues added
+    or dropped the player over the lookback window.
+
+    The count is kept here rather than set on the PlayerModel, which is shared by every
+    lookup and every window. Player attributes such as `name` or `team_abbr` are read
+    through to the PlayerModel.
+    """
+    __slots__ = ('player', 'trend_type', 'count', 'lookback_hours')
+
+    def __init__(self, player: PlayerModel, trend_type: str, count: int,
+                 lookback_hours: Optional[int] = None):
+        self.player = player
+        self.trend_type = trend_type
+        self.count = count
+        self.lookback_hours = lookback_hours
+
+    @property
+    def add_count(self) -> Optional[int]:
+        "Number of adds, if the trend is of adds"
+        return self.count if self.trend_type == 'add' else None
+
+    @property
+    def drop_count(self) -> Optional[int]:
+        "Number of drops, if the trend is of drops"
+        return self.count if self.trend_type == 'drop' else None
+
+    def __getattr__(self, name):
+        if name == 'player':  # not set yet, don't recurse
+            raise AttributeError(name)
+        return getattr(self.player, name)
+
+    def __repr__(self):
+        return (f"<TrendingPlayerModel(name={self.player.name}, player_id={self.player.player_id}, "
+                f"{self.trend_type}={self.count}, lookback_hours={self.lookback_hours})>")
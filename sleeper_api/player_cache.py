@@ -0,0 +1,325 @@
+"""
+This module reads and writes the binary player cache used by `PlayerEndpoint`.
+
+The file holds the `players/{sport}` payload as one compact JSON object plus an index
+of where every player's data starts and ends inside it:
+
+    header | body: {"<id>":{...},"<id>":{...},...} | offsets | lengths | ids
+
+The file is memory mapped, so loading everything is a single decoder call on the body
+without any decompression, and reading one player only decodes that player's bytes.
+The previous gzip JSON cache is still readable so it can be migrated.
+
+Files are written to a temp file and renamed over the cache, so readers in other
+processes see either the old or the new file, never a partial one. `PlayerCacheWriter`
+writes one player at a time, so a payload can be cached while it is downloaded. `CacheLock` is a
+lock file shared by every process using the cache, held while refreshing it so only one
+process downloads the payload.
+"""
+import gzip
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .decoders import get_decoder
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+MAGIC = b'SLPC'
+FORMAT_VERSION = 1
+
+# magic, format version, reserved, player count, body offset, body length,
+# offsets offset, lengths offset, ids offset, ids length
+_HEADER = struct.Struct('<4sHHIQQQQQQ')
+
+
+def get_encoder():
+    "Return the fastest available function encoding a player's data to compact JSON bytes"
+    try:
+        import orjson  # pylint: disable=import-outside-toplevel
+        return orjson.dumps
+    except ImportError:
+        return lambda data: json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode()
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _read_array(typecode, data) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+
+class PlayerCacheWriter:
+    """
+    Write a binary player cache one player at a time, such as while the payload is being
+    downloaded, holding only the positions of the players in memory.
+
+    The file is written to a temp file renamed over the cache by `commit`, leaving without
+    committing discards it:
+
+        >>> with PlayerCacheWriter('players_cache.bin') as writer:
+        ...     writer.add('4046', b'{"first_name":"Patrick","last_name":"Mahomes"}')
+        ...     writer.commit()
+    """
+    def __init__(self, path):
+        """
+        :param path: The cache file.
+        """
+        self.path = Path(path)
+        fd, self._tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        self._file = os.fdopen(fd, 'wb')
+        # the header is written last, once the sizes are known
+        self._file.write(b'\0' * _HEADER.size + b'{')
+        self._position = 1  # in the body
+        self._offsets = array('Q')
+        self._lengths = array('I')
+        self._ids = []
+        self.committed = False
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def add(self, player_id, value: bytes):
+        """
+        Append a player.
+
+        :param player_id: The player ID.
+        :param value: The player's data as JSON.
+        """
+        key = json.dumps(str(player_id)).encode() + b':'
+        if self._ids:
+            key = b',' + key
+        self._file.write(key)
+        self._position += len(key)
+        self._offsets.append(self._position)
+        self._lengths.append(len(value))
+        self._file.write(value)
+        self._position += len(value)
+        self._ids.append(str(player_id))
+
+    def commit(self):
+        "Finish the file and rename it over the cache"
+        f = self._file
+        f.write(b'}')
+        body_length = self._position + 1
+        ids = '\0'.join(self._ids).encode()
+        body_offset = _HEADER.size
+        offsets_offset = body_offset + body_length
+        lengths_offset = offsets_offset + len(self._offsets) * 8
+        ids_offset = lengths_offset + len(self._lengths) * 4
+        f.write(_little_endian(self._offsets))
+        f.write(_little_endian(self._lengths))
+        f.write(ids)
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(self._offsets), body_offset,
+                             body_length, offsets_offset, lengths_offset, ids_offset, len(ids)))
+        f.close()
+        os.replace(self._tmp_path, self.path)
+        self.committed = True
+
+    def discard(self):
+        "Delete the temp file, unless committed"
+        if not self.committed:
+            self._file.close()
+            Path(self._tmp_path).unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.discard()
+
+
+def write_player_cache(path, players_json: Dict[str, Dict]):
+    """
+    Write the players payload to a binary cache file, through a temp file so readers
+    never see a partial file.
+
+    :param path: The cache file.
+    :param players_json: The `players/{sport}` payload, a dict keyed by player ID.
+    """
+    encode = get_encoder()
+    with PlayerCacheWriter(path) as writer:
+        for player_id, data in players_json.items():
+            writer.add(player_id, encode(data))
+        writer.commit()
+
+
+def read_legacy_cache(path, decoder='auto') -> Dict[str, Dict]:
+    """
+    Read a cache file written in the previous gzip JSON format.
+    """
+    with gzip.open(path, 'rb') as f:
+        return get_decoder(decoder)(f.read())
+
+
+class PlayerCacheFile:
+    """
+    A memory mapped binary player cache.
+
+        >>> cache = PlayerCacheFile('players_cache.bin')
+        >>> cache.get('4046')['last_name']
+        'Mahomes'
+        >>> players_json = cache.load()
+    """
+    def __init__(self, path, decoder='auto'):
+        """
+        :param path: The cache file.
+        :param decoder: JSON decoder, a name or callable, see `get_decoder`.
+        :raises: OSError if the file can't be read, ValueError if it isn't a valid cache.
+        """
+        self.path = Path(path)
+        self.decoder = get_decoder(decoder)
+        with open(self.path, 'rb') as f:
+            if os.name == 'nt':
+                # a mapped file can't be replaced on Windows, which the next refresh does
+                self._buffer = f.read()
+            else:
+                try:
+                    self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError as exc:  # empty file
+                    raise ValueError(f"Not a player cache file: {self.path}") from exc
+
+        try:
+            (magic, version, _, count, self._body_offset, self._body_length, offsets_offset,
+             lengths_offset, ids_offset, ids_length) = _HEADER.unpack_from(self._buffer, 0)
+        except struct.error as exc:
+            raise ValueError(f"Not a player cache file: {self.path}") from exc
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Not a player cache file (version {version}): {self.path}")
+        if ids_offset + ids_length > len(self._buffer):
+            raise ValueError(f"Truncated player cache file: {self.path}")
+
+        self._count = count
+        self._offsets = _read_array('Q', self._buffer[offsets_offset:lengths_offset])
+        self._lengths = _read_array('I', self._buffer[lengths_offset:ids_offset])
+        self._ids_range = (ids_offset, ids_offset + ids_length)
+        self._ids = None
+        self._positions = None
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, player_id):
+        return player_id in self._player_positions()
+
+    def ids(self) -> List[str]:
+        "Return the player IDs in payload order"
+        if self._ids is None:
+            start, end = self._ids_range
+            self._ids = self._buffer[start:end].decode().split('\0') if self._count else []
+        return self._ids
+
+    def _player_positions(self) -> Dict[str, int]:
+        if self._positions is None:
+            self._positions = {player_id: i for i, player_id in enumerate(self.ids())}
+        return self._positions
+
+    def get(self, player_id: str) -> Optional[Dict]:
+        "Decode and return one player's data, or None"
+        position = self._player_positions().get(player_id)
+        if position is None:
+            return None
+        start = self._body_offset + self._offsets[position]
+        return self.decoder(self._buffer[start:start + self._lengths[position]])
+
+    def load(self) -> Dict[str, Dict]:
+        "Decode and return the whole payload"
+        return self.decoder(self._buffer[self._body_offset:self._body_offset + self._body_length])
+
+    def close(self):
+        "Unmap the file"
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+
+def _try_lock(f) -> bool:
+    "Take the OS lock on an open file without blocking, returns whether it was taken"
+    try:
+        if fcntl is not None:
+            # flock locks belong to the open file, so threads of one process exclude each other too
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:  # pragma: no cover - Windows
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+class CacheLock:
+    """
+    Exclusive lock across processes and threads, on a lock file next to the cache.
+
+        >>> with CacheLock('players_cache.bin.lock'):
+        ...     refresh()
+    """
+    poll_interval = 0.05
+
+    def __init__(self, path):
+        """
+        :param path: The lock file, created if missing. It is never removed, removing it
+            while a process holds the lock would let another one lock a new file.
+        """
+        self.path = Path(path)
+        self._file = None
+
+    @property
+    def locked(self) -> bool:
+        "Whether this instance holds the lock"
+        return self._file is not None
+
+    def acquire(self, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Take the lock.
+
+        :param blocking: Wait for the lock if another process or thread holds it.
+        :param timeout: Seconds to wait at most, None to wait forever.
+        :return: Whether the lock was taken.
+        """
+        f = open(self.path, 'a+b')  # pylint: disable=consider-using-with
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not _try_lock(f):
+            if not blocking or (deadline is not None and time.monotonic() >= deadline):
+                f.close()
+                return False
+            time.sleep(self.poll_interval)
+        self._file = f
+        return True
+
+    def try_acquire(self) -> bool:
+        "Take the lock if it is free, without waiting"
+        return self.acquire(blocking=False)
+
+    def release(self):
+        "Release the lock"
+        f, self._file = self._file, None
+        if f is not None:
+            # closing the file releases the OS lock
+            f.close()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
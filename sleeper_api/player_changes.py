@@ -0,0 +1,197 @@
+"""
+This module computes and keeps what changed in the player universe between refreshes.
+
+Every time the player cache is refreshed from the API, the new payload is compared with
+the previous one and the differences are appended to a change log next to the cache:
+the players added, the players removed, and for the players that changed only the fields
+that did, with their old and new values. `PlayerEndpoint.get_player_changes` merges the
+entries recorded since a given time:
+
+    >>> changes = players.get_player_changes(since=datetime.now() - timedelta(days=7))
+    >>> for player_id, (old, new) in changes.field_changes('injury_status').items():
+    ...     print(player_id, old, '->', new)
+"""
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+_MISSING = object()
+
+
+class PlayerChanges:
+    """
+    The players added, removed and changed between two versions of the players payload.
+
+    `changed` maps a player ID to {field: (old value, new value)}, a field missing from
+    one of the versions has the value None there.
+    """
+    def __init__(self, added: Optional[List[str]] = None, removed: Optional[List[str]] = None,
+                 changed: Optional[Dict[str, Dict[str, Tuple[Any, Any]]]] = None,
+                 since: Optional[float] = None, until: Optional[float] = None):
+        self.added = added or []
+        self.removed = removed or []
+        self.changed = changed or {}
+        self.since = since  # time of the refresh that produced the older version, if known
+        self.until = until if until is not None else time.time()
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self):
+        return (f"<PlayerChanges(added={len(self.added)}, removed={len(self.removed)}, "
+                f"changed={len(self.changed)})>")
+
+    def player_ids(self) -> List[str]:
+        "Return the IDs of every player added, removed or changed"
+        return list(dict.fromkeys(self.added + self.removed + list(self.changed)))
+
+    def field_changes(self, field: str) -> Dict[str, Tuple[Any, Any]]:
+        "Return {player ID: (old value, new value)} for the players whose field changed"
+        return {player_id: fields[field] for player_id, fields in self.changed.items()
+                if field in fields}
+
+    def merge(self, later: 'PlayerChanges') -> 'PlayerChanges':
+        """
+        Combine these changes with the ones that followed them, into the changes between
+        the oldest and the newest version. A player removed and then added again is
+        reported as added, as the fields it had before aren't kept.
+        """
+        later_removed = set(later.removed)
+        added = [player_id for player_id in self.added if player_id not in later_removed]
+        net_added = set(added)
+        added += [player_id for player_id in later.added if player_id not in net_added]
+        net_added.update(later.added)
+
+        removed = [player_id for player_id in self.removed if player_id not in net_added]
+        removed_set = set(removed)
+        # a player added and removed again never existed as far as the merged changes go
+        removed += [player_id for player_id in later.removed
+                    if player_id not in removed_set and player_id not in self.added]
+
+        changed = {}
+        for player_id in dict.fromkeys(list(self.changed) + list(later.changed)):
+            if player_id in net_added or player_id in later_removed:
+                continue
+            fields = dict(self.changed.get(player_id, {}))
+            for field, (old, new) in later.changed.get(player_id, {}).items():
+                first = fields.get(field)
+                fields[field] = (first[0] if first is not None else old, new)
+            fields = {field: values for field, values in fields.items() if values[0] != values[1]}
+            if fields:
+                changed[player_id] = fields
+        return PlayerChanges(added, removed, changed, since=self.since, until=later.until)
+
+    def to_dict(self) -> Dict[str, Any]:
+        "Return the changes as JSON serializable data"
+        return {
+            'since': self.since,
+            'until': self.until,
+            'added': self.added,
+            'removed': self.removed,
+            'changed': {player_id: {field: list(values) for field, values in fields.items()}
+                        for player_id, fields in self.changed.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PlayerChanges':
+        "Create the changes from `to_dict` data"
+        changed = {player_id: {field: tuple(values) for field, values in fields.items()}
+                   for player_id, fields in data.get('changed', {}).items()}
+        return cls(data.get('added'), data.get('removed'), changed,
+                   since=data.get('since'), until=data.get('until'))
+
+
+def diff_players(old: Dict[str, Dict], new: Dict[str, Dict],
+                 since: Optional[float] = None) -> PlayerChanges:
+    """
+    Compare two versions of the `players/{sport}` payload.
+
+    :param old: The previous payload.
+    :param new: The refreshed payload.
+    :param since: When the previous payload was fetched.
+    """
+    added = [player_id for player_id in new if player_id not in old]
+    removed = [player_id for player_id in old if player_id not in new]
+    changed = {}
+    for player_id, data in new.items():
+        before = old.get(player_id)
+        if before is None or before == data:  # most players don't change between refreshes
+            continue
+        fields = {}
+        for field, value in data.items():
+            previous = before.get(field)
+            if previous != value:
+                fields[field] = (previous, value)
+        for field, previous in before.items():
+            if previous is not None and data.get(field, _MISSING) is _MISSING:
+                fields[field] = (previous, None)
+        if fields:
+            changed[player_id] = fields
+    return PlayerChanges(added, removed, changed, since=since)
+
+
+class PlayerChangeLog:
+    """
+    The changes of every refresh within the retention period, one compact JSON line each.
+    """
+    def __init__(self, path, retention=None):
+        """
+        :param path: The change log file.
+        :param retention: timedelta after which entries are dropped, None to keep everything.
+        """
+        self.path = Path(path)
+        self.retention = retention
+
+    def entries(self) -> List[PlayerChanges]:
+        "Return the recorded changes, oldest first"
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return []
+        entries = []
+        for line in lines:
+            try:
+                entries.append(PlayerChanges.from_dict(json.loads(line)))
+            except (ValueError, TypeError, AttributeError):
+                continue  # a torn or foreign line, the rest is still usable
+        return entries
+
+    def append(self, changes: PlayerChanges):
+        "Record the changes of a refresh, dropping the entries past the retention period"
+        entries = self.entries() + [changes]
+        if self.retention is not None:
+            oldest = changes.until - self.retention.total_seconds()
+            entries = [entry for entry in entries if entry.until >= oldest]
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry.to_dict(), separators=(',', ':')))
+                    f.write('\n')
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def since(self, since=None) -> PlayerChanges:
+        """
+        Return the changes of the refreshes after a time, merged.
+
+        :param since: datetime or POSIX timestamp, None for every recorded refresh.
+        """
+        if isinstance(since, datetime):
+            since = since.timestamp()
+        merged = None
+        for entry in self.entries():
+            if since is not None and entry.until <= since:
+                continue
+            merged = entry if merged is None else merged.merge(entry)
+        if merged is None:
+            return PlayerChanges(since=since, until=time.time())
+        return merged
@@ -0,0 +1,329 @@
+"""
+This module keeps an archive of every version of the players payload, to look up what a
+player looked like at a past time, such as the team and status a player had on the day
+of a backtested week.
+
+`PlayerHistory` appends each refresh to one file as the changes since the previous
+version: the players added with their data, the IDs of the players removed, and for the
+players that changed only the fields that did. Most players don't change from one day to
+the next, so a refresh adds a few compressed kilobytes rather than another multi-megabyte
+payload. A full snapshot is only written for the first version, or when the previous
+version isn't the archive's latest, e.g. when the archive was enabled after the cache
+was made.
+
+    header | frame | frame | ...          frame: length | zlib compressed JSON record
+
+Frames are only ever appended, so after a refresh only the new ones are read. While
+loading, the versions are split per player into a timeline of the times that player
+changed, so a point-in-time lookup is a binary search of one timeline followed by
+replaying the few changes since that player's last full version.
+"""
+import bisect
+import os
+import struct
+import threading
+import zlib
+from datetime import date, datetime, time as day_time, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .decoders import get_decoder
+from .player_cache import get_encoder
+from .player_changes import PlayerChanges
+
+MAGIC = b'SLPH'
+FORMAT_VERSION = 1
+
+# magic, format version
+_HEADER = struct.Struct('<4sH')
+# length of the compressed record
+_FRAME = struct.Struct('<I')
+
+# timeline entries: the whole data of the player (None once removed), or changed fields
+_REPLACE, _PATCH = range(2)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_timestamp(at) -> float:
+    """
+    Return the POSIX timestamp of a datetime, of a date (its last moment, so the version
+    in effect that day) or of a timestamp.
+    """
+    if isinstance(at, datetime):
+        return at.timestamp()
+    if isinstance(at, date):
+        return datetime.combine(at, day_time.max).timestamp()
+    return float(at)
+
+
+def _micros(timestamp: float) -> int:
+    """
+    Return a POSIX timestamp in whole microseconds, rounded as `datetime.fromtimestamp`
+    rounds it, so a version's time and the datetime of it are the same.
+    """
+    return (datetime.fromtimestamp(timestamp, timezone.utc) - _EPOCH) // _MICROSECOND
+
+
+def _apply(data: Optional[Dict], entry) -> Optional[Dict]:
+    kind, value = entry
+    if kind == _REPLACE:
+        return None if value is None else dict(value)
+    fields, unset = value
+    data = dict(data or {})
+    data.update(fields)
+    for field in unset:
+        data.pop(field, None)
+    return data
+
+
+class PlayerHistory:
+    """
+    Archive of every version of the players payload of a sport, kept as compressed deltas.
+
+    Lookups take a datetime, a date or a POSIX timestamp and see the latest version
+    recorded at or before it.
+    """
+    def __init__(self, path, decoder='auto'):
+        """
+        :param path: The archive file, created by the first `record`.
+        :param decoder: JSON decoder, a name or callable, see `get_decoder`.
+        """
+        self.path = Path(path)
+        self.decoder = get_decoder(decoder)
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._size = 0          # bytes of the file read so far
+        self._file_id = None    # (device, inode) of the file read
+        self.times = []         # time of each version, oldest first
+        self._timelines = {}    # player ID -> ([times in microseconds], [entries])
+        self._latest = set()    # IDs of the players in the latest version
+
+    def _add(self, player_id: str, when: int, entry):
+        timeline = self._timelines.get(player_id)
+        if timeline is None:
+            timeline = self._timelines[player_id] = ([], [])
+        timeline[0].append(when)
+        timeline[1].append(entry)
+
+    def _latest_data(self, player_id: str) -> Optional[Dict]:
+        timeline = self._timelines.get(player_id)
+        return None if timeline is None else self._build(timeline[1], len(timeline[1]))
+
+    def _load_record(self, record: Dict[str, Any]):
+        "Add a version to the timelines"
+        when = _micros(record['time'])
+        if 'players' in record:
+            players = record['players']
+            for player_id in self._latest.difference(players):
+                self._add(player_id, when, (_REPLACE, None))
+            for player_id, data in players.items():
+                # a full snapshot repeats the players that didn't change, skip them
+                if player_id not in self._latest or self._latest_data(player_id) != data:
+                    self._add(player_id, when, (_REPLACE, data))
+            self._latest = set(players)
+        else:
+            for player_id, data in record['added'].items():
+                self._add(player_id, when, (_REPLACE, data))
+                self._latest.add(player_id)
+            for player_id in record['removed']:
+                self._add(player_id, when, (_REPLACE, None))
+                self._latest.discard(player_id)
+            for player_id, (fields, unset) in record['changed'].items():
+                self._add(player_id, when, (_PATCH, (fields, unset)))
+        self.times.append(record['time'])
+
+    def _refresh(self):
+        """
+        Read the frames appended to the file since it was last read, or the whole file if
+        it was replaced. A frame cut off by an interrupted write is left for `record`
+        to overwrite.
+        """
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            self._reset()
+            return
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self._file_id or stat.st_size < self._size:
+            self._reset()
+            self._file_id = file_id
+        if stat.st_size == self._size:
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(self._size)
+            data = f.read()
+        position = 0
+        if self._size == 0:
+            if len(data) < _HEADER.size:
+                return
+            magic, version = _HEADER.unpack_from(data)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"Not a player history file: {self.path}")
+            position = _HEADER.size
+        while position + _FRAME.size <= len(data):
+            (length,) = _FRAME.unpack_from(data, position)
+            end = position + _FRAME.size + length
+            if end > len(data):
+                break
+            try:
+                record = self.decoder(zlib.decompress(data[position + _FRAME.size:end]))
+            except zlib.error as e:
+                raise ValueError(f"Corrupt player history file {self.path}: {e}") from e
+            self._load_record(record)
+            position = end
+        self._size += position
+
+    def record(self, players_json: Dict[str, Dict], when: float,
+               changes: Optional[PlayerChanges] = None) -> bool:
+        """
+        Append a version of the payload.
+
+        :param players_json: The payload.
+        :param when: POSIX timestamp of the version, not older than the latest one. It is
+            kept to the microsecond, so a datetime of it finds this version again.
+        :param changes: The changes since the previous version, from `diff_players`. They
+            are stored instead of the payload when `changes.since` is the time of the
+            archive's latest version.
+        :return: True if only the changes were stored, False for a full snapshot.
+        """
+        encode = get_encoder()
+        with self.lock:
+            self._refresh()
+            when = _micros(when) / 1e6
+            latest = _micros(self.times[-1]) if self.times else None
+            if latest is not None and _micros(when) < latest:
+                raise ValueError("The version is older than the latest one in the history")
+            delta = (changes is not None and latest is not None and changes.since is not None
+                     and _micros(changes.since) == latest)
+            if delta:
+                record = {
+                    'time': when,
+                    'added': {player_id: players_json[player_id] for player_id in changes.added},
+                    'removed': changes.removed,
+                    'changed': {
+                        player_id: [
+                            {field: players_json[player_id][field] for field in fields
+                             if field in players_json[player_id]},
+                            [field for field in fields if field not in players_json[player_id]],
+                        ]
+                        for player_id, fields in changes.changed.items()
+                    },
+                }
+            else:
+                record = {'time': when, 'players': players_json}
+            frame = zlib.compress(encode(record))
+
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            with os.fdopen(fd, 'r+b') as f:
+                f.truncate(self._size)  # drop a frame cut off by an interrupted write
+                f.seek(self._size)
+                if self._size == 0:
+                    f.write(_HEADER.pack(MAGIC, FORMAT_VERSION))
+                f.write(_FRAME.pack(len(frame)))
+                f.write(frame)
+                size = f.tell()
+                stat = os.fstat(f.fileno())
+            self._file_id = (stat.st_dev, stat.st_ino)
+            # decoded again so the timelines don't share the caller's dicts
+            self._load_record(self.decoder(encode(record)))
+            self._size = size
+            return delta
+
+    @staticmethod
+    def _build(entries, end: int) -> Optional[Dict]:
+        "Replay a timeline up to entries[end - 1], from the last full version before it"
+        start = end - 1
+        while start >= 0 and entries[start][0] == _PATCH:
+            start -= 1
+        data = None
+        for entry in entries[max(start, 0):end]:
+            data = _apply(data, entry)
+        return data
+
+    def versions(self) -> List[float]:
+        "Return the time of every version, oldest first"
+        with self.lock:
+            self._refresh()
+            return list(self.times)
+
+    def get(self, player_id: str, at=None) -> Optional[Dict]:
+        """
+        Return a player's data as it was at a time.
+
+        :param player_id: The player ID.
+        :param at: datetime, date or POSIX timestamp, None for the latest version.
+        :return: The data, None if the player wasn't in the version in effect then.
+        """
+        with self.lock:
+            self._refresh()
+            timeline = self._timelines.get(player_id)
+            if timeline is None:
+                return None
+            times, entries = timeline
+            end = len(times) if at is None else bisect.bisect_right(
+                times, _micros(to_timestamp(at)))
+            return self._build(entries, end)
+
+    def player_history(self, player_id: str, start=None,
+                       end=None) -> List[Tuple[float, Optional[Dict]]]:
+        """
+        Return the versions of a player's data between two times, the first being the
+        one in effect at start.
+
+        :param player_id: The player ID.
+        :param start: datetime, date or POSIX timestamp, None from the first version.
+        :param end: datetime, date or POSIX timestamp, None up to the latest version.
+        :return: List of (time the version was recorded, data or None if removed then),
+            one for each time the player changed.
+        """
+        with self.lock:
+            self._refresh()
+            timeline = self._timelines.get(player_id)
+            if timeline is None:
+                return []
+            times, entries = timeline
+            first = 0 if start is None else max(
+                bisect.bisect_right(times, _micros(to_timestamp(start))) - 1, 0)
+            last = len(times) if end is None else bisect.bisect_right(
+                times, _micros(to_timestamp(end)))
+            if first >= last:
+                return []
+            data = self._build(entries, first)
+            history = []
+            for i in range(first, last):
+                data = _apply(data, entries[i])
+                history.append((times[i] / 1e6, data))
+            return history
+
+    def snapshot(self, at=None) -> Dict[str, Dict]:
+        """
+        Return the whole payload as it was at a time.
+
+        :param at: datetime, date or POSIX timestamp, None for the latest version.
+        """
+        with self.lock:
+            self._refresh()
+            timestamp = None if at is None else _micros(to_timestamp(at))
+            players = {}
+            for player_id, (times, entries) in self._timelines.items():
+                end = len(times) if timestamp is None else bisect.bisect_right(times, timestamp)
+                data = self._build(entries, end)
+                if data is not None:
+                    players[player_id] = data
+            return players
+
+    def stats(self) -> Dict[str, Any]:
+        "Return the number of versions and players recorded and the size of the file"
+        with self.lock:
+            self._refresh()
+            return {
+                'versions': len(self.times),
+                'players': len(self._timelines),
+                'first': self.times[0] if self.times else None,
+                'latest': self.times[-1] if self.times else None,
+                'file_bytes': self._size,
+            }
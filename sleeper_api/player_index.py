@@ -0,0 +1,347 @@
+"""
+This module provides the `PlayerIndex` class, an in-memory index of the `players/{sport}`
+payload keyed by player ID.
+
+Indexes are shared process wide, one per player cache file and sport, so every
+`PlayerEndpoint` reading the same cache answers lookups from the same dictionaries. An
+index is rebuilt only when the cache it was built from changes (a new cache generation),
+after which `version` is bumped so anything derived from it can tell it is stale.
+The strings of repeated fields such as team and position are interned as players are
+indexed, and models are views over the indexed data.
+
+Secondary indexes map the values of commonly filtered fields to the IDs of the players
+having them. Each one is built the first time it is used and dropped on rebuild.
+
+When the cache is refreshed, `apply_changes` swaps in the new payload and updates the
+models and secondary indexes of the players that changed only.
+
+An index can also be pointed at a binary cache file (`load_cache_file`): single players
+are then decoded from the file as they are looked up, and the whole payload is only
+decoded when something needs every player, such as a search.
+"""
+import bisect
+import itertools
+import sys
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from .models.player import INTERNED_FIELDS, PlayerModel, intern_player_data, intern_players
+
+# number of players whose size is measured to estimate the memory held by an index
+MEMORY_SAMPLE_SIZE = 64
+
+# fields with a secondary index, list values such as fantasy_positions are indexed per item.
+# team_abbr is the model's team (the team_abbr field, falling back to team)
+INDEXED_FIELDS = ('team', 'position', 'status', 'fantasy_positions', 'injury_status', 'team_abbr')
+
+
+def _field_value(data: Dict, field: str):
+    if field == 'team_abbr':
+        return data.get('team_abbr') or data.get('team')
+    return data.get(field)
+
+
+def _player_size(data: Dict) -> int:
+    """
+    Estimate the bytes held by a decoded player. Keys and interned values are shared by
+    every player and aren't counted.
+    """
+    size = sys.getsizeof(data)
+    for field, value in data.items():
+        if field in INTERNED_FIELDS and isinstance(value, str):
+            continue
+        size += sys.getsizeof(value)
+        if isinstance(value, (list, dict)):
+            size += sum(map(sys.getsizeof, value.values() if isinstance(value, dict) else value))
+    return size
+
+
+def _index_keys(data: Optional[Dict], field: str) -> tuple:
+    "Return the keys a player is listed under in the secondary index of a field"
+    if data is None:
+        return ()
+    value = _field_value(data, field)
+    if value is None:
+        return ()
+    try:
+        return tuple(dict.fromkeys(value if isinstance(value, list) else (value,)))
+    except TypeError:
+        return ()  # unhashable values can't be looked up anyway
+
+
+class PlayerIndex:
+    """
+    Player payload indexed by player ID, with PlayerModel instances built on first lookup.
+
+    The models are shared by every caller of the index, treat them as read-only.
+    """
+    def __init__(self):
+        self.generation = None
+        self.version = 0
+        self.lock = threading.RLock()  # held while (re)building
+        self._players = {}
+        self._source = None  # PlayerCacheFile read lazily while _players is None
+        self._records = {}  # players decoded from the source so far
+        self._models = {}
+        self._secondary = {}  # field -> {value: [player IDs in payload order]}
+        self._positions = None
+        self.derived = {}  # caches of anything computed from the payload, e.g. query results
+        self._player_bytes = (0, 0)  # (version, estimated bytes per decoded player)
+
+    def __len__(self):
+        players = self._players
+        return len(players) if players is not None else len(self._source)
+
+    def __contains__(self, player_id):
+        players = self._players
+        return player_id in (players if players is not None else self._source)
+
+    @property
+    def loaded(self) -> bool:
+        "Whether the index holds a payload"
+        return self.version > 0
+
+    def is_current(self, generation) -> bool:
+        """
+        Whether the index was built from the given cache generation.
+        A generation of None (no cache on disk) is never current.
+        """
+        return self.loaded and generation is not None and generation == self.generation
+
+    def load(self, players_json: Dict[str, Dict], generation=None):
+        """
+        Replace the indexed payload.
+
+        :param players_json: The `players/{sport}` payload, a dict keyed by player ID.
+        :param generation: Identifies the cache the payload was read from.
+        """
+        intern_players(players_json)
+        # swap in complete dictionaries so concurrent readers never see a partial index
+        with self.lock:
+            # _source is left alone: a reader that just saw _players as None still needs it
+            self._players = players_json
+            self._records = {}
+            self._models = {}
+            self._secondary = {}
+            self._positions = None
+            self.derived = {}
+            self.generation = generation
+            self.version += 1
+
+    def load_cache_file(self, cache, generation=None):
+        """
+        Replace the indexed payload with the contents of a binary cache file, decoded lazily.
+
+        :param cache: An open `PlayerCacheFile`.
+        :param generation: Identifies the cache file.
+        """
+        with self.lock:
+            self._source = cache  # set before _players, readers check _players first
+            self._players = None
+            self._records = {}
+            self._models = {}
+            self._secondary = {}
+            self._positions = None
+            self.derived = {}
+            self.generation = generation
+            self.version += 1
+
+    def apply_changes(self, players_json: Dict[str, Dict], changes, generation=None):
+        """
+        Replace the indexed payload with a refreshed version of it, keeping the models and
+        secondary index entries of the players that didn't change.
+
+        :param players_json: The refreshed payload.
+        :param changes: The `PlayerChanges` from the indexed payload to players_json.
+        :param generation: Identifies the cache the payload was written to.
+        """
+        intern_players(players_json)
+        with self.lock:
+            old = self.players_json()
+            touched = set(changes.added).union(changes.removed, changes.changed)
+            models = {player_id: model for player_id, model in self._models.items()
+                      if player_id not in touched}
+
+            secondary = {}
+            positions = None
+            if self._secondary:
+                # the index lists are in payload order, they can only be patched if the
+                # players that were already there kept their order
+                unchanged_order = ([key for key in old if key in players_json]
+                                   == [key for key in players_json if key in old])
+                if unchanged_order:
+                    positions = {key: i for i, key in enumerate(players_json)}
+                    for field, values in self._secondary.items():
+                        secondary[field] = self._patch_secondary(
+                            values, field, old, players_json, touched, positions)
+
+            self._players = players_json
+            self._records = {}
+            self._models = models
+            self._secondary = secondary
+            self._positions = positions
+            self.derived = {}
+            self.generation = generation
+            self.version += 1
+
+    @staticmethod
+    def _patch_secondary(values, field, old, new, touched, positions):
+        "Return a copy of a secondary index with the touched players moved to their new keys"
+        values = dict(values)  # readers may hold the old dict and lists, never modify them
+        for player_id in touched:
+            before = _index_keys(old.get(player_id), field)
+            after = _index_keys(new.get(player_id), field)
+            if before == after:
+                continue
+            for key in before:
+                if key not in after:
+                    remaining = [other for other in values[key] if other != player_id]
+                    if remaining:
+                        values[key] = remaining
+                    else:
+                        del values[key]
+            for key in after:
+                if key not in before:
+                    player_ids = list(values.get(key, ()))
+                    bisect.insort(player_ids, player_id, key=positions.__getitem__)
+                    values[key] = player_ids
+        return values
+
+    def get_json(self, player_id: str) -> Optional[Dict]:
+        "Return the raw player data for an ID, or None"
+        players = self._players
+        if players is not None:
+            return players.get(player_id)
+        records = self._records
+        data = records.get(player_id)
+        if data is None:
+            data = self._source.get(player_id)
+            if data is not None:
+                data = records.setdefault(player_id, intern_player_data(data))
+        return data
+
+    def get(self, player_id: str) -> Optional[PlayerModel]:
+        "Return the PlayerModel for an ID, or None"
+        models = self._models
+        model = models.get(player_id)
+        if model is None:
+            data = self.get_json(player_id)
+            if data is None:
+                return None
+            model = models.setdefault(player_id, PlayerModel.from_dict(data))
+        return model
+
+    def get_many(self, player_ids: Iterable[str]) -> List[PlayerModel]:
+        "Return the PlayerModels for the IDs that exist, in the order given"
+        get = self.get
+        return [model for model in map(get, player_ids) if model is not None]
+
+    def players_json(self) -> Dict[str, Dict]:
+        "Return the indexed payload, decoding the whole cache file if it hasn't been yet"
+        players = self._players
+        if players is None:
+            with self.lock:
+                players = self._players
+                if players is None:
+                    players = intern_players(self._source.load())
+                    # keep the records already handed out, so callers see the same objects
+                    players.update(self._records)
+                    self._players = players
+        return players
+
+    def secondary(self, field: str) -> Dict[Any, List[str]]:
+        """
+        Return the secondary index of a field, building it on first use.
+
+        :param field: One of `INDEXED_FIELDS`.
+        :return: Dict mapping each value of the field to the IDs of the players having it.
+        """
+        secondary = self._secondary
+        values = secondary.get(field)
+        if values is not None:
+            return values
+        if field not in INDEXED_FIELDS:
+            raise KeyError(f"No index on field: {field}")
+        with self.lock:
+            # read both under the lock so a concurrent load can't mix two payloads
+            secondary, players = self._secondary, self.players_json()
+            values = secondary.get(field)
+            if values is None:
+                values = {}
+                for player_id, data in players.items():
+                    for key in _index_keys(data, field):
+                        values.setdefault(key, []).append(player_id)
+                secondary[field] = values
+        return values
+
+    def lookup(self, field: str, value) -> List[str]:
+        """
+        Return the IDs of the players whose field equals, or for list fields contains, the value.
+        """
+        try:
+            return self.secondary(field).get(value, [])
+        except TypeError:
+            return []
+
+    def memory_usage(self) -> int:
+        """
+        Estimate the bytes held by the decoded players, models and secondary indexes, from
+        the size of a sample of players. A memory mapped cache file isn't counted, the
+        operating system pages it in and out, nor are the derived caches.
+        """
+        players = self._players
+        records = players if players is not None else self._records
+        count = len(records)
+        usage = len(self._models) * sys.getsizeof(PlayerModel.__new__(PlayerModel))
+        if count:
+            version, per_player = self._player_bytes
+            if version != self.version or not per_player:
+                # a copy, other threads may be decoding players into records
+                sample = list(itertools.islice(dict(records).values(), MEMORY_SAMPLE_SIZE))
+                per_player = sum(map(_player_size, sample)) // max(len(sample), 1)
+                self._player_bytes = (self.version, per_player)
+            usage += count * (per_player + 8)  # + the payload dict's entry
+        for values in list(self._secondary.values()):
+            usage += sys.getsizeof(values) + sum(map(sys.getsizeof, values.values()))
+        return usage
+
+    def position(self, player_id: str) -> int:
+        "Return where the player is in the payload, used to keep results in payload order"
+        positions = self._positions
+        if positions is None:
+            players = self._players
+            keys = players if players is not None else self._source.ids()
+            positions = self._positions = {key: i for i, key in enumerate(keys)}
+        return positions[player_id]
+
+
+_INDEXES: Dict[tuple, PlayerIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def shared_index(cache_file, sport: str = 'nfl') -> PlayerIndex:
+    """
+    Return the process wide index for a player cache file and sport, creating it if needed.
+    """
+    key = (str(cache_file), sport)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = _INDEXES[key] = PlayerIndex()
+        return index
+
+
+def drop_index(cache_file, sport: str = 'nfl'):
+    """
+    Drop the shared index of a player cache file and sport, freeing its memory.
+    """
+    with _INDEXES_LOCK:
+        _INDEXES.pop((str(cache_file), sport), None)
+
+
+def clear_indexes():
+    """
+    Drop every shared index, freeing their memory.
+    """
+    with _INDEXES_LOCK:
+        _INDEXES.clear()
@@ -0,0 +1,473 @@
+"""
+This module compiles the search keys of `PlayerEndpoint.search_players` into query plans.
+
+The nested AND/OR search keys are compiled once into a tree of predicate closures
+instead of being interpreted for every player. Using the secondary indexes of a
+`PlayerIndex`, the plan then:
+
+- estimates how selective every condition is and checks the most selective first,
+  so records are rejected as early as possible,
+- picks an access path, fetching the candidates of the most selective indexed equality
+  or `in` condition instead of scanning every player.
+
+The IDs each query matched are cached per index and dropped when the player
+data is reloaded. `explain_query` describes the plan chosen and the rows it scanned.
+
+`order_players` sorts the matches, selecting the first k with a heap when there is a
+limit, and `select_players` builds the results one at a time, either PlayerModels, the
+raw data or only some of its fields, so a query only pays for the results it returns.
+"""
+import heapq
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .config import QUERY_CACHE_SIZE
+from .player_index import INDEXED_FIELDS, PlayerIndex, _field_value
+
+# operators and the tests they make, with the same semantics as the original evaluator
+OPERATORS = {
+    "==": lambda record_value, val: record_value == val,
+    "!=": lambda record_value, val: not record_value == val,
+    ">": lambda record_value, val: record_value > val,
+    "<": lambda record_value, val: record_value < val,
+    ">=": lambda record_value, val: record_value >= val,
+    "<=": lambda record_value, val: record_value <= val,
+    "in": lambda record_value, val: record_value in val,
+    "not in": lambda record_value, val: record_value not in val,
+}
+
+# guessed fraction of players passing an operator on a field without an index
+DEFAULT_SELECTIVITY = {
+    "==": 0.05,
+    "!=": 0.95,
+    ">": 0.5,
+    "<": 0.5,
+    ">=": 0.5,
+    "<=": 0.5,
+    "in": 0.05,  # per item
+    "not in": 0.9,
+}
+
+
+def _index_keys(value):
+    """
+    Return the values to look up in a secondary index to find every record equal to value,
+    or None if the index can't be used. A list is found under its first item.
+    """
+    if isinstance(value, list):
+        return (value[0],) if value else None
+    if isinstance(value, (dict, set)):
+        return None
+    return (value,)
+
+
+def _condition_keys(value):
+    """
+    Return the index keys of a search key's value, for plain values, '==' and 'in',
+    or None when the index can't answer it.
+    """
+    if not isinstance(value, dict):
+        return _index_keys(value)
+    if "==" in value:
+        return _index_keys(value["=="])
+    if "in" in value and isinstance(value["in"], (list, tuple, set, frozenset)):
+        keys = []
+        for item in value["in"]:
+            item_keys = _index_keys(item)
+            if item_keys is None:
+                return None
+            keys.extend(item_keys)
+        return keys
+    return None
+
+
+class Condition:
+    """
+    A single search key, e.g. 'age' with {'>': 25}.
+    """
+    __slots__ = ('field', 'value', 'test', 'selectivity', 'candidates')
+
+    def __init__(self, field: str, value):
+        self.field = field
+        self.value = value
+        self.selectivity = 1.0
+        self.candidates = None  # player IDs from a secondary index, a superset of the matches
+        self.test = self._compile(field, value)
+
+    @staticmethod
+    def _compile(field, value):
+        if not isinstance(value, dict):
+            def test(record):
+                record_value = record.get(field)
+                return record_value is not None and record_value == value
+            return test
+
+        checks = []
+        for operator, val in value.items():
+            if operator not in OPERATORS:
+                raise ValueError(f"Unsupported operator: {operator}")
+            checks.append((OPERATORS[operator], val))
+
+        if len(checks) == 1:
+            (check, val), = checks
+
+            def test(record):
+                record_value = record.get(field)
+                return record_value is not None and check(record_value, val)
+            return test
+
+        def test(record):
+            record_value = record.get(field)
+            if record_value is None:
+                return False
+            for check, val in checks:
+                if not check(record_value, val):
+                    return False
+            return True
+        return test
+
+    def estimate(self, index: PlayerIndex):
+        "Estimate the selectivity, exactly from a secondary index when there is one"
+        total = len(index) or 1
+        keys = _condition_keys(self.value) if self.field in INDEXED_FIELDS else None
+        if keys is not None:
+            if len(keys) == 1:
+                self.candidates = index.lookup(self.field, keys[0])
+            else:
+                self.candidates = sorted(
+                    set().union(*(index.lookup(self.field, key) for key in keys)),
+                    key=index.position)
+            self.selectivity = len(self.candidates) / total
+            return
+        if not isinstance(self.value, dict):
+            self.selectivity = DEFAULT_SELECTIVITY["=="]
+            return
+        selectivity = 1.0
+        for operator, val in self.value.items():
+            guess = DEFAULT_SELECTIVITY[operator]
+            if operator == "in":
+                try:
+                    guess = min(1.0, guess * len(val))
+                except TypeError:
+                    guess = 0.5
+            selectivity *= guess
+        self.selectivity = selectivity
+
+    def describe(self, depth=0) -> List[str]:
+        "Lines describing the condition"
+        if isinstance(self.value, dict):
+            text = ' and '.join(f"{self.field} {operator} {val!r}"
+                                for operator, val in self.value.items())
+        else:
+            text = f"{self.field} == {self.value!r}"
+        source = 'index' if self.candidates is not None else 'estimate'
+        return [f"{'  ' * depth}{text}  ({source}: {self.selectivity:.4f})"]
+
+
+class AllOf:
+    """
+    Conditions that must all hold, checked from the most to the least selective.
+    """
+    __slots__ = ('children', 'selectivity', 'test')
+
+    def __init__(self, children):
+        self.children = children
+        self.selectivity = 1.0
+        self.test = None
+
+    def estimate(self, index: PlayerIndex):
+        "Estimate the children, order them and compile the combined test"
+        selectivity = 1.0
+        for child in self.children:
+            child.estimate(index)
+            selectivity *= child.selectivity
+        self.selectivity = selectivity
+        # sort is stable, so equally selective conditions keep the order they were given
+        self.children.sort(key=lambda child: child.selectivity)
+        tests = [child.test for child in self.children]
+        if len(tests) == 1:
+            self.test = tests[0]
+            return
+
+        def test(record):
+            for child_test in tests:
+                if not child_test(record):
+                    return False
+            return True
+        self.test = test
+
+    def candidates(self):
+        "Candidates of the most selective child that has any, or None"
+        options = [ids for ids in map(_candidates, self.children) if ids is not None]
+        return min(options, key=len, default=None)
+
+    def describe(self, depth=0) -> List[str]:
+        "Lines describing the conditions"
+        lines = [f"{'  ' * depth}AND  (estimate: {self.selectivity:.4f})"]
+        for child in self.children:
+            lines += child.describe(depth + 1)
+        return lines
+
+
+class AnyOf:
+    """
+    Conditions of which one must hold, checked from the most to the least likely.
+    """
+    __slots__ = ('children', 'selectivity', 'test', 'index')
+
+    def __init__(self, children):
+        self.children = children
+        self.selectivity = 0.0
+        self.test = None
+        self.index = None
+
+    def estimate(self, index: PlayerIndex):
+        "Estimate the children, order them and compile the combined test"
+        self.index = index
+        miss = 1.0
+        for child in self.children:
+            child.estimate(index)
+            miss *= 1.0 - child.selectivity
+        self.selectivity = 1.0 - miss
+        self.children.sort(key=lambda child: -child.selectivity)
+        tests = [child.test for child in self.children]
+
+        def test(record):
+            for child_test in tests:
+                if child_test(record):
+                    return True
+            return False
+        self.test = test
+
+    def candidates(self):
+        "Union of the children's candidates, or None if a child has none"
+        union = set()
+        for child in self.children:
+            ids = _candidates(child)
+            if ids is None:
+                return None
+            union.update(ids)
+        return sorted(union, key=self.index.position)
+
+    def describe(self, depth=0) -> List[str]:
+        "Lines describing the conditions"
+        lines = [f"{'  ' * depth}OR  (estimate: {self.selectivity:.4f})"]
+        for child in self.children:
+            lines += child.describe(depth + 1)
+        return lines
+
+
+def _candidates(node) -> Optional[List[str]]:
+    if isinstance(node, Condition):
+        return node.candidates
+    return node.candidates()
+
+
+def compile_query(search_keys: Dict[str, Any]):
+    """
+    Compile search keys into a tree of `Condition`, `AllOf` and `AnyOf` nodes.
+
+    :raises: ValueError for an unsupported operator or conditions format.
+    """
+    if not isinstance(search_keys, dict):
+        raise ValueError(f"Unsupported conditions format: {search_keys}")
+    if "AND" in search_keys:
+        return AllOf([compile_query(cond) for cond in search_keys["AND"]])
+    if "OR" in search_keys:
+        return AnyOf([compile_query(cond) for cond in search_keys["OR"]])
+    conditions = [Condition(field, value) for field, value in search_keys.items()]
+    return conditions[0] if len(conditions) == 1 else AllOf(conditions)
+
+
+class QueryPlan:
+    """
+    Compiled search keys with their access path, for one version of a `PlayerIndex`.
+    """
+    def __init__(self, index: PlayerIndex, search_keys: Dict[str, Any]):
+        self.index = index
+        self.version = index.version
+        self.search_keys = search_keys
+        self.root = compile_query(search_keys)
+        self.root.estimate(index)
+        self.candidates = _candidates(self.root)
+
+    def execute(self):
+        """
+        Run the plan.
+
+        :return: Tuple of the matching player IDs in payload order and the rows scanned.
+        """
+        players = self.index.players_json()
+        test = self.root.test
+        player_ids = players.keys() if self.candidates is None else self.candidates
+        return [player_id for player_id in player_ids if test(players[player_id])], len(player_ids)
+
+    def explain(self, rows_scanned=None, matched=None, cached=False) -> str:
+        "Describe the plan, with the result of running it when given"
+        total = len(self.index)
+        if self.candidates is None:
+            access = f"full scan of {total} players"
+        else:
+            access = f"index lookup, {len(self.candidates)} of {total} players"
+        lines = [f"access: {access}", "filter:"] + self.root.describe(1)
+        if rows_scanned is not None:
+            lines.append(f"rows scanned: {rows_scanned}, matched: {matched}")
+        lines.append(f"result cache: {'hit' if cached else 'miss'}")
+        return '\n'.join(lines)
+
+
+class QueryCache:
+    """
+    LRU of the player IDs matched by recent queries, kept for one version of an index.
+    """
+    def __init__(self, maxsize: int = QUERY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # query key -> matching player IDs
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key) -> Optional[List[str]]:
+        "Return the IDs cached for the key, or None"
+        with self._lock:
+            player_ids = self._entries.get(key)
+            if player_ids is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return player_ids
+
+    def put(self, key, player_ids: List[str]):
+        "Cache the IDs a query matched"
+        with self._lock:
+            self._entries[key] = player_ids
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        "Returns the hit and miss counters"
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+
+def query_cache(index: PlayerIndex) -> QueryCache:
+    "Return the query cache of the index's current payload"
+    return index.derived.setdefault('queries', QueryCache())
+
+
+def run_query(index: PlayerIndex, search_keys: Dict[str, Any]) -> List[str]:
+    """
+    Return the IDs of the players matching the search keys, in payload order.
+
+    The list returned may be shared with later callers, don't modify it.
+    """
+    cache = query_cache(index)
+    key = repr(search_keys)
+    player_ids = cache.get(key)
+    if player_ids is None:
+        player_ids, _ = QueryPlan(index, search_keys).execute()
+        cache.put(key, player_ids)
+    return player_ids
+
+
+def explain_query(index: PlayerIndex, search_keys: Dict[str, Any]) -> str:
+    """
+    Plan and run the search keys, returning a description of the plan and the rows it scanned.
+    """
+    cached = repr(search_keys) in query_cache(index)
+    plan = QueryPlan(index, search_keys)
+    player_ids, rows_scanned = plan.execute()
+    return plan.explain(rows_scanned, len(player_ids), cached)
+
+
+class _Descending:
+    "A sort key ordering in reverse"
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+
+def _order_fields(order_by: Union[str, Sequence[str]]) -> List[Tuple[str, bool]]:
+    "Return the (field, descending) pairs of an order_by"
+    if isinstance(order_by, str):
+        order_by = (order_by,)
+    fields = []
+    for field in order_by:
+        if not isinstance(field, str) or not field.lstrip('-'):
+            raise ValueError(f"Unsupported order_by field: {field!r}")
+        fields.append((field[1:], True) if field.startswith('-') else (field, False))
+    if not fields:
+        raise ValueError("order_by needs at least one field")
+    return fields
+
+
+def order_players(index: PlayerIndex, player_ids: Sequence[str],
+                  order_by: Union[str, Sequence[str]], limit: Optional[int] = None) -> List[str]:
+    """
+    Return player IDs sorted by fields, or only the first limit of them, selected with a
+    heap instead of sorting them all.
+
+    :param order_by: A field or a list of fields, each prefixed with '-' to sort it in
+        descending order, e.g. ['position', '-years_exp']. Players missing a field come
+        after the ones having it, ties keep their order.
+    :raises: ValueError for an empty order_by or values that can't be compared.
+    """
+    fields = _order_fields(order_by)
+    players = index.players_json()
+
+    def key(player_id):
+        data = players[player_id]
+        parts = []
+        for field, descending in fields:
+            value = _field_value(data, field)
+            parts.append(value is None)
+            parts.append(_Descending(value) if descending and value is not None else value)
+        return parts
+
+    try:
+        if limit is not None and limit < len(player_ids):
+            return heapq.nsmallest(limit, player_ids, key=key)
+        return sorted(player_ids, key=key)
+    except TypeError as e:
+        raise ValueError(f"Can't order the players by {order_by}: {e}") from e
+
+
+def select_players(index: PlayerIndex, player_ids: Iterable[str],
+                   fields: Optional[Union[str, Sequence[str]]] = None,
+                   convert_results: bool = True) -> Iterator:
+    """
+    Build the results of a search one player at a time, see `PlayerEndpoint.search_players`.
+
+    :param fields: Only these fields of each player, as a dict holding None for the
+        fields a player doesn't have. team_abbr is the model's team.
+    :param convert_results: Without fields, yield the shared PlayerModels rather than a
+        copy of the raw data including the key it was listed under.
+    """
+    if fields is not None:
+        if isinstance(fields, str):
+            fields = (fields,)
+        get_json = index.get_json
+
+        def project(player_id):
+            data = get_json(player_id)
+            return {field: _field_value(data, field) for field in fields}
+        return map(project, player_ids)
+    if convert_results:
+        return map(index.get, player_ids)
+    # the raw data is copied so callers can't change the shared index
+    players = index.players_json()
+    return map(lambda player_id: dict(players[player_id], key=player_id), player_ids)
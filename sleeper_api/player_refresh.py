@@ -0,0 +1,162 @@
+"""
+This module runs the background refreshes of the stale-while-revalidate player cache.
+
+With `stale_while_revalidate=True`, a `PlayerEndpoint` whose cache has expired keeps
+answering from the expired data while the cache is downloaded again in the background,
+instead of blocking the call that happened to land first. One `PlayerRefresher` is
+shared per cache file and sport, so at most one refresh is in flight however many
+endpoints and threads are reading: a thread for `PlayerEndpoint`, an asyncio task for
+`AsyncPlayerEndpoint`. After a failed refresh the next one waits `retry_interval`, so
+a struggling API isn't hit on every lookup. A refresh returning False was skipped,
+because another process holds the cache lock and is refreshing it; a cancelled refresh
+task is counted as skipped too.
+"""
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from .config import PLAYER_REFRESH_RETRY_INTERVAL
+
+
+class PlayerRefresher:
+    """
+    Single flight background refresh with success and failure counters.
+    """
+    def __init__(self, retry_interval=PLAYER_REFRESH_RETRY_INTERVAL):
+        """
+        :param retry_interval: timedelta to wait after a failed refresh before starting another.
+        """
+        self.retry_interval = retry_interval
+        self._lock = threading.Lock()
+        self._idle = threading.Event()
+        self._idle.set()
+        self.task: Optional[asyncio.Task] = None
+        self.refreshes = 0
+        self.failures = 0
+        self.skipped = 0
+        self.stale_served = 0
+        self.last_success = None
+        self.last_failure = None
+        self.last_error = None
+        self.last_duration = None
+
+    @property
+    def in_progress(self) -> bool:
+        "Whether a refresh is running"
+        return not self._idle.is_set()
+
+    def served_stale(self):
+        "Count a call answered from expired data"
+        with self._lock:
+            self.stale_served += 1
+
+    def _claim(self) -> bool:
+        "Mark a refresh as started unless one is running or a failure is too recent"
+        with self._lock:
+            if not self._idle.is_set():
+                return False
+            if (self.last_failure is not None
+                    and time.time() - self.last_failure < self.retry_interval.total_seconds()):
+                return False
+            self._idle.clear()
+            return True
+
+    def _finished(self, started: float, error: Optional[BaseException], skipped: bool = False):
+        with self._lock:
+            self.last_duration = time.perf_counter() - started
+            if skipped:
+                self.skipped += 1
+            elif error is None:
+                self.refreshes += 1
+                self.last_success = time.time()
+            else:
+                self.failures += 1
+                self.last_failure = time.time()
+                self.last_error = f"{type(error).__name__}: {error}"
+            self._idle.set()
+        if error is not None:
+            print(f"Warning: Background player refresh failed: {error}")
+
+    def start_thread(self, refresh: Callable[[], object]) -> bool:
+        """
+        Run refresh on a daemon thread unless a refresh is already running.
+
+        :return: Whether a refresh was started.
+        """
+        if not self._claim():
+            return False
+
+        def run():
+            started = time.perf_counter()
+            try:
+                result = refresh()
+            except Exception as e:  # pylint: disable=broad-except
+                self._finished(started, e)
+            else:
+                self._finished(started, None, skipped=result is False)
+
+        threading.Thread(target=run, name='sleeper-player-refresh', daemon=True).start()
+        return True
+
+    def start_task(self, refresh: Callable[[], 'asyncio.Future']) -> bool:
+        """
+        Run the coroutine returned by refresh as a task of the running event loop,
+        unless a refresh is already running.
+
+        :return: Whether a refresh was started.
+        """
+        if not self._claim():
+            return False
+
+        async def run():
+            started = time.perf_counter()
+            try:
+                result = await refresh()
+            except asyncio.CancelledError:
+                # e.g. the event loop closed mid refresh, let the next stale read start another
+                self._finished(started, None, skipped=True)
+                raise
+            except Exception as e:  # pylint: disable=broad-except
+                self._finished(started, e)
+            else:
+                self._finished(started, None, skipped=result is False)
+
+        # keep a reference, the event loop only holds tasks weakly
+        self.task = asyncio.get_running_loop().create_task(run())
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        "Wait for a refresh thread to finish, returns False on timeout"
+        return self._idle.wait(timeout)
+
+    def stats(self) -> dict:
+        "Returns the refresh counters"
+        with self._lock:
+            return {
+                'refreshes': self.refreshes,
+                'failures': self.failures,
+                'skipped': self.skipped,
+                'stale_served': self.stale_served,
+                'in_progress': not self._idle.is_set(),
+                'last_success': self.last_success,
+                'last_failure': self.last_failure,
+                'last_error': self.last_error,
+                'last_duration': self.last_duration,
+            }
+
+
+_REFRESHERS: Dict[tuple, PlayerRefresher] = {}
+_REFRESHERS_LOCK = threading.Lock()
+
+
+def player_refresher(cache_file, sport: str = 'nfl') -> PlayerRefresher:
+    """
+    Return the process wide refresher for a player cache file and sport, creating it if needed.
+    """
+    key = (str(cache_file), sport)
+    with _REFRESHERS_LOCK:
+        refresher = _REFRESHERS.get(key)
+        if refresher is None:
+            refresher = _REFRESHERS[key] = PlayerRefresher()
+        return refresher
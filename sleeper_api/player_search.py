@@ -0,0 +1,212 @@
+"""
+This module provides the `NameIndex` class behind `PlayerEndpoint.search_by_name`, a fuzzy
+player name search.
+
+Names are normalized (lowercase, accents and punctuation dropped) and split into
+tokens. Each token is indexed by its trigrams, padded so the start and end of a name
+count, e.g. "mahomes" gives "$ma", "mah", "aho", "hom", "ome", "mes", "es$". A query's
+trigrams are looked up and the players sharing the most of them are ranked:
+
+- by the share of the query's trigrams the name has, so misspelled ("mahomse") and
+  partial ("maho") names still match,
+- then by how many query tokens equal a name token,
+- then by Sleeper's search_rank, so well known players come first among equals,
+- then by how similar the names are overall, shorter names first.
+
+Query tokens of one or two letters, such as the initial in "j jefferson", can't be
+matched by trigrams and must instead start a token of the name, using a sorted token
+list. The index is built from the player index once per payload.
+"""
+import bisect
+import heapq
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .player_index import PlayerIndex
+
+# share of a query's trigrams a name must have to match
+MIN_SCORE = 0.5
+
+_DROPPED = re.compile(r"[.'`’]")
+_SEPARATORS = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(name: str) -> List[str]:
+    "Return the tokens of a name: lowercase ASCII letters and digits"
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode().lower()
+    return _SEPARATORS.sub(' ', _DROPPED.sub('', name)).split()
+
+
+def _trigrams(token: str, pad_end: bool = True) -> List[str]:
+    padded = f"${token}$" if pad_end else f"${token}"
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def _overlap(query_token: str, name_token: str) -> int:
+    return len(set(_trigrams(query_token, pad_end=False)).intersection(_trigrams(name_token)))
+
+
+def _initials_match(name_tokens, long_tokens, short_tokens) -> bool:
+    """
+    Check that every short query token starts a different token of the name than the
+    ones the long query tokens matched, so the "j" of "j jefferson" isn't the j of jefferson.
+    """
+    free = list(name_tokens)
+    for token in long_tokens:
+        if free:
+            free.pop(max(range(len(free)), key=lambda i: _overlap(token, free[i])))
+    for token in short_tokens:
+        for i, name_token in enumerate(free):
+            if name_token.startswith(token):
+                del free[i]
+                break
+        else:
+            return False
+    return True
+
+
+class NameIndex:
+    """
+    Trigram and prefix index of the player names of a `PlayerIndex`.
+
+    Players sharing a name are indexed once, under the name.
+    """
+    def __init__(self, players_json: Dict[str, Dict]):
+        """
+        :param players_json: The `players/{sport}` payload, a dict keyed by player ID.
+        """
+        # per player row
+        self.player_ids = []
+        self.positions = []
+        self.teams = []
+        self.active = []
+        self.ranks = []
+        # per distinct name
+        self.names = []        # tokens of the name
+        self.name_rows = []    # rows of the players having it
+        self.gram_counts = []  # number of distinct trigrams of the name
+        name_ids = {}
+        for player_id, data in players_json.items():
+            name = ' '.join(filter(None, (data.get('first_name'), data.get('last_name'))))
+            tokens = tuple(normalize_name(name))
+            if not tokens:
+                continue
+            row = len(self.player_ids)
+            self.player_ids.append(player_id)
+            self.positions.append(data.get('position'))
+            self.teams.append(data.get('team_abbr') or data.get('team'))
+            self.active.append(data.get('active'))
+            rank = data.get('search_rank')
+            self.ranks.append(rank if isinstance(rank, (int, float)) else float('inf'))
+            name_id = name_ids.get(tokens)
+            if name_id is None:
+                name_id = name_ids[tokens] = len(self.names)
+                self.names.append(tokens)
+                self.name_rows.append([])
+            self.name_rows[name_id].append(row)
+
+        postings = {}
+        prefixes = {}  # token -> name IDs
+        for name_id, tokens in enumerate(self.names):
+            grams = {gram for token in tokens for gram in _trigrams(token)}
+            self.gram_counts.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(name_id)
+            for token in dict.fromkeys(tokens):
+                prefixes.setdefault(token, []).append(name_id)
+        self.postings = postings
+        self.prefix_tokens = sorted(prefixes)
+        self.prefix_names = [prefixes[token] for token in self.prefix_tokens]
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    def _prefix_names(self, prefix: str) -> set:
+        "IDs of the names having a token starting with prefix"
+        start = bisect.bisect_left(self.prefix_tokens, prefix)
+        end = bisect.bisect_left(self.prefix_tokens, prefix + '\x7f')
+        name_ids = set()
+        for token_names in self.prefix_names[start:end]:
+            name_ids.update(token_names)
+        return name_ids
+
+    def search(self, query: str, limit: int = 10,
+               position: Optional[Union[str, Iterable[str]]] = None,
+               team: Optional[Union[str, Iterable[str]]] = None,
+               active: Optional[bool] = None,
+               min_score: float = MIN_SCORE) -> List[Tuple[str, float]]:
+        """
+        Return the best matches of a name query.
+
+        :param query: A full, partial or misspelled name, e.g. "mahomes" or "j jefferson".
+        :param limit: The number of matches to return at most.
+        :param position: Only players at this position, or one of these positions.
+        :param team: Only players of this team, or one of these teams.
+        :param active: Only active (True) or inactive (False) players.
+        :param min_score: Share of the query's trigrams a name must have, from 0 to 1.
+        :return: List of (player ID, score) from the best match, the score is from 0 to 1.
+        """
+        tokens = normalize_name(query)
+        if not tokens or limit <= 0:
+            return []
+        long_tokens = [token for token in tokens if len(token) > 2]
+        short_tokens = [token for token in tokens if len(token) <= 2]
+
+        if long_tokens:
+            # the last token may still be being typed, so its end isn't padded
+            query_grams = set()
+            for i, token in enumerate(long_tokens):
+                query_grams.update(_trigrams(token, pad_end=i < len(long_tokens) - 1))
+            counts = Counter()
+            postings = self.postings
+            for gram in query_grams:
+                name_ids = postings.get(gram)
+                if name_ids:
+                    counts.update(name_ids)
+            total = len(query_grams)
+            needed = min_score * total
+            candidates = [(name_id, shared) for name_id, shared in counts.items()
+                          if shared >= needed]
+        else:
+            total = 0
+            name_ids = None
+            for token in short_tokens:
+                matches = self._prefix_names(token)
+                name_ids = matches if name_ids is None else name_ids & matches
+            candidates = [(name_id, 0) for name_id in name_ids]
+
+        query_tokens = set(tokens)
+        matched = []
+        for name_id, shared in candidates:
+            name = self.names[name_id]
+            if short_tokens and not _initials_match(name, long_tokens, short_tokens):
+                continue
+            coverage = shared / total if total else 1.0
+            exact = len(query_tokens.intersection(name))
+            similarity = 2 * shared / (total + self.gram_counts[name_id]) if total else 0.0
+            matched.append((coverage, exact, similarity, name_id))
+
+        positions = {position} if isinstance(position, str) else (
+            set(position) if position is not None else None)
+        teams = {team} if isinstance(team, str) else set(team) if team is not None else None
+        scored = []
+        for coverage, exact, similarity, name_id in matched:
+            for row in self.name_rows[name_id]:
+                if ((positions is None or self.positions[row] in positions)
+                        and (teams is None or self.teams[row] in teams)
+                        and (active is None or bool(self.active[row]) == active)):
+                    scored.append((coverage, exact, -self.ranks[row], similarity, -row))
+        best = heapq.nlargest(limit, scored)
+        return [(self.player_ids[-match[-1]], round(match[0], 4)) for match in best]
+
+
+def name_index_for(index: PlayerIndex) -> NameIndex:
+    """
+    Return the `NameIndex` of a `PlayerIndex`'s current payload, built once per payload.
+    """
+    names = index.derived.get('names')
+    if names is None:
+        names = index.derived.setdefault('names', NameIndex(index.players_json()))
+    return names
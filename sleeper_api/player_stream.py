@@ -0,0 +1,140 @@
+"""
+This module parses the `players/{sport}` payload incrementally, as its chunks are downloaded.
+
+The payload is one JSON object of about 11,000 players. Decoding it with a single call
+means holding the whole response body, the decoded players and, while writing the cache,
+an encoded copy of it at the same time. `iter_players` instead yields each player as
+soon as its last byte has arrived, both decoded and as the raw JSON it was sent as, so
+the raw bytes can be written to the cache as they are and the decoded data indexed:
+
+    >>> for player_id, data, raw in iter_players(client.iter_chunks('players/nfl')):
+    ...     writer.add(player_id, raw)
+    ...     players[player_id] = data
+
+Only the chunk being parsed and the start of a player cut off at its end are buffered.
+
+The players complete in a chunk are decoded together with one call of the fastest JSON
+decoder, up to the last `}` followed by `,"<key>":{` in the chunk, and encoded again
+compactly for the cache. Such a cut can fall inside a string or a nested object, in
+which case the text doesn't decode, and the players are instead decoded one at a time
+by the standard library's C scanner (`JSONDecoder.raw_decode`), which also finds where
+each one ends and returns its JSON as it was sent.
+"""
+import codecs
+import itertools
+import json
+import re
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+from .decoders import get_decoder
+from .player_cache import get_encoder
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# the end of an object followed by a member whose value is an object, a likely player boundary
+_BOUNDARY = re.compile(r'\}[ \t\n\r]*,[ \t\n\r]*"[^"\\]*"[ \t\n\r]*:[ \t\n\r]*\{')
+_raw_decode = json.JSONDecoder().raw_decode
+
+# parser states: before the opening brace, before the first member or the closing brace,
+# before a member after a comma, before a comma or the closing brace, after the closing brace
+_OPEN, _FIRST, _MEMBER, _NEXT, _CLOSED = range(5)
+
+
+def _last_boundary(buffer: str, start: int, end: int) -> Optional[int]:
+    "Return the position after the '}' of the last `_BOUNDARY` in buffer[start:end], or None"
+    cut = None
+    for match in _BOUNDARY.finditer(buffer, start, end):
+        cut = match.start() + 1
+    return cut
+
+
+def iter_players(chunks: Iterable[bytes], decoder='auto') -> Iterator[Tuple[str, Any, bytes]]:
+    """
+    Parse a JSON object from the chunks of its UTF-8 encoding, yielding its members in order
+    as soon as they are complete.
+
+    :param chunks: Iterable of bytes, split anywhere.
+    :param decoder: JSON decoder for the members complete in a chunk, see `get_decoder`.
+    :return: Generator of (key, decoded value, the value's JSON as bytes) tuples.
+    :raises ValueError: If the chunks don't hold exactly one JSON object.
+    """
+    decode = get_decoder(decoder)
+    encode = get_encoder()
+    decode_text = codecs.getincrementaldecoder('utf-8')().decode
+    buffer = ''
+    position = 0
+    pending = []  # chunks not decoded yet
+    pending_size = 0
+    # parse a cut off member again once this much is buffered, so small chunks don't
+    # make it parse the same member over and over
+    retry_size = 0
+    batch_from = 0  # don't decode in batches before this buffer position, a cut there failed
+    state = _OPEN
+    for chunk in itertools.chain(chunks, (None,)):
+        final = chunk is None
+        if not final:
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if len(buffer) - position + pending_size < retry_size:
+                continue
+        buffer = buffer[position:] + decode_text(b''.join(pending), final)
+        pending = []
+        pending_size = 0
+        batch_from = max(batch_from - position, 0)
+        position = 0
+        size = len(buffer)
+        while True:
+            position = _WHITESPACE.match(buffer, position).end()
+            if position >= size:
+                break
+            char = buffer[position]
+            if state == _CLOSED:
+                raise ValueError(f"Extra data after the players object: {char!r}")
+            if state == _OPEN:
+                if char != '{':
+                    raise ValueError(f"Expected a JSON object, got {char!r}")
+                state = _FIRST
+                position += 1
+            elif state == _NEXT and char == ',':
+                state = _MEMBER
+                position += 1
+            elif char == '}' and state != _MEMBER:
+                state = _CLOSED
+                position += 1
+            elif char == '"' and state != _NEXT:
+                cut = _last_boundary(buffer, max(position, batch_from), size)
+                if cut is not None:
+                    try:
+                        members = decode('{' + buffer[position:cut] + '}')
+                    except ValueError:
+                        batch_from = cut  # not a boundary, go one player at a time past it
+                    else:
+                        for key, value in members.items():
+                            yield key, value, encode(value)
+                        state = _NEXT
+                        position = cut
+                        continue
+                try:
+                    key, end = _raw_decode(buffer, position)
+                    colon = _WHITESPACE.match(buffer, end).end()
+                    if colon >= size:
+                        retry_size = 2 * (size - position)
+                        break
+                    if buffer[colon] != ':':
+                        raise ValueError(f"Expected ':' after {key!r}")
+                    start = _WHITESPACE.match(buffer, colon + 1).end()
+                    value, end = _raw_decode(buffer, start)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    retry_size = 2 * (size - position)
+                    break  # the member is cut off, wait for the next chunk
+                if end >= size and not final:
+                    retry_size = 2 * (size - position)
+                    break  # a number could go on in the next chunk
+                yield key, value, buffer[start:end].encode()
+                state = _NEXT
+                position = end
+            else:
+                raise ValueError(f"Unexpected {char!r} in the players object")
+    if state != _CLOSED:
+        raise ValueError("The players object is truncated")
@@ -0,0 +1,311 @@
+"""
+This module provides the `PlayerTable` class, a columnar view of the player universe
+for analytics, backed by NumPy (``pip install sleeper_fantasy_api[analytics]``).
+
+Numeric fields such as age, years_exp, search_rank and weight become float arrays, with
+NaN for missing values. Text and other scalar fields are dictionary encoded: an integer
+code per player into a list of distinct values, -1 for missing. Columns are built the
+first time they are used. Filters, sorts and top-k selections run vectorized over the
+columns and only produce row numbers; `PlayerModel` objects are built for the final
+rows alone:
+
+    >>> table = players.get_player_table()
+    >>> wrs = table.filter({"position": "WR", "age": {"<": 25}})
+    >>> wrs.top("search_rank", 10, largest=False).to_models()
+"""
+import threading
+from typing import Any, Dict, List
+
+from .exceptions import SleeperAPIError
+from .models.player import PlayerModel
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the optional extra
+    np = None
+
+# fields always stored as numbers, numeric strings such as weight "220" are parsed
+NUMERIC_FIELDS = ('age', 'years_exp', 'search_rank', 'weight', 'height', 'number',
+                  'depth_chart_order')
+
+# operators of `PlayerTable.filter`, the same as `PlayerEndpoint.search_players`
+COMPARISONS = {
+    "==": lambda values, val: values == val,
+    "!=": lambda values, val: values != val,
+    ">": lambda values, val: values > val,
+    "<": lambda values, val: values < val,
+    ">=": lambda values, val: values >= val,
+    "<=": lambda values, val: values <= val,
+    "in": lambda values, val: np.isin(values, list(val)),
+    "not in": lambda values, val: ~np.isin(values, list(val)),
+}
+
+# the same operators applied to single values, used on the distinct values of a categorical column
+SCALAR_COMPARISONS = {
+    "==": lambda value, val: value == val,
+    "!=": lambda value, val: not value == val,
+    ">": lambda value, val: value > val,
+    "<": lambda value, val: value < val,
+    ">=": lambda value, val: value >= val,
+    "<=": lambda value, val: value <= val,
+    "in": lambda value, val: value in val,
+    "not in": lambda value, val: value not in val,
+}
+
+
+def _to_number(value):
+    if value is None or isinstance(value, bool):
+        return np.nan
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    # heights are sometimes given as 6'2"
+    feet, sep, inches = str(value).partition("'")
+    try:
+        return float(feet) * 12 + float(inches.strip('" ') or 0) if sep else np.nan
+    except ValueError:
+        return np.nan
+
+
+class NumericColumn:
+    """
+    A float64 array with NaN for missing values.
+    """
+    kind = 'numeric'
+
+    def __init__(self, values):
+        self.values = values
+        self.present = ~np.isnan(values)
+
+    def compare(self, operator, val):
+        "Return the mask of the rows passing the operator, missing values never do"
+        return COMPARISONS[operator](self.values, val) & self.present
+
+    def sort_keys(self):
+        "Values to sort by, missing values sort last"
+        return self.values
+
+    def decode(self, rows) -> list:
+        "Return the python values of the rows"
+        return [None if np.isnan(value) else value for value in self.values[rows].tolist()]
+
+
+class CategoricalColumn:
+    """
+    Dictionary encoded column, an int32 code per row into `categories`, -1 for missing.
+    """
+    kind = 'categorical'
+
+    def __init__(self, codes, categories):
+        self.codes = codes
+        self.categories = categories
+        self._ranks = None
+
+    def compare(self, operator, val):
+        "Return the mask of the rows passing the operator, missing values never do"
+        # evaluate the operator once per distinct value, then broadcast through the codes
+        passing = np.array([SCALAR_COMPARISONS[operator](category, val)
+                            for category in self.categories] + [False], dtype=bool)
+        return passing[self.codes]  # code -1 picks the trailing False
+
+    def sort_keys(self):
+        "Rank of each row's value among the sorted distinct values, missing values sort last"
+        if self._ranks is None:
+            order = sorted(range(len(self.categories)), key=lambda code: self.categories[code])
+            ranks = np.empty(len(self.categories) + 1, dtype=np.float64)
+            ranks[order] = np.arange(len(order))
+            ranks[-1] = np.nan
+            self._ranks = ranks[self.codes]
+        return self._ranks
+
+    def decode(self, rows) -> list:
+        "Return the python values of the rows"
+        categories = self.categories
+        return [categories[code] if code >= 0 else None for code in self.codes[rows].tolist()]
+
+
+class _Storage:
+    """
+    Columns shared by a table and every view derived from it.
+    """
+    def __init__(self, players_json: Dict[str, Dict], index=None):
+        self.player_ids = np.array(list(players_json), dtype=object)
+        self.records = list(players_json.values())
+        self.index = index
+        self.columns = {}
+        self.lock = threading.Lock()
+
+    def column(self, field: str):
+        column = self.columns.get(field)
+        if column is None:
+            with self.lock:
+                column = self.columns.get(field)
+                if column is None:
+                    column = self.columns[field] = self._build(field)
+        return column
+
+    def _build(self, field):
+        values = [record.get(field) for record in self.records]
+        present = [value for value in values if value is not None]
+        numeric = field in NUMERIC_FIELDS or (
+            present and all(isinstance(value, (int, float)) and not isinstance(value, bool)
+                            for value in present))
+        if numeric:
+            return NumericColumn(np.array([_to_number(value) for value in values],
+                                          dtype=np.float64))
+
+        categories = []
+        lookup = {}
+        codes = np.empty(len(values), dtype=np.int32)
+        for row, value in enumerate(values):
+            if value is None:
+                codes[row] = -1
+                continue
+            if isinstance(value, (list, dict)):
+                raise SleeperAPIError(f"Field {field} holds {type(value).__name__} values "
+                                      f"and can't be used as a column")
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(categories)
+                categories.append(value)
+            codes[row] = code
+        return CategoricalColumn(codes, categories)
+
+
+class PlayerTable:
+    """
+    Columnar, read-only view of a set of players. Filtering and sorting return new views
+    sharing the same columns, nothing is copied until the rows are materialized.
+    """
+    def __init__(self, players_json: Dict[str, Dict], index=None, _storage=None, _rows=None):
+        """
+        :param players_json: The `players/{sport}` payload, a dict keyed by player ID.
+        :param index: Optional `PlayerIndex` whose shared models are returned by `to_models`.
+        """
+        if np is None:
+            raise SleeperAPIError(
+                "numpy is not installed, install sleeper_fantasy_api[analytics] to use it.")
+        self._storage = _storage if _storage is not None else _Storage(players_json, index)
+        self.rows = (_rows if _rows is not None
+                     else np.arange(len(self._storage.records), dtype=np.intp))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __repr__(self):
+        return f"<PlayerTable({len(self)} players)>"
+
+    def _view(self, rows) -> 'PlayerTable':
+        return PlayerTable(None, _storage=self._storage, _rows=rows)
+
+    def column(self, field: str):
+        "Return the `NumericColumn` or `CategoricalColumn` of a field, covering every player"
+        return self._storage.column(field)
+
+    def _mask(self, conditions) -> 'np.ndarray':
+        "Evaluate nested AND/OR search keys to a boolean mask over every player"
+        if not isinstance(conditions, dict):
+            raise ValueError(f"Unsupported conditions format: {conditions}")
+        size = len(self._storage.records)
+        if "AND" in conditions:
+            mask = np.ones(size, dtype=bool)
+            for cond in conditions["AND"]:
+                mask &= self._mask(cond)
+            return mask
+        if "OR" in conditions:
+            mask = np.zeros(size, dtype=bool)
+            for cond in conditions["OR"]:
+                mask |= self._mask(cond)
+            return mask
+
+        mask = np.ones(size, dtype=bool)
+        for field, value in conditions.items():
+            column = self.column(field)
+            operators = value.items() if isinstance(value, dict) else (("==", value),)
+            for operator, val in operators:
+                if operator not in COMPARISONS:
+                    raise ValueError(f"Unsupported operator: {operator}")
+                mask &= column.compare(operator, val)
+        return mask
+
+    def filter(self, search_keys: Dict[str, Any]) -> 'PlayerTable':
+        """
+        Return the players matching the search keys, see `PlayerEndpoint.search_players`.
+        Numeric fields are compared as numbers, so {"weight": {">": 200}} works on the
+        weights Sleeper sends as strings.
+        """
+        return self._view(self.rows[self._mask(search_keys)[self.rows]])
+
+    def between(self, field: str, low=None, high=None) -> 'PlayerTable':
+        "Return the players whose field is within [low, high], either bound may be None"
+        conditions = {}
+        if low is not None:
+            conditions[">="] = low
+        if high is not None:
+            conditions["<="] = high
+        return self.filter({field: conditions}) if conditions else self
+
+    def sort(self, field: str, descending: bool = False) -> 'PlayerTable':
+        """
+        Return the players sorted by a field, players missing the field come last.
+        The sort is stable, ties keep their current order.
+        """
+        keys = self.column(field).sort_keys()[self.rows]
+        missing = np.isnan(keys)
+        if descending:
+            keys = -keys
+        order = np.lexsort((keys, missing))
+        return self._view(self.rows[order])
+
+    def top(self, field: str, k: int, largest: bool = True) -> 'PlayerTable':
+        """
+        Return the k players with the largest (or smallest) values of a field, in order.
+        Players missing the field are never included.
+        """
+        keys = self.column(field).sort_keys()[self.rows]
+        present = ~np.isnan(keys)
+        rows, keys = self.rows[present], keys[present]
+        if largest:
+            keys = -keys
+        if k < len(rows):
+            # only the k best are sorted
+            best = np.argpartition(keys, k)[:k]
+            rows, keys = rows[best], keys[best]
+        return self._view(rows[np.argsort(keys, kind='stable')])
+
+    def head(self, n: int) -> 'PlayerTable':
+        "Return the first n players"
+        return self._view(self.rows[:n])
+
+    def values(self, field: str) -> list:
+        "Return the values of a field for the players, None where missing"
+        return self.column(field).decode(self.rows)
+
+    def player_ids(self) -> List[str]:
+        "Return the IDs of the players"
+        return self._storage.player_ids[self.rows].tolist()
+
+    def to_json(self) -> List[Dict]:
+        "Return the raw data of the players"
+        records = self._storage.records
+        return [records[row] for row in self.rows.tolist()]
+
+    def to_models(self) -> list:
+        "Build the PlayerModels of the players, shared with the index when there is one"
+        index = self._storage.index
+        if index is not None:
+            return index.get_many(self.player_ids())
+        return [PlayerModel.from_dict(record) for record in self.to_json()]
+
+
+def table_for(index) -> PlayerTable:
+    """
+    Return the `PlayerTable` of a `PlayerIndex`'s current payload, built once per payload.
+    """
+    table = index.derived.get('table')
+    if table is None:
+        table = index.derived.setdefault('table', PlayerTable(index.players_json(), index))
+    return table
@@ -0,0 +1,157 @@
+"""
+This module provides token bucket rate limiters that keep a `SleeperClient` under
+Sleeper's request ceiling (roughly 1000 calls per minute).
+
+- `TokenBucket` is shared by every thread using the client.
+- `SqliteTokenBucket` keeps the bucket in a local sqlite file so several worker
+  processes on the same machine share one budget.
+
+Both reserve a token per request and hand back how long the caller has to wait for it,
+so bursts are smoothed out into an even stream at the sustainable rate instead of
+being rejected.
+"""
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .config import RATE_LIMIT_PER_MINUTE
+
+DEFAULT_RATE = RATE_LIMIT_PER_MINUTE / 60
+DEFAULT_CAPACITY = 10
+
+
+class TokenBucket:
+    """
+    Thread safe token bucket.
+
+    :param rate: Tokens added per second, the sustainable request rate.
+    :param capacity: Maximum number of tokens, i.e. the largest burst allowed through at once.
+
+        >>> client = SleeperClient(rate_limiter=TokenBucket(rate=900 / 60))
+        >>> client.rate_limiter.stats()
+        {'acquired': 0, 'waited': 0, 'total_wait': 0.0, 'max_wait': 0.0}
+    """
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: float = DEFAULT_CAPACITY):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.acquired = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _reserve(self, tokens: float) -> float:
+        "Take tokens from the bucket, letting it go negative, and return the wait in seconds"
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Reserve tokens without blocking.
+
+        :return: How many seconds the caller must wait before using the reservation.
+        """
+        wait = self._reserve(tokens)
+        self.record_wait(wait)
+        return wait
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Block until the tokens are available.
+
+        :return: How many seconds were spent waiting.
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def record_wait(self, wait: float):
+        """
+        Update the wait time metrics for one acquisition.
+        """
+        with self._stats_lock:
+            self.acquired += 1
+            if wait > 0:
+                self.waited += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+
+    def stats(self) -> dict:
+        """
+        Return the wait time metrics.
+        """
+        with self._stats_lock:
+            return {
+                'acquired': self.acquired,
+                'waited': self.waited,
+                'total_wait': self.total_wait,
+                'max_wait': self.max_wait,
+            }
+
+
+class SqliteTokenBucket(TokenBucket):
+    """
+    Token bucket stored in a sqlite file so separate processes share the same budget.
+
+    Every process pointing at the same path draws from one bucket. Wait time metrics
+    are still tracked per process.
+
+        >>> limiter = SqliteTokenBucket('/tmp/sleeper_rate_limit.db')
+    """
+    def __init__(self, path, rate: float = DEFAULT_RATE, capacity: float = DEFAULT_CAPACITY,
+                 name: str = 'sleeper'):
+        """
+        :param path: The sqlite database file, created if missing.
+        :param name: Name of the bucket row, so one file can hold several buckets.
+        """
+        super().__init__(rate, capacity)
+        self.path = Path(path)
+        self.name = name
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS token_bucket "
+                "(name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)")
+            conn.execute(
+                "INSERT OR IGNORE INTO token_bucket VALUES (?, ?, ?)",
+                (self.name, capacity, time.time()))
+
+    def _connect(self):
+        "One connection per thread, sqlite connections can't be shared between threads"
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _reserve(self, tokens: float) -> float:
+        conn = self._connect()
+        # BEGIN IMMEDIATE takes the write lock up front so the read-modify-write is atomic
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            stored, updated_at = conn.execute(
+                "SELECT tokens, updated_at FROM token_bucket WHERE name = ?",
+                (self.name,)).fetchone()
+            now = time.time()
+            available = min(self.capacity, stored + max(0.0, now - updated_at) * self.rate)
+            available -= tokens
+            conn.execute(
+                "UPDATE token_bucket SET tokens = ?, updated_at = ? WHERE name = ?",
+                (available, now, self.name))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return max(0.0, -available / self.rate)
@@ -0,0 +1,183 @@
+"""
+This module provides the `RetryPolicy` and `CircuitBreaker` classes used by the clients
+to ride out transient upstream failures.
+
+- `RetryPolicy` retries 5xx responses, 429s and connection errors with jittered
+  exponential backoff, honoring the `Retry-After` header when the server sends one.
+- `CircuitBreaker` stops sending requests once the upstream is clearly down and fails
+  fast with `CircuitOpenError` until a probe request succeeds again.
+"""
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+from .exceptions import CircuitOpenError
+from .utils import endpoint_template
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """
+    Parse a Retry-After header, given either in seconds or as an HTTP date.
+
+    :return: The delay in seconds, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request is retried and how long to wait first.
+
+        >>> client = SleeperClient(retry=RetryPolicy(max_retries=5))
+        >>> client.retry.stats()
+        {'league/{league_id}/rosters': 2}
+    """
+    def __init__(self, max_retries: int = 3, backoff_factor: float = 0.5,
+                 max_backoff: float = 30.0, retry_statuses=RETRY_STATUSES,
+                 respect_retry_after: bool = True, max_retry_after: float = 120.0):
+        """
+        :param max_retries: Number of retries after the first attempt.
+        :param backoff_factor: Base delay, attempt n waits up to backoff_factor * 2 ** n seconds.
+        :param max_backoff: Upper bound of the exponential delay.
+        :param retry_statuses: HTTP status codes worth retrying.
+        :param respect_retry_after: Wait for the server's Retry-After when it is sent.
+        :param max_retry_after: Give up instead of waiting longer than this for a Retry-After.
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_statuses = frozenset(retry_statuses)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self._retries = Counter()
+        self._lock = threading.Lock()
+
+    def is_retryable_status(self, status: int) -> bool:
+        "Returns whether a response with this status should be retried"
+        return status in self.retry_statuses
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Full jitter exponential backoff for the given zero based retry attempt.
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+
+    def next_delay(self, attempt: int, retry_after=None) -> Optional[float]:
+        """
+        Return how long to wait before retrying, or None when no retry should be made.
+
+        :param attempt: The number of retries already made for this request.
+        :param retry_after: The Retry-After header of the failed response, if any.
+        """
+        if attempt >= self.max_retries:
+            return None
+        if self.respect_retry_after:
+            delay = parse_retry_after(retry_after)
+            if delay is not None:
+                return delay if delay <= self.max_retry_after else None
+        return self.backoff(attempt)
+
+    def record_retry(self, endpoint: str):
+        "Count a retry against the endpoint template"
+        with self._lock:
+            self._retries[endpoint_template(endpoint)] += 1
+
+    def stats(self) -> dict:
+        "Returns the number of retries made per endpoint template"
+        with self._lock:
+            return dict(self._retries)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker shared by every request made through a client.
+
+    After `failure_threshold` consecutive failures the breaker opens and requests fail
+    immediately with `CircuitOpenError`. Once `reset_timeout` seconds have passed a single
+    probe request is let through (half open); its success closes the breaker again and
+    its failure re-opens it.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 on_state_change: Optional[Callable[[str, str], None]] = None):
+        """
+        :param failure_threshold: Consecutive failures that open the breaker.
+        :param reset_timeout: Seconds to stay open before letting a probe through.
+        :param on_state_change: Optional callback called with (old_state, new_state).
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_state_change = on_state_change
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.transitions = Counter()
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def _set_state(self, state):
+        "Change state and report it, caller holds the lock"
+        if state == self.state:
+            return
+        old_state, self.state = self.state, state
+        self.transitions[state] += 1
+        if self.on_state_change is not None:
+            self.on_state_change(old_state, state)
+
+    def before_request(self, endpoint: str = ''):
+        """
+        Raise `CircuitOpenError` if the request should not be sent.
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    raise CircuitOpenError(
+                        f"Circuit breaker is open, not sending request to {endpoint}")
+                self._set_state(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    raise CircuitOpenError(
+                        f"Circuit breaker is half open, not sending request to {endpoint}")
+                self._probe_in_flight = True
+
+    def record_success(self):
+        "Record a request that reached a healthy upstream"
+        with self._lock:
+            self.failures = 0
+            self._probe_in_flight = False
+            self._set_state(self.CLOSED)
+
+    def record_failure(self):
+        "Record a request that failed because of the upstream"
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+
+    def stats(self) -> dict:
+        "Returns the current state and how many times each state was entered"
+        with self._lock:
+            return {
+                'state': self.state,
+                'failures': self.failures,
+                'transitions': dict(self.transitions),
+            }
@@ -0,0 +1,17 @@
+"""
+Tools for testing and benchmarking code that uses the Sleeper API without a network:
+a cassette to record and replay responses, and a local stub server.
+"""
+from .cassette import Cassette, RecordingAdapter, ReplayAdapter, interaction_key
+from .stub_server import StubServer
+from .synthetic import make_players, synthetic_response
+
+__all__ = [
+    "Cassette",
+    "RecordingAdapter",
+    "ReplayAdapter",
+    "interaction_key",
+    "StubServer",
+    "make_players",
+    "synthetic_response",
+]
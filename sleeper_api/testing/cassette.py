@@ -0,0 +1,167 @@
+"""
+Record real Sleeper API responses to a cassette file and replay them without a network.
+
+A cassette is a JSON file mapping a request, e.g. 'GET league/123/rosters', to the
+status, content type and body that was received. Record one against the real API:
+
+    >>> cassette = Cassette('tests/cassettes/league.json')
+    >>> client = SleeperClient(transport=RecordingAdapter(cassette))
+    >>> LeagueEndpoint(client).get_league('123')
+
+and replay it later, either in-process or over HTTP from a `StubServer`:
+
+    >>> client = SleeperClient(transport=ReplayAdapter(Cassette('tests/cassettes/league.json')))
+"""
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+CASSETTE_VERSION = 1
+
+
+def interaction_key(method: str, url: str) -> str:
+    """
+    Return the cassette key of a request, independent of the host it was sent to.
+
+    The API version prefix is dropped and query parameters are sorted, so
+    'https://api.sleeper.app/v1/players/nfl/trending/add?limit=5&lookback_hours=24'
+    and 'http://127.0.0.1:8000/players/nfl/trending/add?lookback_hours=24&limit=5'
+    share the key 'GET players/nfl/trending/add?limit=5&lookback_hours=24'.
+    """
+    parts = urlsplit(url)
+    path = '/'.join(segment for segment in parts.path.split('/') if segment)
+    if path == 'v1' or path.startswith('v1/'):
+        path = path[3:]
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {path}" + (f"?{query}" if query else '')
+
+
+class Cassette:
+    """
+    Thread safe store of recorded responses, persisted as JSON.
+    """
+    def __init__(self, path=None):
+        """
+        :param path: The cassette file, loaded if it exists. None keeps it in memory only.
+        """
+        self.path = Path(path) if path else None
+        self.interactions = {}
+        self._lock = threading.Lock()
+        if self.path and self.path.exists():
+            self.load()
+
+    def __len__(self):
+        return len(self.interactions)
+
+    def __contains__(self, key):
+        return key in self.interactions
+
+    def load(self):
+        "Read the interactions from the cassette file"
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        with self._lock:
+            self.interactions = data.get('interactions', {})
+
+    def save(self):
+        "Write the interactions to the cassette file through a temp file"
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {'version': CASSETTE_VERSION, 'interactions': dict(self.interactions)}
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def record(self, key: str, status: int, body: bytes, content_type='application/json'):
+        """
+        Add or replace the response recorded for a key.
+
+        :param key: The key from `interaction_key`.
+        :param status: HTTP status of the response.
+        :param body: The raw response body.
+        :param content_type: The Content-Type header of the response.
+        """
+        with self._lock:
+            self.interactions[key] = {
+                'status': status,
+                'content_type': content_type,
+                'body': body.decode('utf-8'),
+            }
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """
+        Return the recorded response for a key as a dict with 'status', 'content_type'
+        and 'body', or None if nothing was recorded.
+        """
+        with self._lock:
+            return self.interactions.get(key)
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    Transport adapter that sends requests as usual and records every response.
+    The cassette is saved after each response, so an interrupted run keeps what it got.
+    """
+    def __init__(self, cassette: Cassette, **kwargs):
+        """
+        :param cassette: The `Cassette` to record into.
+        :param kwargs: Passed to `HTTPAdapter`, e.g. pool_maxsize.
+        """
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        response = super().send(request, **kwargs)
+        self.cassette.record(interaction_key(request.method, request.url),
+                             response.status_code, response.content,
+                             response.headers.get('Content-Type', 'application/json'))
+        self.cassette.save()
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Transport adapter that answers requests from a cassette and never touches the network.
+    Requests that were not recorded get a 404 response.
+    """
+    def __init__(self, cassette: Cassette):
+        """
+        :param cassette: The `Cassette` to replay.
+        """
+        super().__init__()
+        self.cassette = cassette
+        self.misses = 0
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None,
+             proxies=None):  # pylint: disable=too-many-arguments
+        key = interaction_key(request.method, request.url)
+        interaction = self.cassette.lookup(key)
+        if interaction is None:
+            self.misses += 1
+            interaction = {'status': 404, 'content_type': 'text/plain',
+                           'body': f"No recorded response for {key}"}
+
+        response = requests.Response()
+        response.status_code = interaction['status']
+        response.headers = CaseInsensitiveDict({'Content-Type': interaction['content_type']})
+        response._content = interaction['body'].encode('utf-8')  # pylint: disable=protected-access
+        response._content_consumed = True  # pylint: disable=protected-access  # so iter_content reads _content
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        "Nothing to release"
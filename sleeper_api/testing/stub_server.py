@@ -0,0 +1,216 @@
+"""
+A local HTTP server that stands in for the Sleeper API, for offline tests and load tests.
+
+Every GET is answered from, in order: the fixed `payload` if one was given, the
+`Cassette` if it has a recording of the request, then a deterministic synthetic
+response from `synthetic_response`. Latency, jitter and error injection make it
+possible to exercise the retry, circuit breaker and concurrency features.
+
+    >>> with StubServer(latency=0.02, error_rate=0.1) as server:
+    ...     client = SleeperClient(base_url=server.base_url, retry=RetryPolicy())
+
+It can also be run on its own, to point other load testing tools at it:
+
+    python -m sleeper_api.testing.stub_server --port 8000 --latency 0.05
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .cassette import Cassette, interaction_key
+from .synthetic import synthetic_response
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # listen backlog, read when the server starts listening: the default of 5 drops the
+    # connections of a burst of concurrent clients, which retry them after a second or more
+    request_queue_size = 1024
+
+
+class StubServer:
+    """
+    Serve Sleeper API responses on a local port from a background thread.
+    """
+    def __init__(self, payload=None, latency=0.0, jitter=0.0, cassette=None, synthetic=True,
+                 error_rate=0.0, error_status=503, retry_after=None, seed=0,
+                 player_count=10_000, bandwidth=None, host='127.0.0.1', port=0):
+        """
+        :param payload: Optional JSON payload returned for every request.
+        :param latency: Seconds to wait before answering each request.
+        :param jitter: Up to this many extra seconds are added to the latency at random.
+        :param cassette: Optional `Cassette` whose recordings are replayed.
+        :param synthetic: Generate responses for requests the cassette doesn't have,
+            otherwise they get a 404.
+        :param error_rate: Fraction of requests answered with error_status instead.
+        :param error_status: HTTP status of the injected errors.
+        :param retry_after: Optional Retry-After header sent with the injected errors.
+        :param seed: Seed of the synthetic responses and the error injection.
+        :param player_count: Number of players in a synthetic `players/{sport}` response.
+        :param bandwidth: Bytes per second response bodies are sent at, None for as fast
+            as possible, to see how clients behave on a slow link.
+        :param host: Interface to listen on.
+        :param port: Port to listen on, 0 picks a free one.
+        """
+        self.payload = json.dumps(payload).encode() if payload is not None else None
+        self.latency = latency
+        self.jitter = jitter
+        self.cassette = cassette
+        self.synthetic = synthetic
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.seed = seed
+        self.player_count = player_count
+        self.bandwidth = bandwidth
+        self.address = (host, port)
+        self.requests = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._bodies = {}  # synthetic bodies are expensive to build, keep them per request
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def respond(self, method, path):
+        """
+        Work out the response to a request.
+
+        :param method: HTTP method.
+        :param path: Request path with query string, e.g. '/v1/league/1/rosters'.
+        :return: Tuple of status, headers and body.
+        """
+        with self._lock:
+            self.requests += 1
+            inject_error = self.error_rate and self._rng.random() < self.error_rate
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+            if inject_error:
+                self.errors += 1
+        if delay:
+            time.sleep(delay)
+
+        if inject_error:
+            headers = {'Content-Type': 'text/plain'}
+            if self.retry_after is not None:
+                headers['Retry-After'] = str(self.retry_after)
+            return self.error_status, headers, b'Injected error'
+        if self.payload is not None:
+            return 200, {'Content-Type': 'application/json'}, self.payload
+
+        key = interaction_key(method, path)
+        if self.cassette is not None:
+            interaction = self.cassette.lookup(key)
+            if interaction is not None:
+                return (interaction['status'], {'Content-Type': interaction['content_type']},
+                        interaction['body'].encode('utf-8'))
+
+        body = self._synthetic_body(key) if self.synthetic and method == 'GET' else None
+        if body is None:
+            return 404, {'Content-Type': 'text/plain'}, f"No response for {key}".encode()
+        return 200, {'Content-Type': 'application/json'}, body
+
+    def _synthetic_body(self, key):
+        "Return the encoded synthetic response for a request key, None for unknown endpoints"
+        body = self._bodies.get(key)
+        if body is None:
+            data = synthetic_response(key.split(' ', 1)[1], self.seed, self.player_count)
+            if data is None:
+                return None
+            body = self._bodies.setdefault(key, json.dumps(data).encode())
+        return body
+
+    def stats(self) -> dict:
+        "Returns the number of requests served and errors injected"
+        with self._lock:
+            return {'requests': self.requests, 'errors': self.errors}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Answer every GET with the response worked out by the stub."""
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                "serve the response"
+                status, headers, body = stub.respond('GET', self.path)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if not stub.bandwidth:
+                    self.wfile.write(body)
+                    return
+                chunk_size = max(int(stub.bandwidth / 100), 1)  # 10ms worth at a time
+                for start in range(0, len(body), chunk_size):
+                    self.wfile.write(body[start:start + chunk_size])
+                    time.sleep(chunk_size / stub.bandwidth)
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                "silence the per-request logging"
+
+        return Handler
+
+    @property
+    def base_url(self):
+        "Returns the base url of the running server"
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/v1'
+
+    def start(self):
+        "Start serving in a daemon thread"
+        self._server = _Server(self.address, self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        "Stop the server"
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main():
+    "run a stub server in the foreground"
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the Sleeper API.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--cassette', help="cassette file to replay")
+    parser.add_argument('--no-synthetic', action='store_true',
+                        help="answer requests missing from the cassette with a 404")
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--retry-after', type=float)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--players', type=int, default=10_000)
+    parser.add_argument('--bandwidth', type=float, help="bytes per second, unlimited by default")
+    args = parser.parse_args()
+
+    server = StubServer(latency=args.latency, jitter=args.jitter,
+                        cassette=Cassette(args.cassette) if args.cassette else None,
+                        synthetic=not args.no_synthetic, error_rate=args.error_rate,
+                        error_status=args.error_status, retry_after=args.retry_after,
+                        seed=args.seed, player_count=args.players,
+                        bandwidth=args.bandwidth, host=args.host, port=args.port).start()
+    print(f"Serving the Sleeper API stub at {server.base_url}")
+    try:
+        server._thread.join()  # pylint: disable=protected-access
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
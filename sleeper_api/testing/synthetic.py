@@ -0,0 +1,273 @@
+"""
+Generate synthetic Sleeper API responses shaped like the real ones, for offline tests
+and benchmarks.
+
+`make_players` builds a `players/nfl` payload and `synthetic_response` answers any
+endpoint of the API. Responses are deterministic for a given endpoint and seed.
+"""
+import random
+import zlib
+from urllib.parse import parse_qs
+
+from ..utils import endpoint_template
+
+TEAMS = ['ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL', 'DEN', 'DET', 'GB',
+         'HOU', 'IND', 'JAX', 'KC', 'LAC', 'LAR', 'LV', 'MIA', 'MIN', 'NE', 'NO', 'NYG',
+         'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN', 'WAS', None]
+POSITIONS = ['QB', 'RB', 'WR', 'TE', 'K', 'DEF', 'OL', 'DL', 'LB', 'DB']
+STATUSES = ['Active', 'Inactive', 'Injured Reserve', 'Practice Squad', None]
+INJURIES = [None, None, None, None, 'Questionable', 'Doubtful', 'Out', 'IR']
+FIRST_NAMES = ['Patrick', 'Justin', 'Josh', 'Travis', 'Tyreek', 'Davante', 'Christian',
+               'Derrick', 'Cooper', 'Stefon', 'Aaron', 'Tom', 'Lamar', 'Jalen', 'Saquon']
+LAST_NAMES = ['Mahomes', 'Jefferson', 'Allen', 'Kelce', 'Hill', 'Adams', 'McCaffrey', 'Henry',
+              'Kupp', 'Diggs', 'Rodgers', 'Brady', 'Jackson', 'Hurts', 'Barkley', 'Smith']
+
+
+def make_player(player_id: str, rng: random.Random) -> dict:
+    "Build one player record with the fields the Sleeper API returns"
+    first_name = rng.choice(FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES)
+    position = rng.choice(POSITIONS)
+    age = rng.randint(21, 40)
+    return {
+        "player_id": player_id,
+        "first_name": first_name,
+        "last_name": last_name,
+        "full_name": f"{first_name} {last_name}",
+        "search_first_name": first_name.lower(),
+        "search_last_name": last_name.lower(),
+        "search_full_name": f"{first_name}{last_name}".lower(),
+        "position": position,
+        "fantasy_positions": [position],
+        "team": rng.choice(TEAMS),
+        "status": rng.choice(STATUSES),
+        "active": rng.random() < 0.7,
+        "sport": "nfl",
+        "age": age,
+        "years_exp": max(0, age - 22 - rng.randint(0, 2)),
+        "college": rng.choice(['Alabama', 'Ohio State', 'LSU', 'Georgia', 'Texas Tech', None]),
+        "height": str(rng.randint(68, 80)),
+        "weight": str(rng.randint(170, 330)),
+        "number": rng.randint(1, 99),
+        "depth_chart_position": position,
+        "depth_chart_order": rng.randint(1, 4),
+        "injury_status": rng.choice(INJURIES),
+        "injury_body_part": None,
+        "injury_start_date": None,
+        "injury_notes": None,
+        "practice_participation": None,
+        "news_updated": rng.randint(1_500_000_000_000, 1_700_000_000_000),
+        "search_rank": rng.randint(1, 9_999_999),
+        "birth_date": f"{2024 - age}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}",
+        "birth_country": None,
+        "high_school": None,
+        "hashtag": f"#{first_name}{last_name}-NFL-{position}-{rng.randint(1, 99)}".lower(),
+        "espn_id": rng.randint(1, 5_000_000),
+        "yahoo_id": rng.randint(1, 40_000),
+        "rotowire_id": rng.randint(1, 20_000),
+        "rotoworld_id": None,
+        "sportradar_id": f"{rng.getrandbits(128):032x}",
+        "stats_id": rng.randint(1, 1_000_000),
+        "fantasy_data_id": rng.randint(1, 25_000),
+        "gsis_id": None,
+        "pandascore_id": None,
+        "swish_id": rng.randint(1, 1_200_000),
+        "oddsjam_id": None,
+        "opta_id": None,
+        "metadata": {"channel_id": str(rng.getrandbits(60))},
+    }
+
+
+def make_players(count: int = 10_000, seed: int = 0) -> dict:
+    "Build a payload of count players keyed by player_id, like players/nfl"
+    rng = random.Random(seed)
+    return {str(i): make_player(str(i), rng) for i in range(1, count + 1)}
+
+
+ROSTER_POSITIONS = ['QB', 'RB', 'RB', 'WR', 'WR', 'TE', 'FLEX', 'K', 'DEF', 'BN', 'BN', 'BN']
+
+
+def _user(user_id: str) -> dict:
+    return {
+        "user_id": user_id,
+        "username": f"user{user_id}",
+        "display_name": f"User {user_id}",
+        "avatar": f"{zlib.crc32(user_id.encode()):08x}",
+    }
+
+
+def _league(league_id: str, season: str = '2023', total_rosters: int = 12) -> dict:
+    return {
+        "league_id": league_id,
+        "name": f"League {league_id}",
+        "status": "complete",
+        "sport": "nfl",
+        "season": season,
+        "season_type": "regular",
+        "total_rosters": total_rosters,
+        "roster_positions": ROSTER_POSITIONS,
+        "settings": {"playoff_teams": 6, "num_teams": total_rosters},
+        "scoring_settings": {"pass_td": 4.0, "rush_td": 6.0, "rec": 1.0},
+        "draft_id": f"{league_id}0",
+        "avatar": None,
+    }
+
+
+def _draft(draft_id: str, league_id: str = '1', season: str = '2023') -> dict:
+    return {
+        "draft_id": draft_id,
+        "league_id": league_id,
+        "season": season,
+        "status": "complete",
+        "type": "snake",
+        "draft_order": {str(user_id): user_id for user_id in range(1, 13)},
+    }
+
+
+def _roster_players(rng: random.Random, count: int = 15) -> list:
+    return [str(rng.randint(1, 10_000)) for _ in range(count)]
+
+
+def _rosters(league_id: str, rng: random.Random) -> list:
+    rosters = []
+    for roster_id in range(1, 13):
+        players = _roster_players(rng)
+        rosters.append({
+            "roster_id": roster_id,
+            "owner_id": str(roster_id),
+            "league_id": league_id,
+            "starters": players[:9],
+            "players": players,
+            "reserve": [],
+            "settings": {"wins": rng.randint(0, 14), "losses": rng.randint(0, 14), "fpts": 1500},
+        })
+    return rosters
+
+
+def _matchups(rng: random.Random) -> list:
+    matchups = []
+    for roster_id in range(1, 13):
+        players = _roster_players(rng)
+        matchups.append({
+            "roster_id": roster_id,
+            "matchup_id": (roster_id + 1) // 2,
+            "starters": players[:9],
+            "players": players,
+            "points": round(rng.uniform(60, 180), 2),
+            "custom_points": None,
+        })
+    return matchups
+
+
+def _bracket() -> list:
+    return [
+        {"r": 1, "m": 1, "t1": 3, "t2": 6, "w": 3, "l": 6},
+        {"r": 1, "m": 2, "t1": 4, "t2": 5, "w": 5, "l": 4},
+        {"r": 2, "m": 3, "t1": 1, "t2": 3, "t2_from": {"w": 1}, "w": 1, "l": 3},
+        {"r": 2, "m": 4, "t1": 2, "t2": 5, "t2_from": {"w": 2}, "w": 2, "l": 5},
+        {"r": 3, "m": 5, "t1": 1, "t2": 2, "t1_from": {"w": 3}, "t2_from": {"w": 4},
+         "w": 1, "l": 2, "p": 1},
+    ]
+
+
+def _traded_picks(rng: random.Random) -> list:
+    return [{
+        "season": "2024",
+        "round": rng.randint(1, 4),
+        "roster_id": rng.randint(1, 12),
+        "previous_owner_id": rng.randint(1, 12),
+        "owner_id": rng.randint(1, 12),
+    } for _ in range(rng.randint(0, 6))]
+
+
+def _transactions(rng: random.Random, week: int) -> list:
+    transactions = []
+    for _ in range(rng.randint(0, 10)):
+        roster_id = rng.randint(1, 12)
+        transactions.append({
+            "type": rng.choice(['waiver', 'free_agent', 'trade']),
+            "transaction_id": str(rng.getrandbits(60)),
+            "status_updated": rng.randint(1_690_000_000_000, 1_700_000_000_000),
+            "status": "complete",
+            "roster_ids": [roster_id],
+            "leg": week,
+            "creator": str(roster_id),
+            "created": rng.randint(1_690_000_000_000, 1_700_000_000_000),
+            "consenter_ids": [roster_id],
+            "adds": {str(rng.randint(1, 10_000)): roster_id},
+            "drops": None,
+            "draft_picks": [],
+            "waiver_budget": [],
+        })
+    return transactions
+
+
+def _picks(draft_id: str, rng: random.Random) -> list:
+    picks = []
+    for pick_no in range(1, 12 * 15 + 1):
+        player = make_player(str(rng.randint(1, 10_000)), rng)
+        picks.append({
+            "player_id": player["player_id"],
+            "picked_by": str((pick_no - 1) % 12 + 1),
+            "roster_id": str((pick_no - 1) % 12 + 1),
+            "round": (pick_no - 1) // 12 + 1,
+            "draft_slot": (pick_no - 1) % 12 + 1,
+            "pick_no": pick_no,
+            "is_keeper": None,
+            "draft_id": draft_id,
+            "metadata": {key: str(player[key]) if player[key] is not None else ""
+                         for key in ("team", "status", "sport", "position", "player_id",
+                                     "number", "news_updated", "last_name",
+                                     "injury_status", "first_name")},
+        })
+    return picks
+
+
+def _trending(rng: random.Random, limit: int) -> list:
+    player_ids = rng.sample(range(1, 10_001), limit)
+    counts = sorted((rng.randint(1, 50_000) for _ in player_ids), reverse=True)
+    return [{"player_id": str(player_id), "count": count}
+            for player_id, count in zip(player_ids, counts)]
+
+
+def synthetic_response(endpoint: str, seed: int = 0, player_count: int = 10_000):
+    """
+    Return a synthetic decoded response for any Sleeper API endpoint.
+
+    :param endpoint: API endpoint with optional query string, e.g. 'league/123/rosters'.
+    :param seed: Changes the generated values while keeping them deterministic.
+    :param player_count: Number of players in a `players/{sport}` response.
+    :return: The response, or None for an unknown endpoint (the real API answers null).
+    """
+    path, _, query = endpoint.partition('?')
+    parts = path.strip('/').split('/')
+    template = endpoint_template(path)
+    rng = random.Random(zlib.crc32(f'{seed}:{path}'.encode()))
+    params = {key: values[0] for key, values in parse_qs(query).items()}
+
+    generators = {
+        "user/{user_id}": lambda: _user(parts[1]),
+        "user/{user_id}/leagues/{sport}/{season}": lambda: [
+            _league(f"{parts[1]}{i}", parts[4]) for i in range(1, rng.randint(2, 5))],
+        "user/{user_id}/drafts/{sport}/{season}": lambda: [
+            _draft(f"{parts[1]}{i}0", f"{parts[1]}{i}", parts[4]) for i in range(1, 3)],
+        "league/{league_id}": lambda: _league(parts[1]),
+        "league/{league_id}/rosters": lambda: _rosters(parts[1], rng),
+        "league/{league_id}/users": lambda: [_user(str(user_id)) for user_id in range(1, 13)],
+        "league/{league_id}/matchups/{week}": lambda: _matchups(rng),
+        "league/{league_id}/winners_bracket": _bracket,
+        "league/{league_id}/losers_bracket": _bracket,
+        "league/{league_id}/transactions/{round}": lambda: _transactions(rng, int(parts[3])),
+        "league/{league_id}/traded_picks": lambda: _traded_picks(rng),
+        "league/{league_id}/drafts": lambda: [_draft(f"{parts[1]}0", parts[1])],
+        "state/{sport}": lambda: {"week": 10, "season": "2023", "season_type": "regular",
+                                  "display_week": 10, "leg": 10},
+        "draft/{draft_id}": lambda: _draft(parts[1]),
+        "draft/{draft_id}/picks": lambda: _picks(parts[1], rng),
+        "draft/{draft_id}/traded_picks": lambda: _traded_picks(rng),
+        "players/{sport}": lambda: make_players(player_count, seed),
+        "players/{sport}/trending/{trend_type}": lambda: _trending(
+            rng, min(int(params.get('limit', 25)), player_count)),
+    }
+    generator = generators.get(template)
+    return generator() if generator is not None else None
@@ -1 +1,53 @@
-# add any helper functions that can be used across classes
\ No newline at end of file
+# add any helper functions that can be used across classes
+from typing import List, Tuple
+from urllib.parse import urlencode
+
+# every route of the Sleeper API, used to group requests by endpoint for metrics
+ENDPOINT_TEMPLATES = [
+    "user/{user_id}",
+    "user/{user_id}/leagues/{sport}/{season}",
+    "user/{user_id}/drafts/{sport}/{season}",
+    "league/{league_id}",
+    "league/{league_id}/rosters",
+    "league/{league_id}/users",
+    "league/{league_id}/matchups/{week}",
+    "league/{league_id}/winners_bracket",
+    "league/{league_id}/losers_bracket",
+    "league/{league_id}/transactions/{round}",
+    "league/{league_id}/traded_picks",
+    "league/{league_id}/drafts",
+    "state/{sport}",
+    "draft/{draft_id}",
+    "draft/{draft_id}/picks",
+    "draft/{draft_id}/traded_picks",
+    "players/{sport}",
+    "players/{sport}/trending/{trend_type}",
+]
+
+def _split_template(template: str) -> List[Tuple[str, bool]]:
+    return [(part, part.startswith('{')) for part in template.split('/')]
+
+_SPLIT_TEMPLATES = [(template, _split_template(template)) for template in ENDPOINT_TEMPLATES]
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    Return the route template of an endpoint, e.g. 'league/123/rosters' -> 'league/{league_id}/rosters'.
+
+    Endpoints that match no known route keep their literal segments with numeric IDs
+    replaced by '{id}', so the result stays low cardinality.
+    """
+    parts = endpoint.split('?', 1)[0].strip('/').split('/')
+    for template, template_parts in _SPLIT_TEMPLATES:
+        if len(template_parts) == len(parts) and all(
+                is_param or part == literal
+                for part, (literal, is_param) in zip(parts, template_parts)):
+            return template
+    return '/'.join('{id}' if part.isdigit() else part for part in parts)
+
+def request_key(method: str, url: str, params=None) -> str:
+    """
+    Build a key identifying a request by its method, URL and sorted params.
+    """
+    if params:
+        url = f"{url}?{urlencode(sorted(params.items()))}"
+    return f"{method} {url}"
@@ -0,0 +1,63 @@
+"""
+The search keys evaluator `PlayerEndpoint.search_players` used before searches were
+compiled into query plans (`sleeper_api.player_query`), a record at a time. Kept as
+the reference the planner's results are checked against, by the tests and benchmarks.
+"""
+
+
+def safe_search_type(record, key, value):
+    """
+    Check a single search key against a player record, as `search_players` did.
+    """
+    record_value = record.get(key)
+
+    if record_value is None:
+        return False  # Skip records where the value is None
+
+    if isinstance(value, dict):
+        for operator, val in value.items():
+            if operator == "==":
+                if record_value != val:
+                    return False
+            elif operator == "!=":
+                if record_value == val:
+                    return False
+            elif operator == ">":
+                if not (record_value > val):
+                    return False
+            elif operator == "<":
+                if not (record_value < val):
+                    return False
+            elif operator == ">=":
+                if not (record_value >= val):
+                    return False
+            elif operator == "<=":
+                if not (record_value <= val):
+                    return False
+            elif operator == "in":
+                if record_value not in val:
+                    return False
+            elif operator == "not in":
+                if record_value in val:
+                    return False
+            else:
+                raise ValueError(f"Unsupported operator: {operator}")
+        return True
+    else:
+        return record_value == value
+
+
+# Recursive function to handle AND/OR logic
+def evaluate_conditions(record, conditions):
+    """
+    Check a player record against nested AND/OR search keys.
+    """
+    if isinstance(conditions, dict):
+        if "AND" in conditions:
+            return all(evaluate_conditions(record, cond) for cond in conditions["AND"])
+        elif "OR" in conditions:
+            return any(evaluate_conditions(record, cond) for cond in conditions["OR"])
+        else:
+            return all(safe_search_type(record, k, v) for k, v in conditions.items())
+    else:
+        raise ValueError(f"Unsupported conditions format: {conditions}")
@@ -0,0 +1,179 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch, Mock
+import requests
+from sleeper_api.async_client import AsyncSleeperClient
+from sleeper_api.cache import ResponseCache
+from sleeper_api.exceptions import SleeperAPIError
+from sleeper_api.rate_limit import SqliteTokenBucket
+from sleeper_api.retry import CircuitBreaker, RetryPolicy
+
+class TestAsyncSleeperClient(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        # the threaded transport is always available, aiohttp is an optional extra
+        self.client = AsyncSleeperClient(use_aiohttp=False)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    @patch('sleeper_api.async_client.requests.Session.request')
+    async def test_get_request_success(self, mock_request):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = b'{"key": "value"}'
+        mock_request.return_value = mock_response
+
+        response = await self.client.get('some-endpoint')
+
+        self.assertEqual(response, {"key": "value"})
+        mock_request.assert_called_with(
+            method='GET',
+            url=self.client.base_url + '/some-endpoint',
+            params=None,
+            json=None,
+            timeout=self.client.timeout
+        )
+
+    @patch('sleeper_api.async_client.requests.Session.request')
+    async def test_get_request_failure(self, mock_request):
+        mock_response = Mock()
+        mock_response.status_code = 404
+        mock_response.content = b'Not Found'
+        mock_request.return_value = mock_response
+
+        with self.assertRaises(SleeperAPIError) as context:
+            await self.client.get('invalid-endpoint')
+
+        self.assertIn("Error 404", str(context.exception))
+
+    @patch('sleeper_api.async_client.requests.Session.request')
+    async def test_concurrent_requests(self, mock_request):
+        def respond(**kwargs):
+            response = Mock()
+            response.status_code = 200
+            response.content = ('"' + kwargs['url'].rsplit('/', 1)[-1] + '"').encode()
+            return response
+        mock_request.side_effect = respond
+
+        results = await asyncio.gather(*(self.client.get(f'league/{i}') for i in range(50)))
+
+        self.assertEqual(results, [str(i) for i in range(50)])
+        self.assertEqual(mock_request.call_count, 50)
+
+    @patch('sleeper_api.async_client.asyncio.sleep')
+    @patch('sleeper_api.async_client.requests.Session.request')
+    async def test_retries_transient_errors(self, mock_request, mock_sleep):
+        unavailable = Mock(status_code=503, content=b'unavailable', headers={})
+        success = Mock(status_code=200, content=b'[]', headers={})
+        mock_request.side_effect = [unavailable, success]
+        self.client.retry = RetryPolicy()
+
+        self.assertEqual(await self.client.get('league/1/rosters'), [])
+        self.assertEqual(mock_sleep.await_count, 1)
+        self.assertEqual(self.client.retry.stats(), {'league/{league_id}/rosters': 1})
+
+    @patch('sleeper_api.async_client.requests.Session.request')
+    async def test_probe_failing_with_other_request_errors_ends_the_probe(self, mock_request):
+        breaker = self.client.circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        mock_request.side_effect = requests.exceptions.TooManyRedirects('loop')
+
+        with self.assertRaises(SleeperAPIError):
+            await self.client.get('league/1')
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        mock_request.side_effect = None
+        mock_request.return_value = Mock(status_code=200, content=b'[]', headers={})
+        self.assertEqual(await self.client.get('league/1'), [])
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    async def test_cancelled_probe_ends_the_probe(self):
+        breaker = self.client.circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def hang(*args):
+            started.set()
+            await release.wait()
+
+        with patch.object(self.client, '_send_once', side_effect=hang):
+            probe = asyncio.create_task(self.client.get('league/1'))
+            await started.wait()
+            probe.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await probe
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        # the next request is let through as a new probe instead of being refused
+        with patch.object(self.client, '_send_once', return_value=(200, {}, b'[]')):
+            self.assertEqual(await self.client.get('league/1'), [])
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    @patch('sleeper_api.async_client.requests.Session.request')
+    async def test_disk_cache_runs_off_the_event_loop(self, mock_request):
+        mock_request.return_value = Mock(status_code=200, content=b'{"user_id": "1"}', headers={})
+        loop_thread = threading.get_ident()
+        threads = []
+
+        with tempfile.TemporaryDirectory() as disk_dir:
+            cache = self.client.cache = ResponseCache(default_ttl=60, disk_dir=disk_dir)
+            for name in ('get', 'set'):
+                method = getattr(cache, name)
+
+                def record(*args, method=method):
+                    threads.append(threading.get_ident())
+                    return method(*args)
+                setattr(cache, name, record)
+
+            self.assertEqual(await self.client.get('user/1'), {"user_id": "1"})
+            self.assertEqual(await self.client.get('user/1'), {"user_id": "1"})
+
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(len(threads), 3)
+        self.assertNotIn(loop_thread, threads)
+
+    @patch('sleeper_api.async_client.requests.Session.request')
+    async def test_sqlite_rate_limiter_runs_off_the_event_loop(self, mock_request):
+        mock_request.return_value = Mock(status_code=200, content=b'[]', headers={})
+        loop_thread = threading.get_ident()
+        threads = []
+
+        with tempfile.TemporaryDirectory() as tmp:
+            limiter = self.client.rate_limiter = SqliteTokenBucket(os.path.join(tmp, 'bucket.db'))
+            reserve = limiter.reserve
+
+            def record(*args):
+                threads.append(threading.get_ident())
+                return reserve(*args)
+            limiter.reserve = record
+
+            self.assertEqual(await self.client.get('league/1'), [])
+            await self.client.close()
+
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], loop_thread)
+
+    @patch('sleeper_api.async_client.requests.Session.request')
+    async def test_get_many(self, mock_request):
+        def respond(**kwargs):
+            if kwargs['url'].endswith('/bad'):
+                return Mock(status_code=404, content=b'Not Found', headers={})
+            return Mock(status_code=200, content=b'"ok"', headers={})
+        mock_request.side_effect = respond
+
+        results = await self.client.get_many(['good', 'bad', 'good'], return_exceptions=True)
+
+        self.assertEqual(results[0], 'ok')
+        self.assertIsInstance(results[1], SleeperAPIError)
+        self.assertEqual(results[2], 'ok')
+
+    async def test_invalid_json(self):
+        with self.assertRaises(SleeperAPIError):
+            self.client._handle_response(200, b'not json')
+
+if __name__ == '__main__':
+    unittest.main()
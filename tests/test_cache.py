@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from sleeper_api.cache import ResponseCache, completed_draft_ttl
+
+class TestResponseCache(unittest.TestCase):
+
+    def test_ttl_policies(self):
+        cache = ResponseCache()
+        self.assertEqual(cache.ttl_for('league/123/rosters'), 300)
+        self.assertEqual(cache.ttl_for('players/nfl/trending/add?lookback_hours=24&limit=25'), 30)
+        self.assertEqual(cache.ttl_for('players/nfl'), 0)
+        self.assertIsNone(cache.ttl_for('draft/1', {"status": "complete"}))
+        self.assertEqual(cache.ttl_for('draft/1', {"status": "drafting"}), 30)
+        self.assertEqual(cache.ttl_for('unknown/endpoint'), 0)
+
+    def test_completed_draft_ttl(self):
+        self.assertIsNone(completed_draft_ttl({"status": "complete"}))
+        self.assertEqual(completed_draft_ttl(None), 30)
+
+    def test_hit_and_miss_counters(self):
+        cache = ResponseCache()
+        key = cache.make_key('GET', 'url/league/1')
+        self.assertIsNone(cache.get(key))
+        cache.set(key, 'league/1', b'{"a": 1}')
+        self.assertEqual(cache.get(key), b'{"a": 1}')
+
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['size_bytes'], 8)
+
+    def test_expired_entries_are_misses(self):
+        cache = ResponseCache(ttl_policies=[("league/*", 10)])
+        with patch('sleeper_api.cache.time.time', return_value=1000):
+            cache.set('k', 'league/1', b'1')
+        with patch('sleeper_api.cache.time.time', return_value=1011):
+            self.assertIsNone(cache.get('k'))
+        self.assertEqual(cache.stats()['entries'], 0)
+
+    def test_lru_size_eviction(self):
+        cache = ResponseCache(max_bytes=10, default_ttl=60)
+        cache.set('a', 'x', b'12345')
+        cache.set('b', 'x', b'12345')
+        cache.get('a')  # a is now the most recently used
+        cache.set('c', 'x', b'12345')
+
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_disk_tier(self):
+        with tempfile.TemporaryDirectory() as disk_dir:
+            ResponseCache(default_ttl=None, disk_dir=disk_dir).set('k', 'x', b'[1, 2]')
+
+            # a fresh cache, like one in another process, reads the disk tier
+            cache = ResponseCache(default_ttl=None, disk_dir=disk_dir)
+            self.assertEqual(cache.get('k'), b'[1, 2]')
+            self.assertEqual(cache.stats()['disk_hits'], 1)
+            self.assertEqual(cache.stats()['entries'], 1)
+
+    def test_corrupt_disk_entry_is_a_miss(self):
+        with tempfile.TemporaryDirectory() as disk_dir:
+            cache = ResponseCache(default_ttl=None, disk_dir=disk_dir)
+            path = cache._disk_path('k')
+            path.write_bytes(b'{"truncated')
+
+            self.assertIsNone(cache.get('k'))
+            self.assertEqual(cache.stats()['misses'], 1)
+            self.assertFalse(path.exists())
+
+    def test_failed_disk_write_removes_the_temp_file(self):
+        with tempfile.TemporaryDirectory() as disk_dir:
+            cache = ResponseCache(default_ttl=None, disk_dir=disk_dir)
+            with patch('sleeper_api.cache.os.replace', side_effect=OSError('disk full')), \
+                    patch('builtins.print'):
+                cache.set('k', 'x', b'[1, 2]')
+            self.assertEqual(os.listdir(disk_dir), [])
+            self.assertEqual(cache.get('k'), b'[1, 2]')  # still in the memory tier
+
+    def test_params_are_part_of_the_key(self):
+        self.assertEqual(ResponseCache.make_key('GET', 'u', {'b': 1, 'a': 2}),
+                         ResponseCache.make_key('GET', 'u', {'a': 2, 'b': 1}))
+        self.assertNotEqual(ResponseCache.make_key('GET', 'u', {'a': 1}),
+                            ResponseCache.make_key('GET', 'u'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import unittest
+from sleeper_api.client import SleeperClient
+from sleeper_api.endpoints import LeagueEndpoint
+from sleeper_api.exceptions import SleeperAPIError
+from sleeper_api.testing import Cassette, RecordingAdapter, ReplayAdapter, StubServer, interaction_key
+
+class TestInteractionKey(unittest.TestCase):
+
+    def test_key_ignores_host_version_and_param_order(self):
+        self.assertEqual(
+            interaction_key('get', 'https://api.sleeper.app/v1/players/nfl/trending/add?limit=5&lookback_hours=24'),
+            interaction_key('GET', 'http://127.0.0.1:8000/players/nfl/trending/add?lookback_hours=24&limit=5'))
+        self.assertEqual(interaction_key('GET', 'http://localhost/v1/league/1/rosters'),
+                         'GET league/1/rosters')
+
+class TestCassette(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'cassettes', 'league.json')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_record_then_replay_offline(self):
+        with StubServer() as server:
+            client = SleeperClient(base_url=server.base_url,
+                                   transport=RecordingAdapter(Cassette(self.path)))
+            recorded = LeagueEndpoint(client).get_rosters('123', convert_results=False)
+            self.assertEqual(server.stats()['requests'], 1)
+
+        cassette = Cassette(self.path)
+        self.assertIn('GET league/123/rosters', cassette)
+
+        client = SleeperClient(transport=ReplayAdapter(cassette))
+        replayed = LeagueEndpoint(client).get_rosters('123', convert_results=False)
+        self.assertEqual(replayed, recorded)
+        self.assertEqual(json.loads(b''.join(client.iter_chunks('league/123/rosters', chunk_size=10))),
+                         recorded)
+
+    def test_replay_miss_is_a_404(self):
+        adapter = ReplayAdapter(Cassette())
+        client = SleeperClient(transport=adapter)
+        with self.assertRaises(SleeperAPIError) as ctx:
+            client.get('league/1')
+        self.assertIn('404', str(ctx.exception))
+        self.assertEqual(adapter.misses, 1)
+
+    def test_stub_server_replays_cassette(self):
+        cassette = Cassette(self.path)
+        cassette.record('GET league/7', 200, b'{"league_id": "7", "name": "Recorded"}')
+        cassette.save()
+
+        with StubServer(cassette=Cassette(self.path), synthetic=False) as server:
+            client = SleeperClient(base_url=server.base_url)
+            self.assertEqual(client.get('league/7')['name'], 'Recorded')
+            with self.assertRaises(SleeperAPIError):
+                client.get('league/8')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import patch, Mock
 from sleeper_api.client import SleeperClient
+from sleeper_api.cache import ResponseCache
 from sleeper_api.exceptions import SleeperAPIError
 
 class TestSleeperClient(unittest.TestCase):
@@ -13,7 +14,7 @@ class TestSleeperClient(unittest.TestCase):
         # Mock a successful API response
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"key": "value"}
+        mock_response.content = b'{"key": "value"}'
         mock_request.return_value = mock_response
 
         # Call the client.get method
@@ -56,5 +57,79 @@ class TestSleeperClient(unittest.TestCase):
             timeout=self.client.timeout
         )
 
+    @patch('sleeper_api.client.requests.Session.request')
+    def test_get_request_cached(self, mock_request):
+        mock_response = Mock()
+        mock_response.ok = True
+        mock_response.content = b'{"league_id": "1"}'
+        mock_request.return_value = mock_response
+        client = SleeperClient(cache=ResponseCache())
+
+        first = client.get('league/1')
+        first['name'] = 'mutated by the caller'
+        second = client.get('league/1')
+
+        self.assertEqual(second, {"league_id": "1"})
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(client.cache.stats()['hits'], 1)
+
+    @patch('sleeper_api.client.requests.Session.request')
+    def test_get_many_keeps_order(self, mock_request):
+        def respond(**kwargs):
+            week = int(kwargs['url'].rsplit('/', 1)[-1])
+            return Mock(ok=True, content=str(week).encode())
+        mock_request.side_effect = respond
+
+        endpoints = [f'league/1/matchups/{week}' for week in range(1, 19)]
+        results = self.client.get_many(endpoints, max_workers=4)
+
+        self.assertEqual(results, list(range(1, 19)))
+        self.assertEqual(mock_request.call_count, 18)
+
+    @patch('sleeper_api.client.requests.Session.request')
+    def test_get_many_errors(self, mock_request):
+        def respond(**kwargs):
+            if kwargs['url'].endswith('/bad'):
+                return Mock(ok=False, status_code=404, text='Not Found')
+            return Mock(ok=True, content=b'"ok"')
+        mock_request.side_effect = respond
+
+        results = self.client.get_many(['good', 'bad', ('good', {'a': 1})], return_exceptions=True)
+        self.assertEqual(results[0], 'ok')
+        self.assertIsInstance(results[1], SleeperAPIError)
+        self.assertEqual(results[2], 'ok')
+
+        with self.assertRaises(SleeperAPIError):
+            self.client.get_many(['good', 'bad'])
+
+    @patch('sleeper_api.client.requests.Session.request')
+    def test_iter_many_yields_every_index(self, mock_request):
+        mock_request.return_value = Mock(ok=True, content=b'{}')
+
+        indexes = [index for index, _ in self.client.iter_many(['a', 'b', 'c'])]
+
+        self.assertEqual(sorted(indexes), [0, 1, 2])
+
+    @patch('sleeper_api.client.requests.Session.request')
+    def test_iter_chunks(self, mock_request):
+        mock_response = Mock(ok=True, status_code=200)
+        mock_response.iter_content.return_value = iter([b'{"a"', b':1}'])
+        mock_request.return_value = mock_response
+        events = []
+        self.client.add_hook(events.append)
+
+        self.assertEqual(list(self.client.iter_chunks('players/nfl', chunk_size=4)), [b'{"a"', b':1}'])
+        self.assertTrue(mock_request.call_args.kwargs['stream'])
+        mock_response.iter_content.assert_called_once_with(4)
+        mock_response.close.assert_called_once()
+        self.assertEqual((events[0].endpoint, events[0].bytes_received), ('players/nfl', 7))
+
+    @patch('sleeper_api.client.requests.Session.request')
+    def test_iter_chunks_failure(self, mock_request):
+        mock_request.return_value = Mock(ok=False, status_code=500, text="Down")
+        with self.assertRaises(SleeperAPIError):
+            list(self.client.iter_chunks('players/nfl'))
+        mock_request.return_value.close.assert_called_once()
+
 if __name__ == '__main__':
     unittest.main()
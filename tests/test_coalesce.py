@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch, Mock
+from sleeper_api.async_client import AsyncSleeperClient
+from sleeper_api.client import SleeperClient
+from sleeper_api.coalesce import SingleFlight, AsyncSingleFlight
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_calls_share_one_result(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(5)
+            return 'league'
+
+        def worker():
+            results.append(flight.do('GET league/1', fetch))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        while flight.stats()['coalesced'] < 4:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(shared for _, shared in results), [False] + [True] * 4)
+        self.assertEqual(flight.stats(), {'calls': 1, 'coalesced': 4})
+
+    def test_errors_are_shared_and_not_cached(self):
+        flight = SingleFlight()
+        with self.assertRaises(ValueError):
+            flight.do('k', Mock(side_effect=ValueError('boom')))
+        self.assertEqual(flight.do('k', lambda: 1), (1, False))
+
+class TestAsyncSingleFlight(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_calls_share_one_result(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 'league'
+
+        results = await asyncio.gather(*(flight.do('k', fetch) for _ in range(10)))
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result == 'league' for result, _ in results))
+        self.assertEqual(flight.stats(), {'calls': 1, 'coalesced': 9})
+
+class TestClientCoalescing(unittest.TestCase):
+
+    @patch('sleeper_api.client.requests.Session.request')
+    def test_threads_share_one_request(self, mock_request):
+        release = threading.Event()
+
+        def respond(**kwargs):
+            release.wait(5)
+            return Mock(status_code=200, ok=True, content=b'{"roster_id": 1}')
+        mock_request.side_effect = respond
+        client = SleeperClient(coalesce=True)
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(client.get('league/1/rosters')))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        while client.single_flight.stats()['coalesced'] < 7:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(len(results), 8)
+        # every caller decodes its own copy
+        self.assertEqual(len({id(result) for result in results}), 8)
+
+class TestAsyncClientCoalescing(unittest.IsolatedAsyncioTestCase):
+
+    @patch('sleeper_api.async_client.requests.Session.request')
+    async def test_coroutines_share_one_request(self, mock_request):
+        mock_request.return_value = Mock(status_code=200, content=b'{"league_id": "1"}', headers={})
+        async with AsyncSleeperClient(use_aiohttp=False, coalesce=True) as client:
+            results = await asyncio.gather(*(client.get('league/1') for _ in range(20)))
+
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(results, [{"league_id": "1"}] * 20)
+        self.assertEqual(client.single_flight.stats(), {'calls': 1, 'coalesced': 19})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import json
+import unittest
+from unittest.mock import patch
+from sleeper_api.decoders import get_decoder
+from sleeper_api.client import SleeperClient
+from sleeper_api.exceptions import SleeperAPIError
+
+PAYLOAD = b'{"4046": {"player_id": "4046", "first_name": "Patrick", "fantasy_positions": ["QB"]}}'
+
+class TestDecoders(unittest.TestCase):
+
+    def test_auto_prefers_a_fast_decoder(self):
+        def missing():
+            raise ImportError
+
+        with patch.dict('sleeper_api.decoders._LOADERS', orjson=missing, msgspec=missing):
+            self.assertIs(get_decoder('auto'), json.loads)
+
+    def test_every_installed_decoder_agrees(self):
+        expected = json.loads(PAYLOAD)
+        for name in ('orjson', 'msgspec', 'json'):
+            try:
+                decoder = get_decoder(name)
+            except ImportError:
+                continue
+            with self.subTest(decoder=name):
+                self.assertEqual(decoder(PAYLOAD), expected)
+                with self.assertRaises(ValueError):
+                    decoder(b'{not json')
+
+    def test_callable_and_unknown_names(self):
+        custom = lambda data: 'custom'
+        self.assertIs(get_decoder(custom), custom)
+        with self.assertRaises(ValueError):
+            get_decoder('yaml')
+
+    def test_client_uses_decoder(self):
+        client = SleeperClient(decoder=lambda data: {'decoded': data})
+        self.assertEqual(client._decode(b'1'), {'decoded': b'1'})
+
+        client = SleeperClient(decoder='json')
+        with self.assertRaises(SleeperAPIError):
+            client._decode(b'{not json')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,223 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import AsyncMock, patch
+from sleeper_api.endpoints.async_league_endpoint import AsyncLeagueEndpoint
+from sleeper_api.endpoints.async_user_endpoint import AsyncUserEndpoint
+from sleeper_api.endpoints.async_draft_endpoint import AsyncDraftEndpoint
+from sleeper_api.endpoints.async_player_endpoint import AsyncPlayerEndpoint
+from sleeper_api.models.league import LeagueModel
+from sleeper_api.models.roster import RosterModel
+from sleeper_api.models.user import UserModel
+from sleeper_api.models.draft import DraftModel
+from sleeper_api.exceptions import SleeperAPIError
+
+MOCK_LEAGUE = {
+    "league_id": "123",
+    "name": "Test League",
+    "status": "active",
+    "sport": "nfl",
+    "season": "2023",
+    "season_type": "regular",
+    "total_rosters": 10,
+    "roster_positions": ["QB", "RB", "WR", "TE"],
+    "settings": {"playoff_teams": 4},
+    "scoring_settings": {"pass_td": 4.0, "rush_td": 6.0}
+}
+
+MOCK_ROSTER = {
+    "starters": ["123", "456"],
+    "settings": {"wins": 5, "losses": 2},
+    "roster_id": 1,
+    "reserve": ["789"],
+    "players": ["123", "456", "789"],
+    "owner_id": "owner123",
+    "league_id": "league123"
+}
+
+def mock_draft(draft_id):
+    return {"draft_id": draft_id, "league_id": "9", "season": "2023", "status": "complete",
+            "draft_order": {"u1": 1}}
+
+class TestAsyncEndpoints(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.client = AsyncMock()
+
+    async def test_get_league_by_id(self):
+        self.client.get.return_value = MOCK_LEAGUE
+
+        league = await AsyncLeagueEndpoint(self.client).get_league_by_id("123")
+
+        self.assertIsInstance(league, LeagueModel)
+        self.assertEqual(league.name, "Test League")
+        self.client.get.assert_awaited_once_with("league/123")
+
+    async def test_get_league_empty_response(self):
+        self.client.get.return_value = None
+        with self.assertRaises(SleeperAPIError):
+            await AsyncLeagueEndpoint(self.client).get_league_by_id("empty_league")
+
+    async def test_get_rosters(self):
+        self.client.get.return_value = [MOCK_ROSTER]
+
+        rosters = await AsyncLeagueEndpoint(self.client).get_rosters("123")
+
+        self.assertIsInstance(rosters[0], RosterModel)
+        self.assertEqual(rosters[0].players, ["123", "456", "789"])
+
+    async def test_get_user(self):
+        self.client.get.return_value = {"username": "sleeperuser", "user_id": "1",
+                                        "display_name": "SleeperUser", "avatar": None}
+
+        user = await AsyncUserEndpoint(self.client).get_user(username="sleeperuser")
+
+        self.assertIsInstance(user, UserModel)
+        self.client.get.assert_awaited_once_with("user/sleeperuser")
+
+    async def test_get_drafts_by_user_fetches_each_draft(self):
+        self.client.get.side_effect = [
+            [{"draft_id": "1"}, {"draft_id": "2"}],
+            mock_draft("1"),
+            mock_draft("2"),
+        ]
+
+        drafts = await AsyncDraftEndpoint(self.client).get_drafts_by_user("u1", season=2023)
+
+        self.assertEqual([draft.draft_id for draft in drafts], ["1", "2"])
+        self.assertIsInstance(drafts[0], DraftModel)
+
+    async def test_player_endpoint_uses_shared_cache(self):
+        players_json = {"3086": {"player_id": "3086", "first_name": "Tom", "team": "NE"}}
+        endpoint = AsyncPlayerEndpoint(self.client)
+        self.client.get.return_value = players_json
+
+        with patch.object(endpoint.players, '_is_cache_valid', return_value=False), \
+                patch.object(endpoint.players, '_save_cache') as save_cache:
+            player = await endpoint.get_player("3086")
+
+        self.assertEqual(player.first_name, "Tom")
+        save_cache.assert_called_once_with(players_json, "nfl")
+        self.client.get.assert_awaited_once_with("players/nfl")
+
+    async def test_cache_io_runs_off_the_event_loop(self):
+        players_json = {"1": {"player_id": "1", "first_name": "A"}}
+
+        def slow_load(sport='nfl'):
+            time.sleep(0.2)  # a multi-megabyte decode
+            return players_json
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = AsyncPlayerEndpoint(self.client, cache_file=os.path.join(tmp, 'players.bin'))
+            with patch.object(endpoint.players, '_is_cache_valid', return_value=True), \
+                    patch.object(endpoint.players, '_load_cache', side_effect=slow_load):
+                task = asyncio.create_task(ticker())
+                self.assertEqual(await endpoint.get_all_players(convert_results=False), players_json)
+                task.cancel()
+        # the loop kept running other coroutines while the cache was read
+        self.assertGreater(ticks, 5)
+
+    async def test_get_players_fetches_once(self):
+        players_json = {"3086": {"player_id": "3086", "first_name": "Tom"},
+                        "4046": {"player_id": "4046", "first_name": "Patrick"}}
+        self.client.get.return_value = players_json
+
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = AsyncPlayerEndpoint(self.client, cache_file=os.path.join(tmp, 'players.json.gz'))
+            players = await endpoint.get_players(["4046", "3086"])
+            player = await endpoint.get_player("3086")
+
+        self.assertEqual([p.first_name for p in players], ["Patrick", "Tom"])
+        self.assertIs(player, players[1])
+        self.client.get.assert_awaited_once_with("players/nfl")
+
+    async def test_stale_while_revalidate_refreshes_in_a_task(self):
+        self.client.get.return_value = {"1": {"player_id": "1", "team": "BUF"}}
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = AsyncPlayerEndpoint(self.client, cache_file=os.path.join(tmp, 'players.bin'),
+                                           stale_while_revalidate=True)
+            endpoint.players._save_cache({"1": {"player_id": "1", "team": "NE"}})
+            expired = time.time() - 36 * 3600
+            os.utime(endpoint.players.cache_file, (expired, expired))
+
+            self.assertEqual((await endpoint.get_player("1")).team_abbr, "NE")
+            await endpoint.players._refresher().task
+            self.assertEqual((await endpoint.get_player("1")).team_abbr, "BUF")
+            self.assertEqual(endpoint.refresh_stats()['refreshes'], 1)
+        self.client.get.assert_awaited_once_with("players/nfl")
+
+    async def test_cancelled_refresh_is_started_again(self):
+        release = asyncio.Event()
+
+        async def slow_get(_):
+            await release.wait()
+            return {"1": {"player_id": "1", "team": "BUF"}}
+
+        self.client.get.side_effect = slow_get
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = AsyncPlayerEndpoint(self.client, cache_file=os.path.join(tmp, 'players.bin'),
+                                           stale_while_revalidate=True)
+            endpoint.players._save_cache({"1": {"player_id": "1", "team": "NE"}})
+            expired = time.time() - 36 * 3600
+            os.utime(endpoint.players.cache_file, (expired, expired))
+
+            self.assertEqual((await endpoint.get_player("1")).team_abbr, "NE")
+            cancelled = endpoint.players._refresher().task
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await cancelled
+            self.assertFalse(endpoint.refresh_stats()['in_progress'])
+
+            # the next stale read schedules a new refresh
+            self.assertEqual((await endpoint.get_player("1")).team_abbr, "NE")
+            task = endpoint.players._refresher().task
+            self.assertIsNot(task, cancelled)
+            release.set()
+            await task
+            self.assertEqual((await endpoint.get_player("1")).team_abbr, "BUF")
+            self.assertEqual(endpoint.refresh_stats()['refreshes'], 1)
+
+    async def test_get_trending_windows(self):
+        self.client.get_many.return_value = [[{"player_id": "1", "count": 9}],
+                                             [{"player_id": "1", "count": 2}]]
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = AsyncPlayerEndpoint(self.client, cache_file=os.path.join(tmp, 'players.bin'))
+            endpoint.players._save_cache({"1": {"player_id": "1", "first_name": "Tom"}})
+
+            trends = await endpoint.get_trending_windows("add", lookback_hours=(24, 168))
+            self.client.get_many.assert_awaited_once_with([
+                "players/nfl/trending/add?lookback_hours=24&limit=25",
+                "players/nfl/trending/add?lookback_hours=168&limit=25"])
+            self.assertEqual(trends["add", 168][0].add_count, 2)
+            self.assertIs(trends["add", 24][0].player, await endpoint.get_player("1"))
+
+            self.client.get.return_value = [{"player_id": "1", "count": 5}]
+            trending, = await endpoint.get_trending_players("drop")
+            self.assertEqual((trending.first_name, trending.drop_count), ("Tom", 5))
+
+    async def test_warm_sports(self):
+        self.client.get.side_effect = lambda endpoint: {
+            "players/nfl": {"1": {"player_id": "1"}, "2": {"player_id": "2"}},
+            "players/lcs": {"9": {"player_id": "9"}}}[endpoint]
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = AsyncPlayerEndpoint(self.client, cache_file=os.path.join(tmp, 'players.bin'))
+            self.assertEqual(await endpoint.warm(["nfl", "lcs"]), {"nfl": 2, "lcs": 1})
+            self.assertEqual((await endpoint.get_player("9", sport="lcs")).player_id, "9")
+            self.assertTrue(endpoint.cache_stats("lcs")['valid'])
+            endpoint.evict("lcs")
+            self.assertFalse(endpoint.cache_stats("lcs")['loaded'])
+        self.assertEqual(self.client.get.await_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
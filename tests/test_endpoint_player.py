@@ -1,8 +1,18 @@
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time
 import unittest
+from datetime import datetime, timedelta
 from unittest.mock import MagicMock, patch
 from sleeper_api.endpoints.player_endpoint import PlayerEndpoint
 from sleeper_api.models.player import PlayerModel
 from sleeper_api.exceptions import SleeperAPIError
+from sleeper_api.client import SleeperClient
+from sleeper_api.testing import StubServer, make_players
+from _reference_search import evaluate_conditions
 
 class TestPlayerEndpoint(unittest.TestCase):
 
@@ -33,15 +43,23 @@ class TestPlayerEndpoint(unittest.TestCase):
             self.assertEqual(players[0].first_name, "Tom")
             self.assertEqual(players[0].last_name, "Brady")
 
+    def test_load_cache_round_trip(self):
+        players_json = {"3086": {"player_id": "3086", "first_name": "Tom", "last_name": "Brady"}}
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = PlayerEndpoint(self.client, cache_file=os.path.join(tmp, 'players.json.gz'))
+            endpoint._save_cache(players_json)
+
+            self.assertEqual(endpoint._load_cache(), players_json)
+
     def test_get_trending_players_add(self):
         # Mock trending data and all player data
         mock_trending = [{"player_id": "3086", "count": 50}]
         mock_all_players = {"3086": {"player_id": "3086", "first_name": "Tom", "last_name": "Brady", "team": "NE"}}
 
-        with patch.object(self.client, 'get', return_value=mock_trending), \
-                patch.object(self.endpoint, 'get_all_players', return_value=[PlayerModel.from_dict(mock_all_players["3086"])]):
-            
-            trending_players = self.endpoint.get_trending_players(sport="nfl", trend_type="add")
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = self._indexed_endpoint(tmp, mock_all_players)
+            with patch.object(self.client, 'get', return_value=mock_trending):
+                trending_players = endpoint.get_trending_players(sport="nfl", trend_type="add")
             self.assertEqual(len(trending_players), 1)
             self.assertEqual(trending_players[0].first_name, "Tom")
             self.assertEqual(trending_players[0].add_count, 50)
@@ -51,14 +69,61 @@ class TestPlayerEndpoint(unittest.TestCase):
         mock_trending = [{"player_id": "3086", "count": 20}]
         mock_all_players = {"3086": {"player_id": "3086", "first_name": "Tom", "last_name": "Brady", "team": "NE"}}
 
-        with patch.object(self.client, 'get', return_value=mock_trending), \
-                patch.object(self.endpoint, 'get_all_players', return_value=[PlayerModel.from_dict(mock_all_players["3086"])]):
-            
-            trending_players = self.endpoint.get_trending_players(sport="nfl", trend_type="drop")
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = self._indexed_endpoint(tmp, mock_all_players)
+            with patch.object(self.client, 'get', return_value=mock_trending):
+                trending_players = endpoint.get_trending_players(sport="nfl", trend_type="drop")
             self.assertEqual(len(trending_players), 1)
             self.assertEqual(trending_players[0].first_name, "Tom")
             self.assertEqual(trending_players[0].drop_count, 20)
 
+    def test_get_trending_players_shares_index_models(self):
+        mock_trending = [{"player_id": "2", "count": 7}, {"player_id": "missing", "count": 3}]
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = self._indexed_endpoint(tmp, make_players(5))
+            with patch.object(self.client, 'get', return_value=mock_trending), \
+                    patch.object(endpoint, 'get_all_players') as get_all_players:
+                trending, = endpoint.get_trending_players("add", lookback_hours=6)
+            get_all_players.assert_not_called()
+            self.assertIs(trending.player, endpoint.get_player("2"))
+            self.assertEqual((trending.count, trending.lookback_hours), (7, 6))
+            self.assertIsNone(trending.drop_count)
+            # the count isn't set on the shared model
+            self.assertFalse(hasattr(endpoint.get_player("2"), 'add_count'))
+
+    def test_get_trending_players_sport(self):
+        self.client.get.return_value = []
+        with patch.object(self.endpoint, '_player_index') as player_index:
+            self.endpoint.get_trending_players("add", sport="nba")
+        player_index.assert_called_once_with("nba")
+        self.client.get.assert_called_once_with(
+            "players/nba/trending/add?lookback_hours=24&limit=25")
+
+    def test_get_trending_windows(self):
+        responses = [[{"player_id": "1", "count": 9}], [{"player_id": "2", "count": 40}],
+                     [], [{"player_id": "1", "count": 4}]]
+        self.client.get_many.return_value = responses
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = self._indexed_endpoint(tmp, make_players(5))
+            trends = endpoint.get_trending_windows(lookback_hours=(24, 168), limit=10)
+            self.client.get_many.assert_called_once_with([
+                "players/nfl/trending/add?lookback_hours=24&limit=10",
+                "players/nfl/trending/add?lookback_hours=168&limit=10",
+                "players/nfl/trending/drop?lookback_hours=24&limit=10",
+                "players/nfl/trending/drop?lookback_hours=168&limit=10",
+            ])
+            self.assertEqual(list(trends), [("add", 24), ("add", 168), ("drop", 24), ("drop", 168)])
+            self.assertEqual(trends["add", 168][0].add_count, 40)
+            self.assertEqual(trends["drop", 24], [])
+            self.assertIs(trends["add", 24][0].player, trends["drop", 168][0].player)
+            self.assertEqual(trends["drop", 168][0].drop_count, 4)
+
+            raw = endpoint.get_trending_windows("add", 24, convert_results=False)
+            self.assertEqual(raw, {("add", 24): responses[0]})
+
+        with self.assertRaises(SleeperAPIError):
+            self.endpoint.get_trending_windows(("add", "invalid"))
+
     def test_get_trending_players_invalid_type(self):
         with self.assertRaises(SleeperAPIError):
             self.endpoint.get_trending_players(sport="nfl", trend_type="invalid")
@@ -74,29 +139,396 @@ class TestPlayerEndpoint(unittest.TestCase):
             }
         }
 
-        with patch.object(self.endpoint, 'get_all_players', return_value=mock_players_json):
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = self._indexed_endpoint(tmp, mock_players_json)
             criteria = {"position": "QB", "age": {">": 35}}
-            results = self.endpoint.search_players(criteria)
+            results = endpoint.search_players(criteria)
 
             self.assertEqual(len(results), 2)
             self.assertEqual(results[0].first_name, "Tom")
             self.assertEqual(results[1].first_name, "Aaron")
 
+    def test_search_players_order_fields_limit(self):
+        players_json = make_players(500, seed=3)
+        criteria = {"position": "WR", "active": True}
+        wrs = sorted((key for key, data in players_json.items()
+                      if evaluate_conditions(data, criteria)),
+                     key=lambda key: players_json[key]["search_rank"])
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = self._indexed_endpoint(tmp, players_json)
+            top = endpoint.search_players(criteria, order_by="search_rank", limit=5,
+                                          fields=["player_id", "first_name", "search_rank"])
+            self.assertEqual(top, [{"player_id": key, "first_name": players_json[key]["first_name"],
+                                    "search_rank": players_json[key]["search_rank"]}
+                                   for key in wrs[:5]])
+
+            models = endpoint.search_players(criteria, order_by="-search_rank", limit=3)
+            self.assertEqual([model.player_id for model in models], wrs[::-1][:3])
+            raw = endpoint.search_players(criteria, convert_results=False, limit=2)
+            self.assertEqual([data["key"] for data in raw],
+                             [key for key in players_json if key in set(wrs)][:2])
+
+            results = endpoint.search_players(criteria, order_by="search_rank", iterator=True)
+            self.assertNotIsInstance(results, list)
+            self.assertEqual(next(results).player_id, wrs[0])
+            self.assertEqual(len(list(results)), len(wrs) - 1)
+
+            with self.assertRaises(ValueError):
+                endpoint.search_players(criteria, limit=-1)
+
+    def _indexed_endpoint(self, tmp, players_json):
+        # a cache file of its own, so the process wide index isn't shared with other tests
+        endpoint = PlayerEndpoint(self.client, cache_file=os.path.join(tmp, 'players.json.gz'))
+        endpoint._save_cache(players_json)
+        return endpoint
 
     def test_get_player(self):
-        # Mock all player data
         mock_all_players = {"3086": {"player_id": "3086", "first_name": "Tom", "last_name": "Brady", "team": "NE"}}
 
-        with patch.object(self.endpoint, 'get_all_players', return_value=[PlayerModel.from_dict(mock_all_players["3086"])]):
-            player = self.endpoint.get_player("3086")
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = self._indexed_endpoint(tmp, mock_all_players)
+            player = endpoint.get_player("3086")
             self.assertEqual(player.first_name, "Tom")
             self.assertEqual(player.last_name, "Brady")
 
     def test_get_player_not_found(self):
-        # Mock empty player data
-        with patch.object(self.endpoint, 'get_all_players', return_value=[]):
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = self._indexed_endpoint(tmp, {})
+            with self.assertRaises(SleeperAPIError):
+                endpoint.get_player("invalid_id")
+
+    def test_get_players(self):
+        mock_all_players = {
+            "3086": {"player_id": "3086", "first_name": "Tom", "last_name": "Brady"},
+            "4046": {"player_id": "4046", "first_name": "Patrick", "last_name": "Mahomes"},
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = self._indexed_endpoint(tmp, mock_all_players)
+            players = endpoint.get_players(["4046", "missing", "3086"])
+            self.assertEqual([player.first_name for player in players], ["Patrick", "Tom"])
+            raw = endpoint.get_players(["3086"], convert_results=False)
+            self.assertEqual(raw, [mock_all_players["3086"]])
+
+    def test_search_with_indexes_matches_full_scan(self):
+        players_json = make_players(500, seed=1)
+        queries = [
+            {"position": "QB"},
+            {"team": "NE", "age": {">": 25}},
+            {"team": {"in": ["NE", "KC", None]}, "status": "Active"},
+            {"position": {"==": "WR"}, "injury_status": {"!=": "Out"}},
+            {"fantasy_positions": ["RB"]},
+            {"fantasy_positions": {"in": [["WR"], ["TE"]]}},
+            {"OR": [{"team": "DAL"}, {"position": "K"}]},
+            {"OR": [{"team": "DAL"}, {"age": {"<": 23}}]},
+            {"AND": [{"position": "QB"}, {"OR": [{"team": "BUF"}, {"team": "MIA"}]}]},
+            {"injury_status": "Questionable", "position": {"not in": ["QB", "K"]}},
+            {"team": "not a team"},
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = self._indexed_endpoint(tmp, players_json)
+            for criteria in queries:
+                with self.subTest(criteria=criteria):
+                    expected = [dict(data, key=key) for key, data in players_json.items()
+                                if evaluate_conditions(data, criteria)]
+                    self.assertEqual(endpoint.search_players(criteria, convert_results=False), expected)
+
+    def test_explain(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = self._indexed_endpoint(tmp, make_players(100))
+            plan = endpoint.explain({"team": "KC", "age": {">": 25}})
+        self.assertIn("access: index lookup", plan)
+        self.assertIn("team == 'KC'", plan)
+
+    def test_get_players_by_team(self):
+        players_json = {
+            "1": {"player_id": "1", "first_name": "A", "team": "NE"},
+            "2": {"player_id": "2", "first_name": "B", "team_abbr": "KC", "team": None},
+            "3": {"player_id": "3", "first_name": "C", "team": "NE"},
+            "4": {"player_id": "4", "first_name": "D", "team": None},
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = self._indexed_endpoint(tmp, players_json)
+            self.assertEqual([p.player_id for p in endpoint.get_players_by_team("NE")], ["1", "3"])
+            self.assertEqual([p.player_id for p in endpoint.get_players_by_team("KC")], ["2"])
+            self.assertEqual(endpoint.get_players_by_team("SF"), [])
+
+    def test_index_is_built_once_per_cache_generation(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = self._indexed_endpoint(tmp, {"3086": {"player_id": "3086", "first_name": "Tom"}})
+            with patch.object(endpoint, '_open_cache', wraps=endpoint._open_cache) as open_cache:
+                for _ in range(15):
+                    endpoint.get_player("3086")
+                # a second endpoint on the same cache file shares the index
+                PlayerEndpoint(self.client, cache_file=endpoint.cache_file).get_player("3086")
+            open_cache.assert_called_once()
+
+            # refreshing the cache invalidates the index
+            endpoint._save_cache({"3086": {"player_id": "3086", "first_name": "Thomas", "last_name": "Brady"}})
+            os.utime(endpoint.cache_file, ns=(0, os.stat(endpoint.cache_file).st_mtime_ns + 1))
+            self.assertEqual(endpoint.get_player("3086").first_name, "Thomas")
+
+    def test_get_player_decodes_only_that_player(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = self._indexed_endpoint(tmp, make_players(200))
+            with patch('sleeper_api.player_cache.PlayerCacheFile.load') as load:
+                player = endpoint.get_player("105")
+            load.assert_not_called()
+            self.assertEqual(player.player_id, "105")
+            # a search needs every player
+            self.assertTrue(endpoint.search_players({"player_id": "105"}))
+
+    def test_legacy_cache_is_migrated(self):
+        players_json = {"3086": {"player_id": "3086", "first_name": "Tom"}}
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy = os.path.join(tmp, 'players.json.gz')
+            with gzip.open(legacy, 'wt') as f:
+                json.dump(players_json, f, indent=4)
+            mtime = os.stat(legacy).st_mtime_ns
+
+            endpoint = PlayerEndpoint(self.client, cache_file=legacy)
+            self.assertEqual(str(endpoint.cache_file), os.path.join(tmp, 'players.bin'))
+            self.assertEqual(endpoint.get_player("3086").first_name, "Tom")
+            self.assertFalse(os.path.exists(legacy))
+            self.assertEqual(os.stat(endpoint.cache_file).st_mtime_ns, mtime)
+            self.client.get.assert_not_called()
+
+    def test_refresh_records_changes_and_updates_index(self):
+        old = {"1": {"player_id": "1", "first_name": "A", "team": "NE", "injury_status": None},
+               "2": {"player_id": "2", "first_name": "B", "team": "KC"}}
+        new = {"1": {"player_id": "1", "first_name": "A", "team": "BUF", "injury_status": "Out"},
+               "3": {"player_id": "3", "first_name": "C", "team": "NE"}}
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = self._indexed_endpoint(tmp, old)
+            self.assertEqual([p.player_id for p in endpoint.get_players_by_team("NE")], ["1"])
+            self.assertFalse(endpoint.get_player_changes())
+
+            # expire the cache, the next lookup refreshes it from the API
+            since = os.stat(endpoint.cache_file).st_mtime_ns / 1e9
+            endpoint.cache_duration = timedelta(0)
+            self.client.get.return_value = new
+            with patch('sleeper_api.player_index.PlayerIndex.load') as load:
+                self.assertEqual([p.player_id for p in endpoint.get_players_by_team("NE")], ["3"])
+            load.assert_not_called()
+            endpoint.cache_duration = timedelta(days=1)
+
+            changes = endpoint.get_player_changes()
+            self.assertEqual(changes.added, ["3"])
+            self.assertEqual(changes.removed, ["2"])
+            self.assertEqual(changes.changed, {"1": {"team": ("NE", "BUF"), "injury_status": (None, "Out")}})
+            self.assertEqual(changes.since, since)
+            self.assertEqual(endpoint.get_player("1").team_abbr, "BUF")
+            self.assertFalse(endpoint.get_player_changes(since=changes.until))
+
+    def test_player_history(self):
+        old = {"1": {"player_id": "1", "first_name": "A", "team": "NE"},
+               "2": {"player_id": "2", "first_name": "B", "team": "KC"}}
+        new = {"1": {"player_id": "1", "first_name": "A", "team": "BUF"},
+               "3": {"player_id": "3", "first_name": "C", "team": "NE"}}
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = PlayerEndpoint(self.client, cache_file=os.path.join(tmp, 'players.bin'),
+                                      history=True)
+            self.client.get.return_value = old
+            endpoint.get_player("1")
+            first = os.stat(endpoint.cache_file).st_mtime_ns / 1e9
+            time.sleep(0.02)  # so the refresh has a later modification time
+
+            endpoint.cache_duration = timedelta(0)
+            self.client.get.return_value = new
+            endpoint.get_player("1")
+            endpoint.cache_duration = timedelta(days=1)
+            second = os.stat(endpoint.cache_file).st_mtime_ns / 1e9
+
+            self.assertIsNone(endpoint.get_player_at("1", first - 1))
+            self.assertEqual(endpoint.get_player_at("1", first).team_abbr, "NE")
+            self.assertEqual(endpoint.get_player_at("1", datetime.fromtimestamp(second)).team_abbr,
+                             "BUF")
+            self.assertEqual(endpoint.get_player_at("2", first, convert_results=False), old["2"])
+            self.assertIsNone(endpoint.get_player_at("2", second))
+            self.assertEqual([(when, player.team_abbr)
+                              for when, player in endpoint.get_player_history("1")],
+                             [(datetime.fromtimestamp(first), "NE"),
+                              (datetime.fromtimestamp(second), "BUF")])
+            self.assertEqual(endpoint.get_players_at(first), old)
+            self.assertEqual(endpoint.get_players_at(second), new)
+            # the times listed find their version again
+            for when, player in endpoint.get_player_history("1"):
+                self.assertEqual(endpoint.get_player_at("1", when).team_abbr, player.team_abbr)
+            # the refresh was stored as the changes, after the full first version
+            self.assertEqual(endpoint._player_history().stats()['versions'], 2)
+
+    def test_player_history_disabled(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = self._indexed_endpoint(tmp, {"1": {"player_id": "1"}})
+            self.assertIsNone(endpoint.get_player_at("1", time.time()))
+            self.assertEqual(endpoint.get_player_history("1"), [])
+            self.assertEqual(os.listdir(tmp), ["players.bin"])
+
+    def test_stale_while_revalidate(self):
+        old = {"1": {"player_id": "1", "first_name": "A", "team": "NE"}}
+        new = {"1": {"player_id": "1", "first_name": "A", "team": "BUF"}}
+        release = threading.Event()
+
+        def slow_get(endpoint):
+            release.wait(5)
+            return new
+
+        self.client.get.side_effect = slow_get
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = PlayerEndpoint(self.client, cache_file=os.path.join(tmp, 'players.bin'),
+                                      stale_while_revalidate=True, max_staleness=timedelta(days=1))
+            endpoint._save_cache(old)
+            expired = time.time() - 36 * 3600
+            os.utime(endpoint.cache_file, (expired, expired))
+
+            # the expired data is served at once while the refresh waits on the API
+            self.assertEqual(endpoint.get_player("1").team_abbr, "NE")
+            self.assertEqual(endpoint.get_all_players(convert_results=False), old)
+            release.set()
+            self.assertTrue(endpoint._refresher().wait(5))
+            self.client.get.assert_called_once_with("players/nfl")
+            self.assertEqual(endpoint.get_player("1").team_abbr, "BUF")
+            stats = endpoint.refresh_stats()
+            self.assertEqual((stats['refreshes'], stats['failures'], stats['stale_served']), (1, 0, 2))
+
+    def test_stale_while_revalidate_max_staleness(self):
+        self.client.get.return_value = {"1": {"player_id": "1", "team": "BUF"}}
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = PlayerEndpoint(self.client, cache_file=os.path.join(tmp, 'players.bin'),
+                                      stale_while_revalidate=True, max_staleness=timedelta(hours=1))
+            endpoint._save_cache({"1": {"player_id": "1", "team": "NE"}})
+            expired = time.time() - 36 * 3600
+            os.utime(endpoint.cache_file, (expired, expired))
+
+            # too stale to serve, the call blocks on the refresh
+            self.assertEqual(endpoint.get_player("1").team_abbr, "BUF")
+            self.assertEqual(endpoint.refresh_stats()['stale_served'], 0)
+
+    def test_refresh_waits_for_another_process(self):
+        fresh = {"1": {"player_id": "1", "team": "BUF"}}
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = PlayerEndpoint(self.client, cache_file=os.path.join(tmp, 'players.bin'))
+            endpoint._save_cache({"1": {"player_id": "1", "team": "NE"}})
+            expired = time.time() - 36 * 3600
+            os.utime(endpoint.cache_file, (expired, expired))
+
+            # another process is refreshing the cache, we wait and use what it downloaded
+            lock = endpoint._cache_lock()
+            lock.acquire()
+            results = []
+            waiter = threading.Thread(target=lambda: results.append(endpoint.get_player("1")))
+            waiter.start()
+            time.sleep(0.2)
+            self.assertTrue(waiter.is_alive())
+            endpoint._save_cache(fresh)
+            lock.release()
+            waiter.join(5)
+
+            self.assertEqual(results[0].team_abbr, "BUF")
+            self.client.get.assert_not_called()
+
+    def test_background_refresh_skips_when_another_process_refreshes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = PlayerEndpoint(self.client, cache_file=os.path.join(tmp, 'players.bin'),
+                                      stale_while_revalidate=True)
+            endpoint._save_cache({"1": {"player_id": "1", "team": "NE"}})
+            expired = time.time() - 36 * 3600
+            os.utime(endpoint.cache_file, (expired, expired))
+
+            with endpoint._cache_lock():
+                self.assertEqual(endpoint.get_player("1").team_abbr, "NE")
+                self.assertTrue(endpoint._refresher().wait(5))
+            self.client.get.assert_not_called()
+            self.assertEqual(endpoint.refresh_stats()['skipped'], 1)
+
+    def test_unreadable_cache_is_downloaded_again(self):
+        self.client.get.return_value = {"3086": {"player_id": "3086", "first_name": "Tom"}}
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = PlayerEndpoint(self.client, cache_file=os.path.join(tmp, 'players.bin'))
+            with open(endpoint.cache_file, 'wb') as f:
+                f.write(b'not a cache')
+            self.assertEqual(endpoint.get_player("3086").first_name, "Tom")
+            self.client.get.assert_called_once_with("players/nfl")
+            self.assertEqual(endpoint._load_cache(), self.client.get.return_value)
+
+    def test_sports_are_cached_separately(self):
+        payloads = {"players/nfl": make_players(3), "players/nba": {"1": {"player_id": "1", "first_name": "Nba"}}}
+        self.client.get.side_effect = payloads.__getitem__
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = PlayerEndpoint(self.client, cache_file=os.path.join(tmp, 'players.bin'),
+                                      cache_durations={"nba": timedelta(0)})
+            self.assertEqual(endpoint.get_player("1", sport="nba").first_name, "Nba")
+            self.assertNotEqual(endpoint.get_player("1").first_name, "Nba")
+            self.assertEqual(endpoint.cache_path("nba"), endpoint.cache_file.with_name("players.nba.bin"))
+            self.assertEqual(endpoint._load_cache("nba"), payloads["players/nba"])
+            self.assertEqual(endpoint._load_cache(), payloads["players/nfl"])
+
+            # nba expires immediately, only it is downloaded again
+            endpoint.get_player("1", sport="nba")
+            endpoint.get_player("1")
+            self.assertEqual([call.args[0] for call in self.client.get.call_args_list],
+                             ["players/nba", "players/nfl", "players/nba"])
+            self.assertEqual(endpoint.cache_stats("nba")['ttl'], 0)
+            self.assertTrue(endpoint.cache_stats()['valid'])
+
+            with self.assertRaises(SleeperAPIError):
+                endpoint.cache_path("../nfl")
+
+    def test_warm_and_evict(self):
+        self.client.get.side_effect = lambda endpoint: make_players(4 if endpoint == "players/nba" else 6)
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = PlayerEndpoint(self.client, cache_file=os.path.join(tmp, 'players.bin'))
+            self.assertEqual(endpoint.warm(["nfl", "nba", "nfl"]), {"nfl": 6, "nba": 4})
+            nba = endpoint._player_index("nba")
+
+            endpoint.evict("nfl")
+            self.assertFalse(endpoint.cache_stats("nfl")['loaded'])
+            self.assertTrue(endpoint.cache_stats("nba")['loaded'])
+            self.assertIs(endpoint._player_index("nba"), nba)
+            # reloaded from its cache file, not downloaded again
+            self.assertEqual(endpoint.get_player("6").player_id, "6")
+
+            endpoint.evict("nba", delete_cache=True)
+            self.assertFalse(endpoint.cache_path("nba").exists())
+            self.assertTrue(endpoint.cache_path("nfl").exists())
+            self.assertEqual(self.client.get.call_count, 2)
+
+    def test_memory_limit_trims_index(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = self._indexed_endpoint(tmp, make_players(200))
+            endpoint.memory_limits = {"nfl": 10_000}
+            endpoint.search_players({"team": "KC"})
+            self.assertGreater(endpoint.cache_stats()['memory'], 10_000)
+
+            player = endpoint.get_player("5")
+            self.assertLess(endpoint.cache_stats()['memory'], 10_000)
+            self.assertEqual(endpoint.get_player("5").player_id, player.player_id)
+            # other sports have no limit
+            self.assertIsNone(endpoint.cache_stats("nba")['memory_limit'])
+
+    def test_streaming_download(self):
+        players_json = make_players(300)
+        with tempfile.TemporaryDirectory() as tmp, StubServer(payload=players_json) as server:
+            endpoint = PlayerEndpoint(SleeperClient(base_url=server.base_url),
+                                      cache_file=os.path.join(tmp, 'players.bin'), streaming=True)
+            self.assertEqual(endpoint.get_player("150").player_id, "150")
+            self.assertEqual(endpoint._load_cache(), players_json)
+            self.assertEqual(len(endpoint.get_players_by_team("KC")),
+                             sum(1 for data in players_json.values() if data.get("team") == "KC"))
+
+            # a refresh is diffed against the previous payload like a buffered download
+            server.payload = json.dumps(dict(players_json, new={"player_id": "new"})).encode()
+            endpoint.cache_duration = timedelta(0)
+            self.assertEqual(endpoint.get_player("new").player_id, "new")
+            self.assertEqual(endpoint.get_player_changes().added, ["new"])
+
+    def test_streaming_invalid_payload_keeps_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.client.iter_chunks.return_value = iter([b'{"1":{"player_id":"1"},', b'"2":{'])
+            endpoint = PlayerEndpoint(self.client, cache_file=os.path.join(tmp, 'players.bin'),
+                                      streaming=True)
             with self.assertRaises(SleeperAPIError):
-                self.endpoint.get_player("invalid_id")
+                endpoint.get_player("1")
+            self.assertEqual(os.listdir(tmp), ['players.bin.lock'])
 
 if __name__ == '__main__':
     unittest.main()
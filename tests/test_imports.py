@@ -0,0 +1,43 @@
+import subprocess
+import sys
+import unittest
+import sleeper_api
+import sleeper_api.endpoints
+
+def run_python(code):
+    return subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_import_does_not_load_dependencies(self):
+        loaded = run_python(
+            "import sys, sleeper_api, sleeper_api.endpoints\n"
+            "print(sorted(m for m in ('requests', 'aiohttp', 'platformdirs', 'sleeper_api.client') if m in sys.modules))")
+        self.assertEqual(loaded.strip(), '[]')
+
+    def test_models_do_not_load_the_client(self):
+        loaded = run_python(
+            "import sys\nfrom sleeper_api import LeagueModel, SleeperAPIError\n"
+            "print('requests' in sys.modules)")
+        self.assertEqual(loaded.strip(), 'False')
+
+    def test_every_public_name_resolves(self):
+        for module in (sleeper_api, sleeper_api.endpoints):
+            for name in module.__all__:
+                with self.subTest(name=name):
+                    self.assertEqual(getattr(module, name).__name__, name)
+            self.assertTrue(set(module.__all__) <= set(dir(module)))
+
+    def test_star_import(self):
+        namespace = {}
+        exec('from sleeper_api import *', namespace)  # pylint: disable=exec-used
+        self.assertTrue(set(sleeper_api.__all__) <= set(namespace))
+
+    def test_unknown_name(self):
+        with self.assertRaises(AttributeError):
+            sleeper_api.NotAThing  # pylint: disable=pointless-statement
+        with self.assertRaises(ImportError):
+            exec('from sleeper_api import NotAThing', {})  # pylint: disable=exec-used
+
+if __name__ == '__main__':
+    unittest.main()
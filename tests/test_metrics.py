@@ -0,0 +1,75 @@
+import unittest
+from unittest.mock import patch, Mock
+from sleeper_api.cache import ResponseCache
+from sleeper_api.client import SleeperClient
+from sleeper_api.exceptions import SleeperAPIError
+from sleeper_api.metrics import MetricsCollector, RequestEvent
+from sleeper_api.retry import RetryPolicy
+
+def mock_response(status_code, content):
+    return Mock(status_code=status_code, ok=status_code < 400, content=content,
+                text=content.decode(), headers={})
+
+class TestMetricsCollector(unittest.TestCase):
+
+    def test_aggregates_by_template(self):
+        metrics = MetricsCollector(buckets=(0.1, 1.0))
+        for league_id, latency in (('1', 0.05), ('2', 0.5), ('3', 5.0)):
+            event = RequestEvent('GET', f'league/{league_id}/rosters')
+            event.status, event.latency, event.bytes_received = 200, latency, 10
+            metrics(event)
+
+        snapshot = metrics.snapshot()['league/{league_id}/rosters']
+        self.assertEqual(snapshot['requests'], 3)
+        self.assertEqual(snapshot['by_status'], {'200': 3})
+        self.assertEqual(snapshot['bytes_received'], 30)
+
+        text = metrics.to_prometheus()
+        self.assertIn('sleeper_requests_total{endpoint="league/{league_id}/rosters",'
+                      'status="200",cache="bypass"} 3', text)
+        self.assertIn('sleeper_request_duration_seconds_bucket{endpoint="league/{league_id}/rosters",'
+                      'le="0.1"} 1', text)
+        self.assertIn('sleeper_request_duration_seconds_bucket{endpoint="league/{league_id}/rosters",'
+                      'le="1.0"} 2', text)
+        self.assertIn('sleeper_request_duration_seconds_bucket{endpoint="league/{league_id}/rosters",'
+                      'le="+Inf"} 3', text)
+        self.assertIn('sleeper_request_duration_seconds_count{endpoint="league/{league_id}/rosters"} 3', text)
+
+class TestClientHooks(unittest.TestCase):
+
+    @patch('sleeper_api.client.time.sleep')
+    @patch('sleeper_api.client.requests.Session.request')
+    def test_events_report_each_request(self, mock_request, mock_sleep):
+        mock_request.side_effect = [
+            mock_response(503, b'unavailable'),
+            mock_response(200, b'{"league_id": "1"}'),
+            mock_response(404, b'Not Found'),
+        ]
+        events = []
+        client = SleeperClient(cache=ResponseCache(), retry=RetryPolicy(), hooks=[events.append])
+
+        client.get('league/1')
+        client.get('league/1')
+        with self.assertRaises(SleeperAPIError):
+            client.get('league/2')
+
+        miss, hit, error = events
+        self.assertEqual((miss.template, miss.status, miss.cache, miss.retries),
+                         ('league/{league_id}', 200, 'miss', 1))
+        self.assertEqual(miss.bytes_received, 18)
+        self.assertGreaterEqual(miss.latency, 0)
+        self.assertEqual((hit.status, hit.cache, hit.retries), (200, 'hit', 0))
+        self.assertEqual(error.status, 404)
+        self.assertIsInstance(error.error, SleeperAPIError)
+
+    @patch('sleeper_api.client.requests.Session.request')
+    def test_failing_hook_does_not_fail_request(self, mock_request):
+        mock_request.return_value = mock_response(200, b'[]')
+        client = SleeperClient()
+        client.add_hook(Mock(side_effect=RuntimeError('broken exporter')))
+
+        with patch('builtins.print'):
+            self.assertEqual(client.get('league/1/users'), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
+import json
 import unittest
-from sleeper_api.models.player import PlayerModel
+from sleeper_api.models.player import PlayerModel, intern_players
 
 class TestPlayerModel(unittest.TestCase):
 
@@ -75,5 +76,47 @@ class TestPlayerModel(unittest.TestCase):
         self.assertEqual(player.get_attribute("college"), "Michigan State")
         self.assertIsNone(player.get_attribute("non_existent_key"))  # Non-existent key should return None
 
+    def test_player_model_is_a_view(self):
+        player_data = {"player_id": "1408", "first_name": "Le'Veon", "last_name": "Bell", "team": "PIT"}
+        player = PlayerModel.from_dict(player_data)
+
+        self.assertFalse(hasattr(player, '__dict__'))
+        self.assertIs(player._player_data, player_data)
+        self.assertEqual(player.name, "Le'Veon Bell")
+
+        # assigning copies the shared data first
+        player.team_abbr = "NYJ"
+        player.first_name = "Leveon"
+        self.assertEqual((player.team_abbr, player.name), ("NYJ", "Leveon Bell"))
+        self.assertEqual(player_data["team"], "PIT")
+        self.assertNotIn("team_abbr", player_data)
+
+        player.name = "Le'Veon Bell Jr."
+        self.assertEqual(player.name, "Le'Veon Bell Jr.")
+        self.assertNotIn("name", player_data)
+
+        # trending counts are kept on TrendingPlayerModel, not the shared model
+        with self.assertRaises(AttributeError):
+            player.add_count = 5
+
+    def test_player_model_constructor(self):
+        player = PlayerModel("1408", first_name="Le'Veon", team="PIT", age=29)
+        self.assertEqual((player.player_id, player.team_abbr, player.age), ("1408", "PIT", 29))
+        self.assertEqual(player.get_attribute("first_name"), "Le'Veon")
+        self.assertIsNone(player.last_name)
+        self.assertEqual(player.name, "Le'Veon")
+
+        player_data = {"player_id": "1408", "college": "Michigan State", "age": 28}
+        player = PlayerModel("1408", age=29, _player_data=player_data)
+        self.assertEqual((player.age, player.college), (29, "Michigan State"))
+        self.assertEqual(player_data["age"], 28)
+
+    def test_repeated_strings_are_interned(self):
+        players_json = intern_players(json.loads(
+            '{"1": {"team": "PIT", "fantasy_positions": ["RB"], "first_name": "A"},'
+            ' "2": {"team": "PIT", "fantasy_positions": ["RB"], "first_name": "A"}}'))
+        self.assertIs(players_json["1"]["team"], players_json["2"]["team"])
+        self.assertIs(players_json["1"]["fantasy_positions"][0], players_json["2"]["fantasy_positions"][0])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+from sleeper_api.models.player import PlayerModel
+from sleeper_api.models.trending import TrendingPlayerModel
+
+
+class TestTrendingPlayerModel(unittest.TestCase):
+
+    def test_reads_through_to_player(self):
+        player = PlayerModel.from_dict({"player_id": "4046", "first_name": "Patrick",
+                                        "last_name": "Mahomes", "team": "KC"})
+        trending = TrendingPlayerModel(player, "add", 1200, lookback_hours=24)
+
+        self.assertEqual((trending.name, trending.team_abbr), ("Patrick Mahomes", "KC"))
+        self.assertEqual((trending.add_count, trending.drop_count), (1200, None))
+        self.assertIn("add=1200", repr(trending))
+        with self.assertRaises(AttributeError):
+            trending.missing_attribute  # pylint: disable=pointless-statement
+
+    def test_counts_per_window(self):
+        player = PlayerModel.from_dict({"player_id": "1"})
+        day = TrendingPlayerModel(player, "drop", 30, 24)
+        week = TrendingPlayerModel(player, "drop", 200, 168)
+
+        self.assertEqual((day.drop_count, week.drop_count), (30, 200))
+        self.assertFalse(hasattr(player, "drop_count"))
+
+
+if __name__ == '__main__':
+    unittest.main()
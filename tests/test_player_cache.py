@@ -0,0 +1,151 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from sleeper_api.player_cache import CacheLock, PlayerCacheFile, PlayerCacheWriter, write_player_cache
+from sleeper_api.player_index import PlayerIndex
+from sleeper_api.testing import make_players
+
+
+class TestPlayerCacheFile(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, 'players.bin')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip(self):
+        players_json = make_players(300, seed=4)
+        players_json["9999"] = {"player_id": "9999", "first_name": "Zoë", "last_name": "O\"Neil",
+                                "fantasy_positions": ["WR", "KR"], "metadata": None}
+        write_player_cache(self.path, players_json)
+
+        cache = PlayerCacheFile(self.path, decoder='json')
+        self.assertEqual(len(cache), 301)
+        self.assertEqual(cache.ids(), list(players_json))
+        self.assertEqual(cache.load(), players_json)
+        for player_id in ("9999", cache.ids()[0], cache.ids()[150]):
+            self.assertEqual(cache.get(player_id), players_json[player_id])
+        self.assertIsNone(cache.get("missing"))
+        self.assertIn("9999", cache)
+        cache.close()
+
+    def test_writer(self):
+        players_json = make_players(20)
+        write_player_cache(self.path, players_json)
+        with open(self.path, 'rb') as f:
+            expected = f.read()
+        os.remove(self.path)
+
+        with PlayerCacheWriter(self.path) as writer:
+            for player_id, data in players_json.items():
+                writer.add(player_id, json.dumps(data, separators=(',', ':')).encode())
+            self.assertEqual(len(writer), 20)
+            self.assertFalse(os.path.exists(self.path))
+            writer.commit()
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_writer_discards_unless_committed(self):
+        write_player_cache(self.path, {"1": {"a": 1}})
+        with self.assertRaises(RuntimeError), PlayerCacheWriter(self.path) as writer:
+            writer.add("2", b'{"a":2}')
+            raise RuntimeError("download failed")
+        self.assertEqual(PlayerCacheFile(self.path).load(), {"1": {"a": 1}})
+        self.assertEqual(os.listdir(self._tmp.name), ['players.bin'])
+
+    def test_empty_payload(self):
+        write_player_cache(self.path, {})
+        cache = PlayerCacheFile(self.path)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.ids(), [])
+        self.assertEqual(cache.load(), {})
+        self.assertIsNone(cache.get("1"))
+
+    def test_invalid_files(self):
+        for content in (b'', b'SLPC', b'{"not": "a cache"}' * 10):
+            with self.subTest(content=content):
+                with open(self.path, 'wb') as f:
+                    f.write(content)
+                with self.assertRaises(ValueError):
+                    PlayerCacheFile(self.path)
+
+    def test_truncated_file(self):
+        write_player_cache(self.path, make_players(20))
+        with open(self.path, 'rb+') as f:
+            f.truncate(os.path.getsize(self.path) - 10)
+        with self.assertRaises(ValueError):
+            PlayerCacheFile(self.path)
+
+    def test_index_decodes_lazily(self):
+        players_json = make_players(50, seed=2)
+        write_player_cache(self.path, players_json)
+        index = PlayerIndex()
+        index.load_cache_file(PlayerCacheFile(self.path), generation=1)
+        player_id = list(players_json)[10]
+
+        data = index.get_json(player_id)
+        self.assertEqual(data, players_json[player_id])
+        self.assertIsNone(index._players)
+        self.assertEqual(len(index), 50)
+        self.assertEqual(index.position(player_id), 10)
+        self.assertIs(index.get(player_id), index.get(player_id))
+
+        # decoding everything keeps the records already handed out
+        self.assertEqual(index.players_json(), players_json)
+        self.assertIs(index.get_json(player_id), data)
+        self.assertEqual(index.lookup('position', data['position'])[:1],
+                         [key for key, value in players_json.items()
+                          if value['position'] == data['position']][:1])
+
+
+    def test_failed_write_keeps_the_previous_file(self):
+        write_player_cache(self.path, {"1": {"player_id": "1"}})
+        with self.assertRaises(TypeError):
+            write_player_cache(self.path, {"2": {"player_id": object()}})
+        self.assertEqual(PlayerCacheFile(self.path).load(), {"1": {"player_id": "1"}})
+        self.assertEqual(os.listdir(self._tmp.name), ['players.bin'])
+
+
+class TestCacheLock(unittest.TestCase):
+
+    def test_exclusive(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'players.bin.lock')
+            first, second = CacheLock(path), CacheLock(path)
+            self.assertTrue(first.acquire())
+            self.assertFalse(second.try_acquire())
+            self.assertFalse(second.acquire(timeout=0.1))
+            first.release()
+            self.assertTrue(second.try_acquire())
+            second.release()
+            with first:
+                self.assertTrue(first.locked)
+            self.assertFalse(first.locked)
+
+    def test_across_processes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'players.bin.lock')
+            holder = subprocess.Popen(
+                [sys.executable, '-c',
+                 "import sys; from sleeper_api.player_cache import CacheLock; "
+                 "lock = CacheLock(sys.argv[1]); lock.acquire(); print('locked', flush=True); "
+                 "sys.stdin.read()", path],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+                env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)))
+            try:
+                self.assertEqual(holder.stdout.readline().strip(), 'locked')
+                self.assertFalse(CacheLock(path).try_acquire())
+            finally:
+                holder.communicate('')
+            lock = CacheLock(path)
+            self.assertTrue(lock.try_acquire())
+            lock.release()
+
+
+if __name__ == '__main__':
+    unittest.main()
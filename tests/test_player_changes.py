@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from sleeper_api.player_changes import PlayerChangeLog, PlayerChanges, diff_players
+
+OLD = {
+    "1": {"player_id": "1", "team": "NE", "injury_status": None, "age": 30},
+    "2": {"player_id": "2", "team": "KC", "injury_status": "Questionable"},
+    "3": {"player_id": "3", "team": "DAL"},
+}
+NEW = {
+    "1": {"player_id": "1", "team": "BUF", "injury_status": None, "age": 31},
+    "2": {"player_id": "2", "team": "KC"},
+    "4": {"player_id": "4", "team": "SF"},
+}
+
+
+class TestDiffPlayers(unittest.TestCase):
+
+    def test_diff(self):
+        changes = diff_players(OLD, NEW)
+        self.assertEqual(changes.added, ["4"])
+        self.assertEqual(changes.removed, ["3"])
+        self.assertEqual(changes.changed, {
+            "1": {"team": ("NE", "BUF"), "age": (30, 31)},
+            "2": {"injury_status": ("Questionable", None)},
+        })
+        self.assertEqual(changes.field_changes("team"), {"1": ("NE", "BUF")})
+        self.assertEqual(changes.player_ids(), ["4", "3", "1", "2"])
+
+    def test_no_changes(self):
+        changes = diff_players(OLD, {key: dict(data) for key, data in OLD.items()})
+        self.assertFalse(changes)
+
+    def test_merge(self):
+        third = {
+            "1": {"player_id": "1", "team": "NE", "injury_status": "Out", "age": 31},
+            "2": {"player_id": "2", "team": "KC"},
+        }
+        merged = diff_players(OLD, NEW, since=1).merge(diff_players(NEW, third))
+        expected = diff_players(OLD, third)
+        self.assertEqual(merged.added, expected.added)
+        self.assertEqual(merged.removed, expected.removed)
+        self.assertEqual(merged.changed, expected.changed)
+        self.assertEqual(merged.since, 1)
+
+    def test_merge_removed_then_added_again(self):
+        merged = diff_players(OLD, NEW).merge(diff_players(NEW, OLD))
+        self.assertEqual(merged.added, ["3"])
+        self.assertEqual(merged.removed, [])
+        self.assertEqual(merged.changed, {})
+
+    def test_round_trip(self):
+        changes = diff_players(OLD, NEW)
+        copy = PlayerChanges.from_dict(changes.to_dict())
+        self.assertEqual(copy.to_dict(), changes.to_dict())
+        self.assertEqual(copy.changed, changes.changed)
+
+
+class TestPlayerChangeLog(unittest.TestCase):
+
+    def test_since(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log = PlayerChangeLog(os.path.join(tmp, 'changes.jsonl'), retention=timedelta(days=30))
+            self.assertFalse(log.since())
+            now = datetime.now().timestamp()
+            log.append(PlayerChanges(added=["1"], until=now - 40 * 86400))
+            log.append(PlayerChanges(changed={"2": {"team": ("KC", "SF")}}, until=now - 3600))
+            log.append(PlayerChanges(changed={"2": {"team": ("SF", "LV")}}, until=now))
+
+            self.assertEqual(len(log.entries()), 2)  # the first is past the retention
+            self.assertEqual(log.since().changed, {"2": {"team": ("KC", "LV")}})
+            recent = log.since(datetime.now() - timedelta(minutes=1))
+            self.assertEqual(recent.changed, {"2": {"team": ("SF", "LV")}})
+
+    def test_torn_line_is_skipped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log = PlayerChangeLog(os.path.join(tmp, 'changes.jsonl'))
+            log.append(PlayerChanges(added=["1"]))
+            with open(log.path, 'a', encoding='utf-8') as f:
+                f.write('{"added": ["2"')
+            self.assertEqual([entry.added for entry in log.entries()], [["1"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
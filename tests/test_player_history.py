@@ -0,0 +1,153 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+from sleeper_api.player_changes import diff_players
+from sleeper_api.player_history import PlayerHistory, to_timestamp
+from sleeper_api.testing import make_players
+
+V1 = {
+    "1": {"player_id": "1", "team": "NE", "status": "Active", "age": 30},
+    "2": {"player_id": "2", "team": "KC", "injury_status": "Questionable"},
+    "3": {"player_id": "3", "team": "DAL"},
+}
+V2 = {
+    "1": {"player_id": "1", "team": "BUF", "status": "Active", "age": 30},
+    "2": {"player_id": "2", "team": "KC"},
+    "4": {"player_id": "4", "team": "SF"},
+}
+V3 = {
+    "1": {"player_id": "1", "team": "BUF", "status": "Inactive", "age": 31},
+    "2": {"player_id": "2", "team": "KC"},
+    "3": {"player_id": "3", "team": "NYJ"},
+    "4": {"player_id": "4", "team": "SF"},
+}
+
+
+class TestPlayerHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'players.nfl.history')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _record_all(self, history):
+        self.assertFalse(history.record(V1, 100.0))
+        self.assertTrue(history.record(V2, 200.0, diff_players(V1, V2, since=100.0)))
+        self.assertTrue(history.record(V3, 300.0, diff_players(V2, V3, since=200.0)))
+
+    def test_point_in_time(self):
+        history = PlayerHistory(self.path)
+        self._record_all(history)
+        for reader in (history, PlayerHistory(self.path)):
+            self.assertIsNone(reader.get("1", 99))
+            self.assertEqual(reader.get("1", 100), V1["1"])
+            self.assertEqual(reader.get("1", 250), V2["1"])
+            self.assertEqual(reader.get("1"), V3["1"])
+            self.assertEqual(reader.get("2", 200), V2["2"])  # field removed
+            self.assertIsNone(reader.get("3", 200))          # removed
+            self.assertEqual(reader.get("3", 300), V3["3"])  # added again
+            self.assertIsNone(reader.get("missing"))
+            self.assertEqual(reader.versions(), [100.0, 200.0, 300.0])
+
+    def test_snapshot(self):
+        history = PlayerHistory(self.path)
+        self._record_all(history)
+        self.assertEqual(history.snapshot(50), {})
+        self.assertEqual(history.snapshot(100), V1)
+        self.assertEqual(history.snapshot(299), V2)
+        self.assertEqual(history.snapshot(), V3)
+
+    def test_player_history(self):
+        history = PlayerHistory(self.path)
+        self._record_all(history)
+        self.assertEqual(history.player_history("1"), [(100.0, V1["1"]), (200.0, V2["1"]),
+                                                       (300.0, V3["1"])])
+        self.assertEqual(history.player_history("3"), [(100.0, V1["3"]), (200.0, None),
+                                                       (300.0, V3["3"])])
+        # starts with the version in effect at start
+        self.assertEqual(history.player_history("1", start=250, end=300),
+                         [(200.0, V2["1"]), (300.0, V3["1"])])
+        self.assertEqual(history.player_history("4", end=150), [])
+        self.assertEqual(history.player_history("missing"), [])
+
+    def test_full_snapshot_when_changes_dont_follow_the_latest_version(self):
+        history = PlayerHistory(self.path)
+        history.record(V2, 200.0)
+        # changes from a version the history doesn't have
+        self.assertFalse(history.record(V3, 300.0, diff_players(V1, V3, since=100.0)))
+        self.assertEqual(history.snapshot(200), V2)
+        self.assertEqual(history.snapshot(), V3)
+        # players that didn't change aren't given another version
+        self.assertEqual(history.player_history("4"), [(200.0, V2["4"])])
+        self.assertEqual(len(history.player_history("1")), 2)
+
+    def test_reads_appended_versions(self):
+        writer = PlayerHistory(self.path)
+        reader = PlayerHistory(self.path)
+        writer.record(V1, 100.0)
+        self.assertEqual(reader.get("1"), V1["1"])
+        writer.record(V2, 200.0, diff_players(V1, V2, since=100.0))
+        self.assertEqual(reader.get("1"), V2["1"])
+        self.assertEqual(reader.stats()['versions'], 2)
+        self.assertEqual(reader.stats()['file_bytes'], os.path.getsize(self.path))
+
+    def test_torn_frame_is_overwritten(self):
+        history = PlayerHistory(self.path)
+        history.record(V1, 100.0)
+        with open(self.path, 'ab') as f:
+            f.write(b'\x40\x00\x00\x00partial')
+        history = PlayerHistory(self.path)
+        self.assertEqual(history.versions(), [100.0])
+        self.assertTrue(history.record(V2, 200.0, diff_players(V1, V2, since=100.0)))
+        self.assertEqual(PlayerHistory(self.path).snapshot(), V2)
+
+    def test_times_kept_to_the_microsecond(self):
+        # modification times in nanoseconds, as the endpoint records them
+        first, second = 1792340461840654912 / 1e9, 1792340461861906816 / 1e9
+        history = PlayerHistory(self.path)
+        history.record(V1, first)
+        self.assertTrue(history.record(V2, second, diff_players(V1, V2, since=first)))
+        for when, data in history.player_history("1"):
+            self.assertEqual(history.get("1", datetime.fromtimestamp(when)), data)
+        self.assertEqual(history.get("1", datetime.fromtimestamp(second)), V2["1"])
+        self.assertEqual(history.get("1", datetime.fromtimestamp(first)), V1["1"])
+
+    def test_older_version_rejected(self):
+        history = PlayerHistory(self.path)
+        history.record(V1, 100.0)
+        with self.assertRaises(ValueError):
+            history.record(V2, 50.0)
+
+    def test_not_a_history_file(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'{"not": "a history"}')
+        with self.assertRaises(ValueError):
+            PlayerHistory(self.path).get("1")
+
+    def test_changes_take_little_space(self):
+        history = PlayerHistory(self.path)
+        old = make_players(2000)
+        history.record(old, 100.0)
+        full = os.path.getsize(self.path)
+        new = {player_id: dict(data) for player_id, data in old.items()}
+        for player_id in ("1", "2", "3"):
+            new[player_id]["injury_status"] = "Out"
+        history.record(new, 200.0, diff_players(old, new, since=100.0))
+        self.assertLess(os.path.getsize(self.path) - full, full / 100)
+        self.assertEqual(history.snapshot(), new)
+        self.assertEqual(history.snapshot(100), old)
+
+    def test_to_timestamp(self):
+        self.assertEqual(to_timestamp(12.5), 12.5)
+        moment = datetime(2024, 9, 8, 13, 0)
+        self.assertEqual(to_timestamp(moment), moment.timestamp())
+        # a date is the end of that day
+        self.assertEqual(to_timestamp(date(2024, 9, 8)),
+                         datetime(2024, 9, 8, 23, 59, 59, 999999).timestamp())
+
+
+if __name__ == '__main__':
+    unittest.main()
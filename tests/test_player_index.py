@@ -0,0 +1,110 @@
+import unittest
+from sleeper_api.player_changes import diff_players
+from sleeper_api.player_index import INDEXED_FIELDS, PlayerIndex, drop_index, shared_index, clear_indexes
+from sleeper_api.testing import make_players
+
+PLAYERS = {
+    "1": {"player_id": "1", "first_name": "A", "team": "NE", "position": "QB", "fantasy_positions": ["QB"]},
+    "2": {"player_id": "2", "first_name": "B", "team": "KC", "position": "WR", "fantasy_positions": ["WR", "RB", "WR"]},
+    "3": {"player_id": "3", "first_name": "C", "team": "NE", "position": "RB", "fantasy_positions": ["RB"]},
+    "4": {"player_id": "4", "first_name": "D", "team": None, "position": {"odd": "value"}},
+}
+
+class TestPlayerIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = PlayerIndex()
+        self.index.load(PLAYERS, generation=(1, 1))
+
+    def test_lookup_by_id(self):
+        self.assertEqual(self.index.get("2").first_name, "B")
+        self.assertIs(self.index.get("2"), self.index.get("2"))
+        self.assertIsNone(self.index.get("9"))
+        self.assertEqual([p.player_id for p in self.index.get_many(["3", "9", "1"])], ["3", "1"])
+
+    def test_secondary_indexes_are_built_lazily(self):
+        self.assertEqual(self.index._secondary, {})
+        self.assertEqual(self.index.lookup("team", "NE"), ["1", "3"])
+        self.assertEqual(list(self.index._secondary), ["team"])
+        self.assertEqual(self.index.lookup("team", "SF"), [])
+
+    def test_list_fields_are_indexed_per_item(self):
+        self.assertEqual(self.index.lookup("fantasy_positions", "RB"), ["2", "3"])
+        self.assertEqual(self.index.lookup("fantasy_positions", "WR"), ["2"])
+
+    def test_unhashable_values(self):
+        self.assertEqual(self.index.lookup("position", ["QB"]), [])
+        self.assertEqual(self.index.lookup("position", "QB"), ["1"])
+        with self.assertRaises(KeyError):
+            self.index.secondary("age")
+
+    def test_load_invalidates(self):
+        self.index.lookup("team", "NE")
+        version = self.index.version
+        self.index.load({"5": {"player_id": "5", "team": "NE"}}, generation=(2, 1))
+        self.assertEqual(self.index.version, version + 1)
+        self.assertEqual(self.index.lookup("team", "NE"), ["5"])
+        self.assertIsNone(self.index.get("1"))
+        self.assertTrue(self.index.is_current((2, 1)))
+        self.assertFalse(self.index.is_current((1, 1)))
+        self.assertFalse(self.index.is_current(None))
+
+    def test_apply_changes_matches_rebuild(self):
+        old = make_players(300, seed=3)
+        new = {key: dict(data) for key, data in old.items() if key not in ("5", "77")}
+        new["12"]["team"] = "ZZ"
+        new["40"]["injury_status"] = "Out"
+        new["41"]["fantasy_positions"] = ["K"]
+        new["42"]["first_name"] = "Renamed"
+        new["900"] = dict(old["1"], player_id="900", team="NE")
+        index = PlayerIndex()
+        index.load(old, generation=1)
+        for field in INDEXED_FIELDS:
+            index.secondary(field)
+        kept = index.get("100")
+        stale = index.get("42")
+
+        index.apply_changes(new, diff_players(old, new), generation=2)
+        rebuilt = PlayerIndex()
+        rebuilt.load(new, generation=2)
+        for field in INDEXED_FIELDS:
+            with self.subTest(field=field):
+                self.assertEqual(index.secondary(field), rebuilt.secondary(field))
+        self.assertIs(index.get("100"), kept)
+        self.assertEqual(index.get("42").first_name, "Renamed")
+        self.assertIsNot(index.get("42"), stale)
+        self.assertIsNone(index.get("5"))
+        self.assertEqual(index.position("900"), len(new) - 1)
+        self.assertTrue(index.is_current(2))
+
+    def test_apply_changes_reordered_payload(self):
+        self.index.lookup("team", "NE")
+        new = {key: PLAYERS[key] for key in ("3", "2", "1")}
+        self.index.apply_changes(new, diff_players(PLAYERS, new))
+        self.assertEqual(self.index.lookup("team", "NE"), ["3", "1"])
+
+    def test_shared_index(self):
+        clear_indexes()
+        self.assertIs(shared_index("a.json.gz"), shared_index("a.json.gz"))
+        self.assertIsNot(shared_index("a.json.gz"), shared_index("a.json.gz", "nba"))
+        nba = shared_index("a.json.gz", "nba")
+        nfl = shared_index("a.json.gz")
+        drop_index("a.json.gz", "nba")
+        self.assertIsNot(shared_index("a.json.gz", "nba"), nba)
+        self.assertIs(shared_index("a.json.gz"), nfl)
+        clear_indexes()
+
+    def test_memory_usage(self):
+        self.assertEqual(PlayerIndex().memory_usage(), 0)
+        index = PlayerIndex()
+        index.load(make_players(100))
+        payload = index.memory_usage()
+        self.assertGreater(payload, 100 * 200)
+        index.get_many(str(i) for i in range(1, 51))
+        index.lookup("team", "KC")
+        self.assertGreater(index.memory_usage(), payload)
+        index.load(make_players(10))
+        self.assertLess(index.memory_usage(), payload)
+
+if __name__ == '__main__':
+    unittest.main()
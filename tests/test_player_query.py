@@ -0,0 +1,122 @@
+import random
+import unittest
+from sleeper_api.player_index import PlayerIndex
+from sleeper_api.player_query import (compile_query, explain_query, order_players, query_cache,
+                                      run_query, select_players, QueryPlan)
+from sleeper_api.testing import make_players
+from _reference_search import evaluate_conditions
+
+PLAYERS = make_players(2000, seed=2)
+
+class TestQueryPlanner(unittest.TestCase):
+
+    def setUp(self):
+        self.index = PlayerIndex()
+        self.index.load(PLAYERS)
+
+    def assertMatchesFullScan(self, criteria):
+        expected = [key for key, data in PLAYERS.items() if evaluate_conditions(data, criteria)]
+        self.assertEqual(run_query(self.index, criteria), expected)
+
+    def test_results_match_the_interpreted_search(self):
+        rng = random.Random(4)
+        leaves = [
+            lambda: {"team": rng.choice(["NE", "KC", "BUF", None])},
+            lambda: {"position": {"in": rng.sample(["QB", "RB", "WR", "TE", "K"], 2)}},
+            lambda: {"age": {rng.choice([">", "<", ">=", "<="]): rng.randint(21, 35)}},
+            lambda: {"status": {"!=": "Active"}},
+            lambda: {"injury_status": {"not in": ["Out", "IR"]}},
+            lambda: {"years_exp": {">": 2, "<=": 8}},
+            lambda: {"fantasy_positions": ["WR"]},
+            lambda: {"position": "QB", "team": {"==": "MIA"}},
+        ]
+        for _ in range(60):
+            criteria = rng.choice(leaves)()
+            if rng.random() < 0.5:
+                criteria = {rng.choice(["AND", "OR"]): [criteria, rng.choice(leaves)(),
+                                                        {"OR": [rng.choice(leaves)(), rng.choice(leaves)()]}]}
+            with self.subTest(criteria=criteria):
+                self.assertMatchesFullScan(criteria)
+
+    def test_edge_cases_match_the_interpreted_search(self):
+        for criteria in ({}, {"AND": []}, {"OR": []}, {"team": None}, {"position": {"in": "QBRB"}}):
+            with self.subTest(criteria=criteria):
+                self.assertMatchesFullScan(criteria)
+
+    def test_invalid_queries(self):
+        with self.assertRaises(ValueError):
+            compile_query({"age": {"~": 3}})
+        with self.assertRaises(ValueError):
+            compile_query({"AND": ["position"]})
+
+    def test_most_selective_condition_first(self):
+        plan = QueryPlan(self.index, {"age": {">": 25}, "status": "Active", "team": "KC"})
+        self.assertEqual([child.field for child in plan.root.children], ["team", "status", "age"])
+        self.assertEqual(plan.candidates, self.index.lookup("team", "KC"))
+
+    def test_or_needs_every_branch_indexed(self):
+        indexed = QueryPlan(self.index, {"OR": [{"team": "KC"}, {"position": "K"}]})
+        self.assertEqual(len(indexed.candidates),
+                         len(set(self.index.lookup("team", "KC")) | set(self.index.lookup("position", "K"))))
+        self.assertIsNone(QueryPlan(self.index, {"OR": [{"team": "KC"}, {"age": 30}]}).candidates)
+
+    def test_explain(self):
+        text = explain_query(self.index, {"team": "KC", "age": {">": 25}})
+        self.assertIn(f"index lookup, {len(self.index.lookup('team', 'KC'))} of 2000 players", text)
+        self.assertIn("rows scanned:", text)
+        self.assertIn("result cache: miss", text)
+        self.assertIn("full scan of 2000 players", explain_query(self.index, {"age": 30}))
+
+    def test_result_cache_is_dropped_on_reload(self):
+        criteria = {"position": "QB"}
+        first = run_query(self.index, criteria)
+        self.assertIs(run_query(self.index, criteria), first)
+        self.assertEqual(query_cache(self.index).stats(), {'hits': 1, 'misses': 1, 'entries': 1})
+
+        self.index.load({"1": {"player_id": "1", "position": "QB"}})
+        self.assertEqual(run_query(self.index, criteria), ["1"])
+
+    def test_order_players(self):
+        player_ids = run_query(self.index, {"position": "WR"})
+
+        def sort_key(player_id):
+            data = PLAYERS[player_id]
+            return (data.get('team') is None, data.get('team') or '', -(data.get('age') or 0))
+
+        expected = sorted(player_ids, key=sort_key)
+        self.assertEqual(order_players(self.index, player_ids, ['team', '-age']), expected)
+        # the first k with a heap are the first k of the full sort, ties in payload order
+        self.assertEqual(order_players(self.index, player_ids, ['team', '-age'], 7), expected[:7])
+        self.assertEqual(order_players(self.index, player_ids, 'search_rank', 0), [])
+
+    def test_order_players_missing_values_last(self):
+        index = PlayerIndex()
+        index.load({"1": {"age": 30}, "2": {}, "3": {"age": 25}, "4": {"age": 30}})
+        self.assertEqual(order_players(index, ["1", "2", "3", "4"], "age"), ["3", "1", "4", "2"])
+        self.assertEqual(order_players(index, ["1", "2", "3", "4"], "-age"), ["1", "4", "3", "2"])
+        self.assertEqual(order_players(index, ["1", "2", "3", "4"], "-age", 2), ["1", "4"])
+
+    def test_order_players_invalid(self):
+        index = PlayerIndex()
+        index.load({"1": {"age": 30}, "2": {"age": "thirty"}})
+        for order_by in ([], "-", ["age", None]):
+            with self.subTest(order_by=order_by), self.assertRaises(ValueError):
+                order_players(self.index, ["1"], order_by)
+        with self.assertRaises(ValueError):
+            order_players(index, ["1", "2"], "age")
+
+    def test_select_players(self):
+        player_ids = ["3", "1"]
+        self.assertEqual(list(select_players(self.index, player_ids, ["position", "team_abbr", "x"])),
+                         [{"position": PLAYERS[key]["position"], "team_abbr": PLAYERS[key]["team"],
+                           "x": None} for key in player_ids])
+        self.assertEqual(list(select_players(self.index, player_ids, "age")),
+                         [{"age": PLAYERS[key]["age"]} for key in player_ids])
+        self.assertEqual(list(select_players(self.index, player_ids, convert_results=False)),
+                         [dict(PLAYERS[key], key=key) for key in player_ids])
+        models = list(select_players(self.index, player_ids))
+        self.assertIs(models[0], self.index.get("3"))
+
+
+if __name__ == '__main__':
+    unittest.main()
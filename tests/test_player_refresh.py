@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import unittest
+from datetime import timedelta
+from sleeper_api.player_refresh import PlayerRefresher, player_refresher
+
+
+class TestPlayerRefresher(unittest.TestCase):
+
+    def test_single_flight(self):
+        refresher = PlayerRefresher()
+        release = threading.Event()
+        calls = []
+
+        def refresh():
+            calls.append(1)
+            release.wait(5)
+
+        self.assertTrue(refresher.start_thread(refresh))
+        self.assertFalse(refresher.start_thread(refresh))
+        self.assertTrue(refresher.in_progress)
+        release.set()
+        self.assertTrue(refresher.wait(5))
+        self.assertEqual(len(calls), 1)
+        stats = refresher.stats()
+        self.assertEqual((stats['refreshes'], stats['failures'], stats['in_progress']), (1, 0, False))
+        self.assertIsNotNone(stats['last_success'])
+
+    def test_failure_waits_before_retrying(self):
+        refresher = PlayerRefresher(retry_interval=timedelta(hours=1))
+
+        def refresh():
+            raise ConnectionError("down")
+
+        self.assertTrue(refresher.start_thread(refresh))
+        refresher.wait(5)
+        self.assertFalse(refresher.start_thread(refresh))
+        stats = refresher.stats()
+        self.assertEqual(stats['failures'], 1)
+        self.assertEqual(stats['last_error'], "ConnectionError: down")
+
+        refresher.retry_interval = timedelta(0)
+        self.assertTrue(refresher.start_thread(lambda: None))
+        refresher.wait(5)
+        self.assertEqual(refresher.stats()['refreshes'], 1)
+
+    def test_task(self):
+        refresher = PlayerRefresher()
+        calls = []
+
+        async def refresh():
+            calls.append(1)
+
+        async def main():
+            self.assertTrue(refresher.start_task(refresh))
+            self.assertFalse(refresher.start_task(refresh))
+            await refresher.task
+
+        asyncio.run(main())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(refresher.stats()['refreshes'], 1)
+
+    def test_cancelled_task_allows_another(self):
+        refresher = PlayerRefresher(retry_interval=timedelta(hours=1))
+
+        async def refresh():
+            await asyncio.sleep(10)
+
+        async def main():
+            self.assertTrue(refresher.start_task(refresh))
+            await asyncio.sleep(0)
+            refresher.task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await refresher.task
+
+        asyncio.run(main())
+        stats = refresher.stats()
+        self.assertEqual((stats['in_progress'], stats['failures'], stats['skipped']), (False, 0, 1))
+
+        # a refresh left running when asyncio.run closes its loop is cancelled as well
+        asyncio.run(self._start(refresher, refresh))
+        self.assertFalse(refresher.in_progress)
+
+    async def _start(self, refresher, refresh):
+        self.assertTrue(refresher.start_task(refresh))
+        await asyncio.sleep(0)
+
+    def test_shared(self):
+        self.assertIs(player_refresher('a.bin', 'nfl'), player_refresher('a.bin', 'nfl'))
+        self.assertIsNot(player_refresher('a.bin', 'nfl'), player_refresher('a.bin', 'nba'))
+
+
+if __name__ == '__main__':
+    unittest.main()
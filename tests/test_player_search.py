@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from sleeper_api.endpoints.player_endpoint import PlayerEndpoint
+from sleeper_api.player_index import PlayerIndex
+from sleeper_api.player_search import NameIndex, name_index_for, normalize_name
+from sleeper_api.testing import make_players
+
+PLAYERS = {
+    "4046": {"player_id": "4046", "first_name": "Patrick", "last_name": "Mahomes", "position": "QB",
+             "team": "KC", "active": True, "search_rank": 5},
+    "6794": {"player_id": "6794", "first_name": "Justin", "last_name": "Jefferson", "position": "WR",
+             "team": "MIN", "active": True, "search_rank": 2},
+    "1": {"player_id": "1", "first_name": "Van", "last_name": "Jefferson", "position": "WR",
+          "team": "ATL", "active": True, "search_rank": 300},
+    "2": {"player_id": "2", "first_name": "Jermaine", "last_name": "Jefferson", "position": "WR",
+          "team": None, "active": False, "search_rank": 900},
+    "7547": {"player_id": "7547", "first_name": "Amon-Ra", "last_name": "St. Brown", "position": "WR",
+             "team": "DET", "active": True, "search_rank": 8},
+    "3": {"player_id": "3", "first_name": "José", "last_name": "O'Neil", "position": "K",
+          "team": "SF", "active": True},
+    "4": {"player_id": "4", "first_name": None, "last_name": None},
+}
+
+
+class TestNameIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.names = NameIndex(PLAYERS)
+
+    def ids(self, query, **kwargs):
+        return [player_id for player_id, _ in self.names.search(query, **kwargs)]
+
+    def test_normalize(self):
+        self.assertEqual(normalize_name("Amon-Ra St. Brown"), ["amon", "ra", "st", "brown"])
+        self.assertEqual(normalize_name("José O'Neil"), ["jose", "oneil"])
+
+    def test_exact_partial_and_misspelled(self):
+        self.assertEqual(self.ids("mahomes")[:1], ["4046"])
+        self.assertEqual(self.ids("Patrick Mahomes")[:1], ["4046"])
+        self.assertEqual(self.ids("maho")[:1], ["4046"])
+        self.assertEqual(self.ids("mahomse")[:1], ["4046"])
+        self.assertEqual(self.ids("jose oneil"), ["3"])
+        self.assertEqual(self.ids("st brown"), ["7547"])
+        self.assertEqual(self.ids("qqqqq"), [])
+        self.assertEqual(self.ids(""), [])
+
+    def test_ranked_by_search_rank(self):
+        self.assertEqual(self.ids("jefferson"), ["6794", "1", "2"])
+        self.assertEqual(self.ids("jefferson", limit=1), ["6794"])
+
+    def test_initials(self):
+        self.assertEqual(self.ids("j jefferson"), ["6794", "2"])
+        self.assertEqual(self.ids("v jefferson"), ["1"])
+        self.assertEqual(self.ids("pm"), [])
+        self.assertEqual(self.ids("pa"), ["4046"])
+
+    def test_filters(self):
+        self.assertEqual(self.ids("jefferson", team="ATL"), ["1"])
+        self.assertEqual(self.ids("jefferson", team=["ATL", "MIN"]), ["6794", "1"])
+        self.assertEqual(self.ids("jefferson", active=False), ["2"])
+        self.assertEqual(self.ids("jefferson", position="QB"), [])
+
+    def test_scores(self):
+        (_, exact), = self.names.search("mahomes", limit=1)
+        (_, misspelled), = self.names.search("mahomse", limit=1)
+        self.assertEqual(exact, 1.0)
+        self.assertLess(misspelled, exact)
+
+    def test_built_once_per_payload(self):
+        index = PlayerIndex()
+        index.load(make_players(50), generation=1)
+        self.assertIs(name_index_for(index), name_index_for(index))
+        names = name_index_for(index)
+        index.load(make_players(60), generation=2)
+        self.assertIsNot(name_index_for(index), names)
+        self.assertEqual(len(name_index_for(index)), 60)
+
+
+class TestSearchByName(unittest.TestCase):
+
+    def test_search_by_name(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = PlayerEndpoint(MagicMock(), cache_file=os.path.join(tmp, 'players.bin'))
+            endpoint._save_cache(PLAYERS)
+            players = endpoint.search_by_name("j jefferson", limit=5, active=True)
+            self.assertEqual([p.name for p in players], ["Justin Jefferson"])
+            raw = endpoint.search_by_name("mahomes", limit=1, convert_results=False)
+            self.assertEqual(raw, [dict(PLAYERS["4046"], key="4046")])
+
+
+if __name__ == '__main__':
+    unittest.main()
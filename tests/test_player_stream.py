@@ -0,0 +1,53 @@
+import json
+import unittest
+from sleeper_api.player_stream import iter_players
+from sleeper_api.testing import make_players
+
+
+def chunked(body: bytes, size: int):
+    return (body[i:i + size] for i in range(0, len(body), size))
+
+
+class TestIterPlayers(unittest.TestCase):
+
+    def test_any_chunk_size(self):
+        players_json = make_players(50, seed=3)
+        players_json["9999"] = {"first_name": "Zoë", "last_name": "O\"Neil ☃", "age": 31}
+        body = json.dumps(players_json).encode()
+        for size in (1, 2, 3, 17, 1000, len(body)):
+            with self.subTest(size=size):
+                members = list(iter_players(chunked(body, size)))
+                self.assertEqual({key: value for key, value, _ in members}, players_json)
+                self.assertEqual([key for key, _, _ in members], list(players_json))
+                for key, value, raw in members:
+                    self.assertEqual(json.loads(raw), value)
+
+    def test_raw_json_and_whitespace(self):
+        body = b' {\n "1" : {"a": [1, 2]} ,"2":12\t, "3": "x"}\n'
+        self.assertEqual(list(iter_players(chunked(body, 4))),
+                         [("1", {"a": [1, 2]}, b'{"a": [1, 2]}'), ("2", 12, b'12'), ("3", "x", b'"x"')])
+        # a number at the end of a chunk may go on in the next one
+        self.assertEqual(list(iter_players([b'{"1":1', b'23}'])), [("1", 123, b'123')])
+        self.assertEqual(list(iter_players([b'{}'])), [])
+
+    def test_invalid(self):
+        for body in (b'', b'{"1":{"a":1}', b'[1]', b'{"1":1}x', b'{"1":1,}', b'{,"1":1}',
+                     b'{"1" 1}', b'{"1":{"a":}}'):
+            with self.subTest(body=body), self.assertRaises(ValueError):
+                list(iter_players(chunked(body, 3)))
+
+    def test_players_are_yielded_as_they_arrive(self):
+        received = []
+
+        def chunks():
+            for chunk in (b'{"1":{"a":1},', b'"2":{"a":2}', b'}'):
+                received.append(chunk)
+                yield chunk
+
+        players = iter_players(chunks())
+        self.assertEqual(next(players)[0], "1")
+        self.assertEqual(len(received), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
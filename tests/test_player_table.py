@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from sleeper_api.endpoints.player_endpoint import PlayerEndpoint
+from sleeper_api.exceptions import SleeperAPIError
+from sleeper_api.player_index import PlayerIndex
+from sleeper_api.testing import make_players
+from _reference_search import evaluate_conditions
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - depends on the optional extra
+    numpy = None
+
+if numpy is not None:
+    from sleeper_api.player_table import PlayerTable, table_for
+
+PLAYERS = {
+    "1": {"player_id": "1", "team": "NE", "position": "QB", "age": 30, "weight": "225", "height": "6'4\""},
+    "2": {"player_id": "2", "team": "KC", "position": "WR", "age": 24, "weight": "190", "height": "72"},
+    "3": {"player_id": "3", "team": None, "position": "WR", "age": None, "weight": None},
+    "4": {"player_id": "4", "team": "NE", "position": "RB", "age": 27, "weight": "210", "fantasy_positions": ["RB"]},
+}
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestPlayerTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = PlayerTable(PLAYERS)
+
+    def test_columns(self):
+        self.assertEqual(self.table.column("age").kind, "numeric")
+        self.assertEqual(self.table.column("team").kind, "categorical")
+        self.assertEqual(self.table.column("team").categories, ["NE", "KC"])
+        self.assertEqual(self.table.values("weight"), [225.0, 190.0, None, 210.0])
+        self.assertEqual(self.table.values("height"), [76.0, 72.0, None, None])
+        with self.assertRaises(SleeperAPIError):
+            self.table.column("fantasy_positions")
+
+    def test_filter(self):
+        self.assertEqual(self.table.filter({"team": "NE"}).player_ids(), ["1", "4"])
+        self.assertEqual(self.table.filter({"weight": {">": 200}}).player_ids(), ["1", "4"])
+        self.assertEqual(self.table.filter({"team": {"!=": "NE"}}).player_ids(), ["2"])
+        self.assertEqual(self.table.filter({"age": {"not in": [30]}}).player_ids(), ["2", "4"])
+        self.assertEqual(self.table.filter({"OR": [{"team": "KC"}, {"position": "RB"}]}).player_ids(), ["2", "4"])
+        self.assertEqual(self.table.between("age", 25, 30).player_ids(), ["1", "4"])
+        with self.assertRaises(ValueError):
+            self.table.filter({"age": {"~": 1}})
+
+    def test_filter_matches_search_players(self):
+        players = make_players(1000, seed=5)
+        table = PlayerTable(players)
+        for criteria in ({"position": "WR", "age": {"<": 25}},
+                         {"team": {"in": ["KC", "BUF"]}, "years_exp": {">=": 3}},
+                         {"OR": [{"injury_status": "Out"}, {"status": {"!=": "Active"}}]},
+                         {"AND": [{"search_rank": {"<=": 500}}, {"position": {"not in": ["K"]}}]}):
+            with self.subTest(criteria=criteria):
+                expected = [key for key, data in players.items() if evaluate_conditions(data, criteria)]
+                self.assertEqual(table.filter(criteria).player_ids(), expected)
+
+    def test_sort_and_top(self):
+        self.assertEqual(self.table.sort("age").player_ids(), ["2", "4", "1", "3"])
+        self.assertEqual(self.table.sort("age", descending=True).player_ids(), ["1", "4", "2", "3"])
+        self.assertEqual(self.table.sort("team").player_ids(), ["2", "1", "4", "3"])
+        self.assertEqual(self.table.top("age", 2).player_ids(), ["1", "4"])
+        self.assertEqual(self.table.top("age", 2, largest=False).player_ids(), ["2", "4"])
+        self.assertEqual(self.table.top("age", 10).player_ids(), ["1", "4", "2"])
+
+    def test_top_matches_full_sort(self):
+        table = PlayerTable(make_players(1000, seed=6))
+        expected = table.sort("search_rank").head(25).values("search_rank")
+        self.assertEqual(table.top("search_rank", 25, largest=False).values("search_rank"), expected)
+
+    def test_to_models_uses_the_index(self):
+        index = PlayerIndex()
+        index.load(PLAYERS)
+        table = table_for(index)
+        self.assertIs(table_for(index), table)
+        models = table.filter({"team": "NE"}).to_models()
+        self.assertEqual([model.player_id for model in models], ["1", "4"])
+        self.assertIs(models[0], index.get("1"))
+
+    def test_endpoint_table(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            endpoint = PlayerEndpoint(MagicMock(), cache_file=os.path.join(tmp, 'players.json.gz'))
+            endpoint._save_cache(PLAYERS)
+            table = endpoint.get_player_table()
+        self.assertEqual(len(table), 4)
+        self.assertEqual(table.top("weight", 1).to_models()[0].player_id, "1")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch, Mock
+from sleeper_api.client import SleeperClient
+from sleeper_api.rate_limit import TokenBucket, SqliteTokenBucket
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_smoothed(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+        with patch('sleeper_api.rate_limit.time.monotonic', return_value=100.0):
+            bucket._updated_at = 100.0
+            waits = [bucket.reserve() for _ in range(4)]
+
+        # the first two fit in the burst, the rest are spaced at 1 / rate
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(waits[2], 0.1)
+        self.assertAlmostEqual(waits[3], 0.2)
+
+        stats = bucket.stats()
+        self.assertEqual(stats['acquired'], 4)
+        self.assertEqual(stats['waited'], 2)
+        self.assertAlmostEqual(stats['total_wait'], 0.3)
+        self.assertAlmostEqual(stats['max_wait'], 0.2)
+
+    def test_refills_over_time(self):
+        bucket = TokenBucket(rate=10, capacity=1)
+        with patch('sleeper_api.rate_limit.time.monotonic', return_value=100.0):
+            bucket._updated_at = 100.0
+            bucket.reserve()
+        with patch('sleeper_api.rate_limit.time.monotonic', return_value=100.5):
+            self.assertEqual(bucket.reserve(), 0.0)
+
+    def test_shared_between_threads(self):
+        bucket = TokenBucket(rate=100, capacity=5)
+        waits = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(10):
+                wait = bucket.reserve()
+                with lock:
+                    waits.append(wait)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(bucket.stats()['acquired'], 40)
+        # 35 requests past the burst are spaced 10ms apart, so the last waits ~350ms
+        self.assertGreaterEqual(max(waits), 0.3)
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+    def test_sqlite_bucket_is_shared_by_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bucket.db')
+            # two instances stand in for two worker processes
+            first = SqliteTokenBucket(path, rate=1, capacity=2)
+            second = SqliteTokenBucket(path, rate=1, capacity=2)
+
+            self.assertEqual(first.reserve(), 0.0)
+            self.assertEqual(second.reserve(), 0.0)
+            self.assertGreater(first.reserve(), 0.9)
+
+    @patch('sleeper_api.client.requests.Session.request')
+    def test_client_acquires_before_each_request(self, mock_request):
+        mock_request.return_value = Mock(ok=True, content=b'{}')
+        limiter = Mock()
+        client = SleeperClient(rate_limiter=limiter)
+
+        client.get('league/1')
+        client.get('league/2')
+
+        self.assertEqual(limiter.acquire.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import json
+import unittest
+from unittest.mock import patch, Mock
+import requests
+from sleeper_api.client import SleeperClient
+from sleeper_api.exceptions import SleeperAPIError, CircuitOpenError
+from sleeper_api.retry import RetryPolicy, CircuitBreaker, parse_retry_after
+
+def mock_response(status_code, body=None, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.ok = status_code < 400
+    response.text = str(body)
+    response.content = json.dumps(body).encode()
+    response.headers = headers or {}
+    return response
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('5'), 5.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+
+    def test_backoff_is_bounded_and_jittered(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=4)
+        for attempt in range(6):
+            self.assertLessEqual(policy.backoff(attempt), min(4, 2 ** attempt))
+
+    def test_next_delay(self):
+        policy = RetryPolicy(max_retries=2, max_retry_after=60)
+        self.assertEqual(policy.next_delay(0, retry_after='7'), 7.0)
+        self.assertIsNone(policy.next_delay(0, retry_after='600'))
+        self.assertIsNone(policy.next_delay(2))
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_after_threshold_and_recovers(self):
+        changes = []
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10,
+                                 on_state_change=lambda old, new: changes.append((old, new)))
+        with patch('sleeper_api.retry.time.monotonic', return_value=100):
+            breaker.record_failure()
+            breaker.before_request()
+            breaker.record_failure()
+            with self.assertRaises(CircuitOpenError):
+                breaker.before_request()
+
+        with patch('sleeper_api.retry.time.monotonic', return_value=111):
+            breaker.before_request()  # the probe
+            with self.assertRaises(CircuitOpenError):
+                breaker.before_request()  # only one probe at a time
+            breaker.record_success()
+
+        self.assertEqual(changes, [('closed', 'open'), ('open', 'half_open'), ('half_open', 'closed')])
+        self.assertEqual(breaker.stats()['transitions'], {'open': 1, 'half_open': 1, 'closed': 1})
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        breaker.before_request()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+@patch('sleeper_api.client.time.sleep')
+@patch('sleeper_api.client.requests.Session.request')
+class TestClientRetries(unittest.TestCase):
+
+    def test_retries_transient_errors(self, mock_request, mock_sleep):
+        mock_request.side_effect = [
+            mock_response(503, 'unavailable'),
+            requests.ConnectionError('reset'),
+            mock_response(200, {"league_id": "1"}),
+        ]
+        client = SleeperClient(retry=RetryPolicy(max_retries=3))
+
+        self.assertEqual(client.get('league/1/rosters'), {"league_id": "1"})
+        self.assertEqual(mock_request.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(client.retry.stats(), {'league/{league_id}/rosters': 2})
+
+    def test_honors_retry_after(self, mock_request, mock_sleep):
+        mock_request.side_effect = [
+            mock_response(429, 'slow down', {'Retry-After': '3'}),
+            mock_response(200, []),
+        ]
+        client = SleeperClient(retry=RetryPolicy())
+
+        client.get('league/1/users')
+        mock_sleep.assert_called_once_with(3.0)
+
+    def test_gives_up_after_max_retries(self, mock_request, mock_sleep):
+        mock_request.return_value = mock_response(500, 'boom')
+        client = SleeperClient(retry=RetryPolicy(max_retries=2))
+
+        with self.assertRaises(SleeperAPIError):
+            client.get('league/1')
+        self.assertEqual(mock_request.call_count, 3)
+
+    def test_client_errors_are_not_retried(self, mock_request, mock_sleep):
+        mock_request.return_value = mock_response(404, 'Not Found')
+        client = SleeperClient(retry=RetryPolicy())
+
+        with self.assertRaises(SleeperAPIError):
+            client.get('league/1')
+        self.assertEqual(mock_request.call_count, 1)
+        mock_sleep.assert_not_called()
+
+    def test_breaker_fails_fast(self, mock_request, mock_sleep):
+        mock_request.return_value = mock_response(502, 'bad gateway')
+        client = SleeperClient(retry=RetryPolicy(max_retries=5),
+                               circuit_breaker=CircuitBreaker(failure_threshold=2))
+
+        with self.assertRaises(CircuitOpenError):
+            client.get('league/1')
+        with self.assertRaises(CircuitOpenError):
+            client.get('league/2')
+        # the breaker opened after two failures and stopped the remaining retries
+        self.assertEqual(mock_request.call_count, 2)
+
+    def test_probe_failing_with_other_request_errors_ends_the_probe(self, mock_request, mock_sleep):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        client = SleeperClient(retry=RetryPolicy(max_retries=3), circuit_breaker=breaker)
+        breaker.record_failure()
+
+        mock_request.side_effect = requests.exceptions.ChunkedEncodingError('truncated')
+        with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+            client.get('league/1')
+        # not retried, and the failed probe re-opened the breaker
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        # so the next request is let through as a new probe instead of being refused
+        mock_request.side_effect = None
+        mock_request.return_value = mock_response(200, {"league_id": "1"})
+        self.assertEqual(client.get('league/1'), {"league_id": "1"})
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_probe_ends_when_the_rate_limiter_fails(self, mock_request, mock_sleep):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        client = SleeperClient(circuit_breaker=breaker, rate_limiter=Mock())
+        breaker.record_failure()
+
+        client.rate_limiter.acquire.side_effect = RuntimeError('database is locked')
+        with self.assertRaises(RuntimeError):
+            client.get('league/1')
+        mock_request.assert_not_called()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        client.rate_limiter.acquire.side_effect = None
+        mock_request.return_value = mock_response(200, {"league_id": "1"})
+        self.assertEqual(client.get('league/1'), {"league_id": "1"})
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+if __name__ == '__main__':
+    unittest.main()
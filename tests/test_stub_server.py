@@ -0,0 +1,89 @@
+import socket
+import time
+import unittest
+from sleeper_api.client import SleeperClient
+from sleeper_api.endpoints import DraftEndpoint, LeagueEndpoint, UserEndpoint
+from sleeper_api.exceptions import SleeperAPIError
+from sleeper_api.models import LeagueModel
+from sleeper_api.retry import RetryPolicy
+from sleeper_api.testing import StubServer, synthetic_response
+from sleeper_api.testing.stub_server import _Server
+
+class TestSyntheticResponses(unittest.TestCase):
+
+    def test_responses_are_deterministic(self):
+        self.assertEqual(synthetic_response('league/1/rosters'), synthetic_response('league/1/rosters'))
+        self.assertNotEqual(synthetic_response('league/1/rosters'),
+                            synthetic_response('league/1/rosters', seed=1))
+
+    def test_unknown_endpoint(self):
+        self.assertIsNone(synthetic_response('nothing/here'))
+
+    def test_trending_limit(self):
+        self.assertEqual(len(synthetic_response('players/nfl/trending/add?limit=3')), 3)
+        self.assertEqual(len(synthetic_response('players/nfl', player_count=20)), 20)
+
+class TestStubServer(unittest.TestCase):
+
+    def test_endpoints_return_valid_models(self):
+        with StubServer() as server:
+            client = SleeperClient(base_url=server.base_url)
+            league = LeagueEndpoint(client).get_league_by_id('42')
+            self.assertIsInstance(league, LeagueModel)
+            self.assertEqual(league.league_id, '42')
+            self.assertEqual(len(LeagueEndpoint(client).get_matchups('42', 1)), 12)
+            self.assertEqual(len(DraftEndpoint(client).get_draft_picks('420')), 180)
+            self.assertEqual(UserEndpoint(client).get_user(user_id='5').user_id, '5')
+
+    def test_burst_of_connections_is_queued(self):
+        server = StubServer()
+        # listening but not accepting yet, so every connection waits in the listen queue
+        server._server = _Server(server.address, server._handler())
+        sockets = []
+        try:
+            for _ in range(50):
+                sockets.append(socket.create_connection(server._server.server_address, timeout=1))
+        finally:
+            for sock in sockets:
+                sock.close()
+            server._server.server_close()
+        self.assertEqual(len(sockets), 50)
+
+    def test_unknown_endpoint_is_a_404(self):
+        with StubServer() as server:
+            with self.assertRaises(SleeperAPIError) as ctx:
+                SleeperClient(base_url=server.base_url).get('nothing/here')
+            self.assertIn('404', str(ctx.exception))
+
+    def test_bandwidth(self):
+        with StubServer(payload={"data": "x" * 20_000}, bandwidth=200_000) as server:
+            client = SleeperClient(base_url=server.base_url)
+            start = time.perf_counter()
+            chunks = list(client.iter_chunks('players/nfl', chunk_size=4096))
+            elapsed = time.perf_counter() - start
+        self.assertGreaterEqual(elapsed, 0.09)
+        self.assertEqual(len(b''.join(chunks)), 20_012)
+
+    def test_injected_errors_are_retried(self):
+        with StubServer(error_rate=0.5, retry_after=0, seed=3) as server:
+            client = SleeperClient(base_url=server.base_url, retry=RetryPolicy(max_retries=10))
+            for week in range(1, 11):
+                client.get(f'league/1/matchups/{week}')
+            stats = server.stats()
+
+        self.assertGreater(stats['errors'], 0)
+        self.assertEqual(stats['requests'], 10 + stats['errors'])
+        self.assertEqual(sum(client.retry.stats().values()), stats['errors'])
+
+    def test_every_request_fails_at_full_error_rate(self):
+        with StubServer(error_rate=1.0, error_status=500) as server:
+            with self.assertRaises(SleeperAPIError) as ctx:
+                SleeperClient(base_url=server.base_url).get('state/nfl')
+        self.assertIn('500', str(ctx.exception))
+
+    def test_fixed_payload(self):
+        with StubServer(payload={"ok": True}) as server:
+            self.assertEqual(SleeperClient(base_url=server.base_url).get('anything'), {"ok": True})
+
+if __name__ == '__main__':
+    unittest.main()
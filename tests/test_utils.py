@@ -0,0 +1,18 @@
+import unittest
+from sleeper_api.utils import endpoint_template
+
+class TestEndpointTemplate(unittest.TestCase):
+
+    def test_known_routes(self):
+        self.assertEqual(endpoint_template('league/123/rosters'), 'league/{league_id}/rosters')
+        self.assertEqual(endpoint_template('user/sleeperuser'), 'user/{user_id}')
+        self.assertEqual(endpoint_template('user/1/leagues/nfl/2023'),
+                         'user/{user_id}/leagues/{sport}/{season}')
+        self.assertEqual(endpoint_template('players/nfl/trending/add?lookback_hours=24&limit=25'),
+                         'players/{sport}/trending/{trend_type}')
+
+    def test_unknown_routes_drop_ids(self):
+        self.assertEqual(endpoint_template('something/123/else'), 'something/{id}/else')
+
+if __name__ == '__main__':
+    unittest.main()